@@ -0,0 +1,64 @@
+# benchmarks/bench_tz.py
+#
+# Compares the old autocomplete path (rescan + sort tzdata per keystroke) with
+# the prebuilt TimezoneCatalog. Run from the repo root:
+#
+#     python benchmarks/bench_tz.py
+
+import os
+import sys
+import time
+from statistics import median
+from zoneinfo import available_timezones
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from tzcatalog import TimezoneCatalog, _norm  # noqa: E402
+
+TYPED = ["Europe/Berlin", "America/New_York", "berlin", "CET", "tokyo", "Australia/Sydney"]
+
+
+def keystrokes():
+    for word in TYPED:
+        for i in range(len(word) + 1):
+            yield word[:i]
+
+
+def old_autocomplete(current: str):
+    return [tz for tz in sorted(available_timezones()) if current.lower() in tz.lower()][:25]
+
+
+def old_validate(tz: str) -> bool:
+    return tz in available_timezones()
+
+
+def timed(fn, queries, rounds):
+    samples = []
+    for _ in range(rounds):
+        for q in queries:
+            t0 = time.perf_counter()
+            fn(q)
+            samples.append(time.perf_counter() - t0)
+    samples.sort()
+    return median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def report(label, p50, p99):
+    print(f"{label:<28} p50 {p50 * 1e6:>10.1f} µs   p99 {p99 * 1e6:>10.1f} µs")
+
+
+def main():
+    queries = list(keystrokes())
+
+    t0 = time.perf_counter()
+    catalog = TimezoneCatalog()
+    print(f"catalog build: {(time.perf_counter() - t0) * 1e3:.1f} ms ({len(catalog)} zones)\n")
+
+    report("old autocomplete", *timed(old_autocomplete, queries, 1))
+    report("catalog search (cold)", *timed(lambda q: catalog._search(_norm(q), 25), queries, 20))
+    report("catalog search (cached)", *timed(catalog.search, queries, 20))
+    report("old validate", *timed(old_validate, TYPED, 3))
+    report("catalog validate", *timed(catalog.__contains__, TYPED, 2000))
+
+
+if __name__ == "__main__":
+    main()
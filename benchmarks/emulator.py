@@ -0,0 +1,613 @@
+# benchmarks/emulator.py
+#
+# A local stand-in for Discord's gateway and REST API, enough of it for
+# bot.py to log in, sync commands and serve interactions. It hosts fake
+# guilds, fires synthetic interactions at a chosen rate, enforces Discord-ish
+# rate limits (429s included) and records how long the bot takes to answer.
+#
+#     python benchmarks/emulator.py --guilds 200 --rate 50      # serve only
+#     python benchmarks/soak.py --duration 3600                  # bot + load + report
+#
+# Point a bot at it with GAMER_API_BASE=http://127.0.0.1:8765/api/v10 and
+# GAMER_GATEWAY=ws://127.0.0.1:8765/gateway.
+
+import argparse
+import asyncio
+import itertools
+import json
+import random
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from aiohttp import WSMsgType, web
+
+DISCORD_EPOCH_MS = 1420070400000
+EPHEMERAL = 1 << 6
+MANAGE_GUILD = 1 << 5
+ACK_DEADLINE = 3.0
+
+ZONES = [
+    "Europe/Berlin", "Europe/London", "America/New_York", "America/Los_Angeles",
+    "America/Sao_Paulo", "Asia/Tokyo", "Asia/Kolkata", "Australia/Sydney",
+]
+TYPED = ["ber", "Europe/", "new y", "tok", "CET", "sydney", "america/los", "kolk"]
+WHEN = ["tomorrow 8pm", "fri 21:30", "sat at 9", "in 3h", "sun 20.30"]
+
+# Relative weights of the synthetic interactions
+DEFAULT_MIX = {
+    "click":        50,   # Ready / Can't / Maybe on a posted RSVP
+    "autocomplete": 20,   # settimezone tz autocomplete
+    "settimezone":   5,
+    "tonight":       3,
+    "specific":      3,
+    "roster":        3,   # opens a paged view with a timeout
+    "upcoming":      3,
+    "stats":         3,
+    "besttime":      2,
+}
+
+
+def _iso(ts: Optional[float] = None) -> str:
+    return datetime.fromtimestamp(ts or time.time(), timezone.utc).isoformat()
+
+
+def _json(data: Any, status: int = 200, headers: Optional[dict] = None) -> web.Response:
+    # discord.py only decodes bodies whose content-type is exactly
+    # "application/json" (no charset parameter)
+    return web.Response(body=json.dumps(data).encode(), status=status, headers=headers,
+                        content_type="application/json")
+
+
+class Snowflakes:
+    def __init__(self):
+        self._n = itertools.count()
+
+    def __call__(self, ms_ago: int = 0) -> int:
+        return ((int(time.time() * 1000) - ms_ago - DISCORD_EPOCH_MS) << 22) | (next(self._n) & 0x3FFFFF)
+
+
+class Bucket:
+    """Fixed-window limit like Discord's: `limit` requests per `per` seconds."""
+
+    __slots__ = ("limit", "per", "remaining", "reset_at")
+
+    def __init__(self, limit: int, per: float):
+        self.limit, self.per = limit, per
+        self.remaining, self.reset_at = limit, 0.0
+
+    def take(self, now: float) -> Optional[float]:
+        """None if allowed, otherwise seconds until the window resets."""
+        if now >= self.reset_at:
+            self.remaining, self.reset_at = self.limit, now + self.per
+        if self.remaining <= 0:
+            return self.reset_at - now
+        self.remaining -= 1
+        return None
+
+
+class LatencyLog:
+    """Per-kind samples of interaction → response times (seconds)."""
+
+    def __init__(self, keep: int = 20000):
+        self.samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=keep))
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def add(self, kind: str, seconds: float) -> None:
+        self.samples[kind].append(seconds)
+        self.counts[kind] += 1
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        out = {}
+        for kind, s in sorted(self.samples.items()):
+            ordered = sorted(s)
+            n = len(ordered)
+            out[kind] = {
+                "n":      self.counts[kind],
+                "p50_ms": ordered[n // 2] * 1000,
+                "p99_ms": ordered[min(n - 1, int(n * 0.99))] * 1000,
+                "max_ms": ordered[-1] * 1000,
+            }
+        return out
+
+
+class _Pending:
+    __slots__ = ("kind", "sent", "channel_id", "user_id", "acked")
+
+    def __init__(self, kind: str, channel_id: int, user_id: int):
+        self.kind, self.channel_id, self.user_id = kind, channel_id, user_id
+        self.sent  = time.perf_counter()
+        self.acked = False
+
+
+class FakeDiscord:
+    def __init__(
+        self,
+        guilds: int = 50,
+        members: int = 25,
+        shards: int = 1,
+        global_rate: int = 50,
+        channel_rate: Tuple[int, float] = (5, 5.0),
+        spurious_429: float = 0.0,
+        seed: int = 0,
+    ):
+        self.rng       = random.Random(seed)
+        self.snowflake = Snowflakes()
+        self.shards    = shards
+        self.app_id    = self.snowflake()
+        self.bot_user  = {"id": str(self.app_id), "username": "gamer-mimimi", "discriminator": "0",
+                          "global_name": None, "avatar": None, "bot": True}
+        self.host = "127.0.0.1"
+        self.port = 0
+
+        self.guilds: Dict[int, dict] = {}
+        for i in range(guilds):
+            # Created at different times, like real guilds: the shard of a
+            # guild comes from the timestamp bits of its ID
+            gid = self.snowflake(ms_ago=self.rng.randrange(1, 5 * 365 * 86400 * 1000))
+            role_id, channel_id = self.snowflake(), self.snowflake()
+            self.guilds[gid] = {
+                "id": gid, "name": f"guild-{i}", "role": role_id, "channel": channel_id,
+                "members": [self.snowflake() for _ in range(members)],
+                "rsvps": deque(maxlen=20),   # message IDs of RSVPs posted here
+                "ready": False,              # ping-role configured
+                "zoned": [],                 # members who ran settimezone
+            }
+        self.users: Dict[int, int] = {uid: gid for gid, g in self.guilds.items() for uid in g["members"]}
+
+        self.commands: Dict[Tuple[Optional[int], str], int] = {}   # (guild, name) → command ID
+        self.messages: Dict[int, dict] = {}
+        self._message_order: Deque[int] = deque()
+        self.pending: Dict[int, _Pending] = {}
+        self.publishing: Dict[int, Deque[_Pending]] = defaultdict(lambda: deque(maxlen=100))   # channel → awaiting RSVP post
+        self.latency = LatencyLog()
+        self.counters: Dict[str, int] = defaultdict(int)
+
+        self.global_bucket = Bucket(global_rate, 1.0)
+        self.channel_rate  = channel_rate
+        # Share of REST calls answered with a "shared" 429 anyway: Discord does
+        # this for resources other apps also hit, and headers can't predict it
+        self.spurious_429  = spurious_429
+        self.buckets: Dict[Tuple[str, int], Bucket] = {}
+        self.sockets: Dict[int, "Session"] = {}
+        self.synced = asyncio.Event()
+
+    # ── payload builders ────────────────────────────────────────────────────
+
+    def user_payload(self, uid: int) -> dict:
+        return {"id": str(uid), "username": f"user{uid % 100000}", "discriminator": "0",
+                "global_name": None, "avatar": None}
+
+    def member_payload(self, uid: int, gid: int, admin: bool = False) -> dict:
+        return {
+            "user": self.user_payload(uid), "roles": [str(self.guilds[gid]["role"])],
+            "joined_at": _iso(), "deaf": False, "mute": False, "flags": 0,
+            "permissions": str(MANAGE_GUILD if admin else 0),
+        }
+
+    def role_payload(self, gid: int) -> dict:
+        return {"id": str(self.guilds[gid]["role"]), "name": "gamers", "color": 0, "hoist": False,
+                "position": 1, "permissions": "0", "managed": False, "mentionable": True, "flags": 0}
+
+    def guild_payload(self, gid: int) -> dict:
+        g = self.guilds[gid]
+        everyone = {"id": str(gid), "name": "@everyone", "color": 0, "hoist": False, "position": 0,
+                    "permissions": "0", "managed": False, "mentionable": False, "flags": 0}
+        return {
+            "id": str(gid), "name": g["name"], "icon": None, "owner_id": str(g["members"][0]),
+            "roles": [everyone, self.role_payload(gid)],
+            "channels": [{"id": str(g["channel"]), "type": 0, "name": "general", "position": 0,
+                          "guild_id": str(gid), "permission_overwrites": [], "nsfw": False}],
+            "members": [], "member_count": len(g["members"]) + 1, "large": False,
+            "unavailable": False, "features": [], "emojis": [], "stickers": [], "threads": [],
+            "voice_states": [], "presences": [], "stage_instances": [],
+            "guild_scheduled_events": [], "soundboard_sounds": [],
+            "premium_tier": 0, "verification_level": 0, "joined_at": _iso(),
+        }
+
+    def channel_payload(self, gid: int) -> dict:
+        return {"id": str(self.guilds[gid]["channel"]), "type": 0, "name": "general",
+                "guild_id": str(gid), "position": 0, "permission_overwrites": [], "nsfw": False}
+
+    def message_payload(self, mid: int, channel_id: int, gid: Optional[int], body: dict, flags: int = 0) -> dict:
+        return {
+            "id": str(mid), "channel_id": str(channel_id), "guild_id": str(gid) if gid else None,
+            "author": self.bot_user, "content": body.get("content") or "",
+            "embeds": body.get("embeds") or [], "components": body.get("components") or [],
+            "timestamp": _iso(), "edited_timestamp": None, "tts": False, "mention_everyone": False,
+            "mentions": [], "mention_roles": [], "attachments": [], "pinned": False,
+            "type": 0, "flags": flags,
+        }
+
+    def remember(self, message: dict) -> None:
+        mid = int(message["id"])
+        self.messages[mid] = message
+        self._message_order.append(mid)
+        while len(self._message_order) > 5000:
+            self.messages.pop(self._message_order.popleft(), None)
+
+    # ── gateway ─────────────────────────────────────────────────────────────
+
+    def shard_of(self, gid: int, count: int) -> int:
+        return (gid >> 22) % count
+
+    async def gateway(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(heartbeat=None, max_msg_size=0)
+        await ws.prepare(request)
+        session = Session(self, ws)
+        await session.run()
+        return ws
+
+    async def dispatch(self, gid: int, event: str, data: dict) -> bool:
+        session = self.sockets.get(self.shard_of(gid, self.shards))
+        if session is None:
+            return False
+        await session.send_dispatch(event, data)
+        return True
+
+    async def remove_guild(self, gid: int) -> None:
+        """The bot is kicked: GUILD_DELETE, and no more traffic from that guild."""
+        await self.dispatch(gid, "GUILD_DELETE", {"id": str(gid)})
+        g = self.guilds.pop(gid)
+        for uid in g["members"]:
+            self.users.pop(uid, None)
+        self.counters["guilds_left"] += 1
+
+    # ── REST ────────────────────────────────────────────────────────────────
+
+    def app(self) -> web.Application:
+        app = web.Application(middlewares=[self._middleware])
+        r = app.router
+        r.add_get("/gateway", self.gateway)
+        r.add_get("/api/v10/gateway/bot", self.get_gateway_bot)
+        r.add_get("/api/v10/users/@me", self.get_me)
+        r.add_get("/api/v10/oauth2/applications/@me", self.get_application)
+        r.add_put("/api/v10/applications/{app}/commands", self.put_commands)
+        r.add_put("/api/v10/applications/{app}/guilds/{guild}/commands", self.put_commands)
+        r.add_post("/api/v10/interactions/{iid}/{token}/callback", self.interaction_callback)
+        r.add_patch("/api/v10/webhooks/{app}/{token}/messages/{mid}", self.edit_webhook_message)
+        r.add_post("/api/v10/webhooks/{app}/{token}", self.followup)
+        r.add_post("/api/v10/channels/{cid}/messages", self.create_message)
+        r.add_route("*", "/{tail:.*}", self.unknown)
+        return app
+
+    @web.middleware
+    async def _middleware(self, request: web.Request, handler):
+        self.counters["requests"] += 1
+        if request.path.startswith("/api/") and "/interactions/" not in request.path:
+            # Interaction callbacks are exempt from the global limit, like on Discord
+            wait = self.global_bucket.take(time.monotonic())
+            if wait is not None:
+                return self.too_many(wait, "global")
+            if self.spurious_429 and self.rng.random() < self.spurious_429:
+                return self.too_many(round(self.rng.uniform(0.1, 1.0), 3), "shared", "shared")
+        return await handler(request)
+
+    def too_many(self, retry_after: float, scope: str, bucket: str = "") -> web.Response:
+        self.counters[f"429_{scope}"] += 1
+        headers = {"Retry-After": f"{retry_after:.3f}", "X-RateLimit-Scope": scope}
+        if scope == "global":
+            headers["X-RateLimit-Global"] = "true"
+        else:
+            headers.update({"X-RateLimit-Limit": "0", "X-RateLimit-Remaining": "0",
+                            "X-RateLimit-Reset-After": f"{retry_after:.3f}", "X-RateLimit-Bucket": bucket})
+        return _json(
+            {"message": "You are being rate limited.", "retry_after": retry_after, "global": scope == "global"},
+            status=429, headers=headers,
+        )
+
+    def limited(self, key: Tuple[str, int], limit: int, per: float) -> Tuple[Optional[web.Response], dict]:
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(limit, per)
+        now = time.monotonic()
+        wait = bucket.take(now)
+        name = f"{key[0]}:{key[1]}"
+        if wait is not None:
+            return self.too_many(wait, "user", name), {}
+        return None, {
+            "X-RateLimit-Limit": str(bucket.limit), "X-RateLimit-Remaining": str(bucket.remaining),
+            "X-RateLimit-Reset": f"{time.time() + bucket.reset_at - now:.3f}",
+            "X-RateLimit-Reset-After": f"{bucket.reset_at - now:.3f}", "X-RateLimit-Bucket": name,
+        }
+
+    async def unknown(self, request: web.Request) -> web.Response:
+        self.counters["unknown_route"] += 1
+        print(f"[emulator] Unhandled {request.method} {request.path}")
+        return _json({"message": "404: Not Found", "code": 0}, status=404)
+
+    async def get_gateway_bot(self, request: web.Request) -> web.Response:
+        return _json({
+            "url": f"ws://{self.host}:{self.port}/gateway", "shards": self.shards,
+            "session_start_limit": {"total": 1000, "remaining": 1000, "reset_after": 0, "max_concurrency": 1},
+        })
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return _json(self.bot_user)
+
+    async def get_application(self, request: web.Request) -> web.Response:
+        return _json({"id": str(self.app_id), "name": "gamer-mimimi", "icon": None,
+                                  "description": "", "bot_public": True, "bot_require_code_grant": False,
+                                  "verify_key": "", "flags": 0, "owner": self.user_payload(1)})
+
+    async def put_commands(self, request: web.Request) -> web.Response:
+        guild = request.match_info.get("guild")
+        gid = int(guild) if guild else None
+        resp, headers = self.limited(("commands", gid or 0), 5, 20.0)
+        if resp is not None:
+            return resp
+        out = []
+        for cmd in await request.json():
+            cid = self.commands.setdefault((gid, cmd["name"]), self.snowflake())
+            out.append(dict(cmd, id=str(cid), application_id=str(self.app_id), version=str(cid),
+                            guild_id=guild, type=cmd.get("type", 1)))
+        if gid is not None and all((g, "gamer-mimimi") in self.commands for g in self.guilds):
+            self.synced.set()
+        return _json(out, headers=headers)
+
+    async def interaction_callback(self, request: web.Request) -> web.Response:
+        iid = int(request.match_info["iid"])
+        body = await request.json()
+        pending = self.pending.get(iid)
+        if pending is None:
+            return _json({"message": "Unknown interaction", "code": 10062}, status=404)
+        if pending.acked:
+            return _json({"message": "Interaction has already been acknowledged.", "code": 40060},
+                                     status=400)
+        elapsed = time.perf_counter() - pending.sent
+        if elapsed > ACK_DEADLINE:
+            self.counters["ack_too_late"] += 1
+            return _json({"message": "Unknown interaction", "code": 10062}, status=404)
+        pending.acked = True
+        self.latency.add(pending.kind, elapsed)
+        ephemeral = bool((body.get("data") or {}).get("flags", 0) & EPHEMERAL)
+        if pending.kind in ("tonight", "specific"):
+            self.publishing[pending.channel_id].append(pending)
+        return _json({
+            "interaction": {"id": str(iid), "type": 2, "response_message_loading": body.get("type") == 5,
+                            "response_message_ephemeral": ephemeral},
+        })
+
+    async def edit_webhook_message(self, request: web.Request) -> web.Response:
+        resp, headers = self.limited(("webhook", hash(request.match_info["token"]) & 0xFFFFFFFF), 5, 2.0)
+        if resp is not None:
+            return resp
+        self.counters["edits"] += 1
+        body = await request.json()
+        mid = request.match_info["mid"]
+        message = self.messages.get(int(mid)) if mid.isdigit() else None
+        if message is None:
+            message = self.message_payload(self.snowflake(), 0, None, body)
+        else:
+            message.update({k: v for k, v in body.items() if k in ("content", "embeds", "components")})
+            message["edited_timestamp"] = _iso()
+        return _json(message, headers=headers)
+
+    async def followup(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        return _json(self.message_payload(self.snowflake(), 0, None, body, body.get("flags", 0)))
+
+    async def create_message(self, request: web.Request) -> web.Response:
+        cid = int(request.match_info["cid"])
+        resp, headers = self.limited(("channel", cid), *self.channel_rate)
+        if resp is not None:
+            return resp
+        body = await request.json()
+        gid = next((g for g, data in self.guilds.items() if data["channel"] == cid), None)
+        message = self.message_payload(self.snowflake(), cid, gid, body)
+        self.remember(message)
+        self.counters["messages"] += 1
+        if body.get("components") and gid is not None:
+            self.guilds[gid]["rsvps"].append(int(message["id"]))
+            # Attribute the post to the command that asked for it by the
+            # author mention in its embed; failed commands never post.
+            waiting = self.publishing.get(cid, ())
+            embeds = json.dumps(body.get("embeds"))
+            for p in waiting:
+                if f"<@{p.user_id}>" in embeds:
+                    waiting.remove(p)
+                    self.latency.add(f"{p.kind}→posted", time.perf_counter() - p.sent)
+                    break
+        return _json(message, headers=headers)
+
+    # ── synthetic interactions ──────────────────────────────────────────────
+
+    def _base(self, kind: str, itype: int, gid: int, uid: int, data: dict, admin: bool = False) -> dict:
+        iid = self.snowflake()
+        self.pending[iid] = _Pending(kind, self.guilds[gid]["channel"], uid)
+        return {
+            "id": str(iid), "application_id": str(self.app_id), "type": itype, "data": data,
+            "guild_id": str(gid), "channel": self.channel_payload(gid), "channel_id": str(self.guilds[gid]["channel"]),
+            "member": self.member_payload(uid, gid, admin), "token": f"tok{iid}", "version": 1,
+            "app_permissions": str((1 << 41) - 1), "locale": "en-US", "guild_locale": "en-US",
+            "entitlements": [], "authorizing_integration_owners": {"0": str(gid)}, "context": 0,
+        }
+
+    def command(self, kind: str, gid: int, uid: int, sub: str, options: Optional[list] = None,
+                resolved: Optional[dict] = None, itype: int = 2, admin: bool = False) -> dict:
+        data = {"id": str(self.commands.get((gid, "gamer-mimimi"), 0)), "name": "gamer-mimimi", "type": 1,
+                "guild_id": str(gid), "options": [{"name": sub, "type": 1, "options": options or []}]}
+        if resolved:
+            data["resolved"] = resolved
+        return self._base(kind, itype, gid, uid, data, admin)
+
+    def build(self, kind: str, gid: Optional[int] = None) -> Optional[Tuple[int, dict]]:
+        gid = gid or self.rng.choice(list(self.guilds))
+        g = self.guilds[gid]
+        if not g["ready"]:
+            role = self.role_payload(gid)
+            g["ready"] = True
+            return gid, self.command("setpingrole", gid, g["members"][0], "setpingrole",
+                                     [{"name": "role", "type": 8, "value": role["id"]}],
+                                     {"roles": {role["id"]: role}}, admin=True)
+        uid = self.rng.choice(g["members"])
+        if kind in ("click", "roster", "besttime") and not g["rsvps"]:
+            kind = "tonight"
+        if kind == "click" or kind == "roster":
+            message = self.messages.get(self.rng.choice(g["rsvps"]))
+            if message is None:
+                return None
+            prefix = "rsvp" if "<t:" in json.dumps(message["embeds"]) else "tonight"
+            custom_id = f"{prefix}_roster" if kind == "roster" else f"{prefix}_{self.rng.choice(['join', 'cant', 'maybe'])}"
+            payload = self._base(kind, 3, gid, uid, {"custom_id": custom_id, "component_type": 2})
+            payload["message"] = message
+            return gid, payload
+        if kind == "autocomplete":
+            return gid, self.command(kind, gid, uid, "settimezone",
+                                     [{"name": "tz", "type": 3, "value": self.rng.choice(TYPED), "focused": True}],
+                                     itype=4)
+        if kind == "settimezone":
+            if uid not in g["zoned"]:
+                g["zoned"].append(uid)
+            return gid, self.command(kind, gid, uid, "settimezone",
+                                     [{"name": "tz", "type": 3, "value": self.rng.choice(ZONES)}])
+        if kind == "specific":
+            uid = self.rng.choice(g["zoned"]) if g["zoned"] else uid
+            return gid, self.command(kind, gid, uid, "specific",
+                                     [{"name": "when", "type": 3, "value": self.rng.choice(WHEN)}])
+        if kind == "stats":
+            target = self.rng.choice(g["members"])
+            member = self.member_payload(target, gid)
+            user = member.pop("user")
+            return gid, self.command(kind, gid, uid, "stats", [{"name": "user", "type": 6, "value": str(target)}],
+                                     {"users": {str(target): user}, "members": {str(target): member}})
+        if kind == "besttime":
+            return gid, self.command(kind, gid, uid, "besttime",
+                                     [{"name": "rsvp", "type": 3, "value": str(self.rng.choice(g["rsvps"]))}])
+        return gid, self.command(kind, gid, uid, kind)   # tonight, upcoming
+
+    async def fire(self, kind: str, gid: Optional[int] = None) -> None:
+        built = self.build(kind, gid)
+        if built is None:
+            return
+        gid, payload = built
+        self.counters["interactions"] += 1
+        await self.dispatch(gid, "INTERACTION_CREATE", payload)
+
+    async def drive(
+        self,
+        rate: float,
+        duration: float,
+        mix: Optional[Dict[str, int]] = None,
+        leave_every: float = 0,
+    ) -> None:
+        """Fire interactions as a Poisson process of `rate` per second, and
+        leave a random guild every `leave_every` seconds (0 = never)."""
+        mix = mix or DEFAULT_MIX
+        kinds, weights = list(mix), list(mix.values())
+        end = time.monotonic() + duration
+        next_leave = time.monotonic() + leave_every if leave_every else float("inf")
+        loop = asyncio.get_running_loop()
+        tasks = set()
+        while time.monotonic() < end:
+            if time.monotonic() >= next_leave and len(self.guilds) > 1:
+                await self.remove_guild(self.rng.choice(list(self.guilds)))
+                next_leave += leave_every
+            task = loop.create_task(self.fire(self.rng.choices(kinds, weights)[0]))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            await asyncio.sleep(self.rng.expovariate(rate))
+            self.expire_pending()
+        await asyncio.gather(*tasks)
+
+    def expire_pending(self) -> None:
+        cutoff = time.perf_counter() - ACK_DEADLINE
+        stale = [iid for iid, p in self.pending.items() if p.sent < cutoff]
+        for iid in stale:
+            if not self.pending.pop(iid).acked:
+                self.counters["unacked"] += 1
+
+    def report(self) -> dict:
+        return {"latency": self.latency.summary(), "counters": dict(self.counters)}
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765) -> web.AppRunner:
+        self.host, self.port = host, port
+        runner = web.AppRunner(self.app(), access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, host, port).start()
+        print(f"[emulator] REST http://{host}:{port}/api/v10 · gateway ws://{host}:{port}/gateway · "
+              f"{len(self.guilds)} guilds × {len(next(iter(self.guilds.values()))['members'])} members")
+        return runner
+
+
+class Session:
+    """One gateway connection (one shard)."""
+
+    def __init__(self, emu: FakeDiscord, ws: web.WebSocketResponse):
+        self.emu = emu
+        self.ws  = ws
+        self.seq = 0
+        self.shard: Tuple[int, int] = (0, 1)
+        self.lock = asyncio.Lock()
+
+    async def send(self, payload: dict) -> None:
+        async with self.lock:
+            if not self.ws.closed:
+                await self.ws.send_str(json.dumps(payload))
+
+    async def send_dispatch(self, event: str, data: Any) -> None:
+        self.seq += 1
+        await self.send({"op": 0, "t": event, "s": self.seq, "d": data})
+
+    async def run(self) -> None:
+        await self.send({"op": 10, "d": {"heartbeat_interval": 41250}})
+        async for msg in self.ws:
+            if msg.type != WSMsgType.TEXT:
+                break
+            data = json.loads(msg.data)
+            op = data.get("op")
+            if op == 1:
+                await self.send({"op": 11})
+            elif op == 2:
+                await self.identify(data["d"])
+            elif op == 6:
+                await self.send_dispatch("RESUMED", {})
+        for shard_id, session in list(self.emu.sockets.items()):
+            if session is self:
+                del self.emu.sockets[shard_id]
+
+    async def identify(self, d: dict) -> None:
+        shard_id, count = d.get("shard") or (0, 1)
+        self.shard = (shard_id, count)
+        self.emu.shards = count
+        self.emu.sockets[shard_id] = self
+        mine = [g for g in self.emu.guilds if self.emu.shard_of(g, count) == shard_id]
+        await self.send_dispatch("READY", {
+            "v": 10, "user": self.emu.bot_user, "guilds": [{"id": str(g), "unavailable": True} for g in mine],
+            "session_id": f"session-{shard_id}", "shard": [shard_id, count],
+            "resume_gateway_url": f"ws://{self.emu.host}:{self.emu.port}/gateway",
+            "application": {"id": str(self.emu.app_id), "flags": 0},
+            "private_channels": [], "relationships": [],
+        })
+        for gid in mine:
+            await self.send_dispatch("GUILD_CREATE", self.emu.guild_payload(gid))
+
+
+async def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Local Discord gateway + REST stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--members", type=int, default=25)
+    parser.add_argument("--rate", type=float, default=0, help="interactions/s once commands are synced (0 = idle)")
+    parser.add_argument("--duration", type=float, default=float("inf"))
+    parser.add_argument("--spurious-429", type=float, default=0.0, help="share of REST calls to 429 at random")
+    args = parser.parse_args(argv)
+
+    emu = FakeDiscord(guilds=args.guilds, members=args.members, spurious_429=args.spurious_429)
+    await emu.start(args.host, args.port)
+    await emu.synced.wait()
+    print("[emulator] Commands synced")
+    if args.rate:
+        await emu.drive(args.rate, args.duration)
+        print(json.dumps(emu.report(), indent=2))
+    else:
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
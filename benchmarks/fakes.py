@@ -0,0 +1,89 @@
+# benchmarks/fakes.py
+#
+# Just enough of discord.py's Interaction / User / Channel surface for the
+# handlers in bot.py to run without a gateway or HTTP session. Every outbound
+# call is recorded instead of sent.
+
+import itertools
+from datetime import datetime, timezone
+from typing import Any, List, Optional, Tuple
+
+_ids = itertools.count(1_100_000_000_000_000_000)
+
+
+def snowflake() -> int:
+    return next(_ids)
+
+
+class FakeUser:
+    def __init__(self, user_id: Optional[int] = None):
+        self.id = user_id or snowflake()
+        self.mention = f"<@{self.id}>"
+        self.display_name = f"user{self.id % 10000}"
+        self.bot = False
+
+
+class FakeMessage:
+    def __init__(self, message_id: Optional[int] = None, channel_id: int = 0, embeds: Optional[list] = None):
+        self.id = message_id or snowflake()
+        self.channel_id = channel_id
+        self.embeds = embeds or []
+
+
+class FakeChannel:
+    """Stands in for the PartialMessageable returned by get_partial_messageable."""
+
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+        self.sent: List[dict] = []
+
+    async def send(self, **kwargs) -> FakeMessage:
+        self.sent.append(kwargs)
+        embeds = [kwargs["embed"]] if kwargs.get("embed") else []
+        return FakeMessage(channel_id=self.id, embeds=embeds)
+
+
+class FakeResponse:
+    def __init__(self, calls: List[Tuple[str, Any]]):
+        self._calls = calls
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self, kind: str, kwargs: dict) -> None:
+        if self._done:
+            raise RuntimeError("interaction already responded to")
+        self._done = True
+        self._calls.append((kind, kwargs))
+
+    async def defer(self, **kwargs) -> None:
+        await self._respond("defer", kwargs)
+
+    async def send_message(self, content: Any = None, **kwargs) -> None:
+        await self._respond("send_message", dict(kwargs, content=content))
+
+    async def edit_message(self, **kwargs) -> None:
+        await self._respond("edit_message", kwargs)
+
+
+class FakeInteraction:
+    def __init__(
+        self,
+        user: Optional[FakeUser] = None,
+        guild_id: int = 1,
+        channel_id: int = 2,
+        message: Optional[FakeMessage] = None,
+    ):
+        self.id = snowflake()
+        self.user = user or FakeUser()
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.message = message
+        self.command = None
+        self.created_at = datetime.now(timezone.utc)
+        self.calls: List[Tuple[str, Any]] = []
+        self.response = FakeResponse(self.calls)
+
+    async def edit_original_response(self, **kwargs) -> None:
+        self.calls.append(("edit_original_response", kwargs))
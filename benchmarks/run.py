@@ -0,0 +1,304 @@
+# benchmarks/run.py
+#
+# Offline benchmark suite: drives the real handlers in bot.py with the fakes
+# from fakes.py and reports p50/p99 latency, throughput and allocations.
+#
+#     python benchmarks/run.py                  # run + compare to baselines.json
+#     python benchmarks/run.py --save-baseline  # record the current numbers
+#     python benchmarks/run.py --check          # exit 1 on a p50 regression
+#     python benchmarks/run.py --only rsvp      # scenarios whose name contains "rsvp"
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Awaitable, Callable, Dict, List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, ".."))
+sys.path.insert(0, HERE)
+
+# bot.py reads its config at import time: point it at a throwaway data dir.
+os.environ.setdefault("DISCORD_BOT_TOKEN", "offline-benchmark")
+os.environ["GAMER_DATA_DIR"] = tempfile.mkdtemp(prefix="gamer-bench-")
+os.environ.setdefault("GAMER_STORAGE", "sqlite")
+
+import bot  # noqa: E402
+from fakes import FakeChannel, FakeInteraction, FakeMessage, FakeUser, snowflake  # noqa: E402
+
+BASELINES = os.path.join(HERE, "baselines.json")
+TOLERANCE = 0.50   # p50 may drift this much (after scaling) before we call it a regression
+CONFIRM_RUNS = 2   # re-runs of a scenario that looks slower before it counts
+
+Op = Callable[[int], Awaitable[None]]
+
+
+class Result:
+    ref_us = 0.0   # p50 of the reference workload right before this scenario
+
+    def __init__(self, name: str, samples_ns: List[int], wall_s: float, alloc_bytes: float, extra: dict):
+        samples_ns.sort()
+        n = len(samples_ns)
+        self.name       = name
+        self.n          = n
+        self.p50_us     = samples_ns[n // 2] / 1e3
+        self.p99_us     = samples_ns[min(n - 1, int(n * 0.99))] / 1e3
+        self.throughput = n / wall_s if wall_s else 0.0
+        self.alloc_b    = alloc_bytes
+        self.extra      = extra
+
+    def row(self) -> str:
+        extra = " ".join(f"{k}={v}" for k, v in self.extra.items())
+        return (
+            f"{self.name:<28} n={self.n:<6} p50 {self.p50_us:>9.1f} µs  p99 {self.p99_us:>9.1f} µs  "
+            f"{self.throughput:>10.0f}/s  {self.alloc_b:>8.0f} B/op  {extra}"
+        )
+
+    def to_json(self) -> dict:
+        return {
+            "p50_us": round(self.p50_us, 1), "p99_us": round(self.p99_us, 1),
+            "throughput": round(self.throughput), "alloc_b": round(self.alloc_b),
+            "ref_us": round(self.ref_us, 1),
+        }
+
+
+async def measure(name: str, op: Op, n: int, extra: Callable[[], dict] = dict) -> Result:
+    # Pass 1: latency. Pass 2: allocations, kept separate so tracing overhead
+    # doesn't pollute the timings.
+    samples = []
+    wall0 = time.perf_counter()
+    for i in range(n):
+        t0 = time.perf_counter_ns()
+        await op(i)
+        samples.append(time.perf_counter_ns() - t0)
+    wall = time.perf_counter() - wall0
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for i in range(n, n + min(n, 500)):
+        await op(i)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(s.size_diff for s in after.compare_to(before, "filename") if s.size_diff > 0)
+    return Result(name, samples, wall, allocated / min(n, 500), extra())
+
+
+def reference_us(runs: int = 3, n: int = 1000) -> float:
+    """p50 of a fixed pure-Python workload (best of `runs`). Measured right
+    before each scenario and stored with its baseline, so a machine that is
+    busier, throttled or just different scales the expected p50 instead of
+    reading as a regression."""
+    payload = {"id": "1", "options": [{"name": f"opt{i}", "value": i * 7} for i in range(20)]}
+    best = float("inf")
+    for _ in range(runs):
+        samples = []
+        for i in range(n):
+            t0 = time.perf_counter_ns()
+            data = json.loads(json.dumps(payload))
+            sorted((o["value"] ^ i for o in data["options"]), reverse=True)
+            ", ".join(f"<@{o['value']}>" for o in data["options"])
+            samples.append(time.perf_counter_ns() - t0)
+        samples.sort()
+        best = min(best, samples[n // 2] / 1e3)
+    return best
+
+
+async def run_scenario(name: str) -> Result:
+    ref = reference_us()
+    result = await SCENARIOS[name]()
+    result.ref_us = ref
+    return result
+
+
+# ─── Scenarios ────────────────────────────────────────────────────────────────
+
+
+TYPED = ["Europe/Berlin", "America/New_York", "berlin", "CET", "tokyo", "Australia/Sydney"]
+
+
+async def bench_autocomplete() -> Result:
+    queries = [w[:i] for w in TYPED for i in range(len(w) + 1)]
+    inter = FakeInteraction()
+
+    async def op(i: int):
+        await bot.tz_autocomplete(inter, queries[i % len(queries)])
+
+    return await measure("tz_autocomplete", op, len(queries) * 50)
+
+
+async def click_storm(name: str, view_cls, users: int, clicks: int) -> Result:
+    view = view_cls()
+    record = bot.RSVPRecord(0, 1, 2, snowflake(), int(time.time()) + 3600)
+    message = FakeMessage(channel_id=2)
+    bot.rsvp_store.put(message.id, record)
+    people = [FakeUser() for _ in range(users)]
+    buttons = [view.join_button, view.cant_button, view.maybe_button]
+    edits0 = bot.rsvp_edits.edits
+
+    async def op(i: int):
+        inter = FakeInteraction(user=people[i % users], message=message)
+        await buttons[(i * 7) % 3].callback(inter)
+
+    result_extra: dict = {}
+    result = await measure(name, op, clicks, lambda: result_extra)
+    await asyncio.sleep(bot.rsvp_edits.window * 2)   # let the coalescer drain
+    result_extra.update(edits=bot.rsvp_edits.edits - edits0, responders=len(record.user_ids))
+    return result
+
+
+async def bench_rsvp_clicks() -> Result:
+    return await click_storm("rsvp_click_storm", bot.RSVPView, users=300, clicks=3000)
+
+
+async def bench_tonight_clicks() -> Result:
+    return await click_storm("tonight_click_storm", bot.TonightRSVPView, users=100, clicks=3000)
+
+
+async def bench_make_embed(size: int) -> Result:
+    record = bot.RSVPRecord(snowflake(), 1, 2, snowflake(), int(time.time()) + 3600)
+    for i in range(size):
+        record.set_status(snowflake(), i % 3)
+    bot.RSVPView.make_embed(record)  # first render builds the field cache
+
+    async def op(i: int):
+        record.set_status(snowflake(), i % 3)
+        bot.RSVPView.make_embed(record)
+
+    return await measure(f"make_embed[{size}]", op, 2000)
+
+
+async def bench_minute_select() -> Result:
+    channel = FakeChannel(2)
+    bot.bot.get_partial_messageable = lambda cid, **_: channel  # type: ignore[assignment]
+    bot.ping_role_map["1"] = snowflake()
+    user = FakeUser()
+    bot.timezone_map[str(user.id)] = "Europe/Berlin"
+    tomorrow = time.strftime("%Y-%m-%d", time.gmtime(time.time() + 86400))
+
+    async def op(i: int):
+        view = bot.PickerView("Europe/Berlin")
+        view.chosen_date, view.chosen_hour = tomorrow, f"{i % 24:02d}"
+        select = bot.MinuteSelect()
+        view.clear_items()
+        view.add_item(select)
+        select._values = ["30" if i % 2 else "00"]
+        await select.callback(FakeInteraction(user=user))
+
+    return await measure("MinuteSelect.callback", op, 1000, lambda: {"sent": len(channel.sent)})
+
+
+async def bench_specific_when() -> Result:
+    # The one-shot path: parse "when" + ack + publish in one handler
+    channel = FakeChannel(2)
+    bot.bot.get_partial_messageable = lambda cid, **_: channel  # type: ignore[assignment]
+    bot.ping_role_map["1"] = snowflake()
+    user = FakeUser()
+    bot.timezone_map[str(user.id)] = "America/New_York"
+    phrases = ["fri 21:30", "tomorrow 8pm", "in 2h", "sat at 9", "sun 20.30"]
+
+    async def op(i: int):
+        await bot.gamer_specific.callback(FakeInteraction(user=user), phrases[i % len(phrases)])
+
+    return await measure("specific(when)", op, 1000, lambda: {"sent": len(channel.sent)})
+
+
+async def bench_settimezone() -> Result:
+    zones = [z for z in bot.tz_catalog.names if "/" in z]
+
+    async def op(i: int):
+        await bot.gamer_settimezone.callback(FakeInteraction(user=FakeUser()), zones[i % len(zones)])
+
+    flush_ms: dict = {}
+    result = await measure("settimezone", op, 5000, lambda: flush_ms)
+    t0 = time.perf_counter()
+    await bot.store.flush()
+    flush_ms["flush_ms"] = round((time.perf_counter() - t0) * 1000, 1)
+    return result
+
+
+SCENARIOS: Dict[str, Callable[[], Awaitable[Result]]] = {
+    "tz_autocomplete":       bench_autocomplete,
+    "rsvp_click_storm":      bench_rsvp_clicks,
+    "tonight_click_storm":   bench_tonight_clicks,
+    "make_embed[10]":        lambda: bench_make_embed(10),
+    "make_embed[500]":       lambda: bench_make_embed(500),
+    "make_embed[5000]":      lambda: bench_make_embed(5000),
+    "MinuteSelect.callback": bench_minute_select,
+    "specific(when)":        bench_specific_when,
+    "settimezone":           bench_settimezone,
+}
+
+
+def compare(results: List[Result], baselines: dict, tolerance: float = TOLERANCE) -> Dict[str, str]:
+    """Scenarios whose p50 is over `tolerance` slower than their baseline,
+    once the baseline is scaled by the reference workload (`reference_us`).
+    p99 is reported but not gated: one GC pause or scheduler hiccup can
+    move it 10×."""
+    regressions = {}
+    for r in results:
+        base = baselines.get(r.name)
+        if not base or not base["p50_us"]:
+            continue
+        scale = r.ref_us / base["ref_us"] if base.get("ref_us") and r.ref_us else 1.0
+        expected = base["p50_us"] * scale
+        if r.p50_us > expected * (1 + tolerance):
+            regressions[r.name] = (
+                f"{r.name} p50_us: {base['p50_us']:.1f} → {r.p50_us:.1f} µs "
+                f"(+{(r.p50_us / expected - 1) * 100:.0f}% over the baseline scaled ×{scale:.2f} by the reference)"
+            )
+    return regressions
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for bot.py hot paths")
+    parser.add_argument("--only", default="", help="run scenarios whose name contains this")
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--check", action="store_true", help="exit 1 if a scenario regressed")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    bot.store.start()
+    bot.rsvp_edits.window = 0.05
+    bot.outbound.rate = 0   # measure the handlers, not the global pace
+    results = []
+    for name in SCENARIOS:
+        if args.only in name:
+            result = await run_scenario(name)
+            print(result.row())
+            results.append(result)
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES) as f:
+            baselines = json.load(f)
+    regressions = compare(results, baselines, args.tolerance)
+    # (not when saving: the best of several runs would make a too-tight baseline)
+    for _ in range(0 if args.save_baseline else CONFIRM_RUNS):
+        if not regressions:
+            break
+        # A one-off slow run is noise; a regression shows up every time
+        for i, r in enumerate(results):
+            if r.name in regressions:
+                again = await run_scenario(r.name)
+                print(f"{again.row()}  (re-run)")
+                if again.p50_us < r.p50_us:
+                    results[i] = again
+        regressions = compare(results, baselines, args.tolerance)
+    for line in regressions.values():
+        print(f"REGRESSION {line}")
+
+    if args.save_baseline:
+        baselines.update({r.name: r.to_json() for r in results})
+        with open(BASELINES, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"Saved {len(results)} baselines to {BASELINES}")
+    await bot.store.close()
+    return 1 if regressions and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
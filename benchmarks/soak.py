@@ -0,0 +1,183 @@
+# benchmarks/soak.py
+#
+# End-to-end load/soak run: starts the Discord emulator (emulator.py), runs
+# the real bot.py against it as a subprocess, fires synthetic interactions at
+# a steady rate and reports interaction latency, rate-limit hits and how the
+# bot's RSS moved over the run.
+#
+#     python benchmarks/soak.py                              # 2 minutes, 20/s
+#     python benchmarks/soak.py --duration 3600 --rate 50    # hour-long soak
+#     python benchmarks/soak.py --guilds 1000 --profile lean
+#     python benchmarks/soak.py --no-spawn                   # bot started by hand
+#
+# --max-growth MiB/h makes it exit 1 when the RSS trend after warm-up is
+# steeper than that, so it can gate a nightly job.
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from typing import List, Optional, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from emulator import FakeDiscord  # noqa: E402
+
+PAGE = os.sysconf("SC_PAGE_SIZE")
+MiB = 1024 * 1024
+
+
+def rss(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * PAGE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def slope(points: List[Tuple[float, int]]) -> float:
+    """Least-squares RSS trend in bytes per hour."""
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mx = sum(t for t, _ in points) / n
+    my = sum(v for _, v in points) / n
+    var = sum((t - mx) ** 2 for t, _ in points)
+    if not var:
+        return 0.0
+    return sum((t - mx) * (v - my) for t, v in points) / var * 3600
+
+
+def scrape(port: int) -> dict:
+    """The bot's own gauges from its /metrics endpoint (metrics.py)."""
+    try:
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=2) as resp:
+            text = resp.read().decode()
+    except OSError:
+        return {}
+    out = {}
+    for line in text.splitlines():
+        if line.startswith("gamer_") and "{" not in line:
+            name, _, value = line.partition(" ")
+            out[name] = float(value)
+    return out
+
+
+def spawn(args, data_dir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DISCORD_BOT_TOKEN="soak-test",
+        GAMER_API_BASE=f"http://127.0.0.1:{args.port}/api/v10",
+        GAMER_GATEWAY=f"ws://127.0.0.1:{args.port}/gateway",
+        GAMER_DATA_DIR=data_dir,
+        GAMER_METRICS_PORT=str(args.metrics_port),
+        GAMER_PROFILE=args.profile,
+        PYTHONUNBUFFERED="1",
+    )
+    log = open(os.path.join(data_dir, "bot.log"), "w")
+    return subprocess.Popen([sys.executable, os.path.join(HERE, "..", "bot.py")],
+                            env=env, stdout=log, stderr=subprocess.STDOUT)
+
+
+async def sample_rss(pid: int, start: float, points: List[Tuple[float, int]], every: float) -> None:
+    while True:
+        value = rss(pid)
+        if value is not None:
+            points.append((time.monotonic() - start, value))
+        await asyncio.sleep(every)
+
+
+async def run(args) -> int:
+    emu = FakeDiscord(guilds=args.guilds, members=args.members, spurious_429=args.spurious_429, seed=args.seed)
+    runner = await emu.start(port=args.port)
+    data_dir = tempfile.mkdtemp(prefix="gamer-soak-")
+    proc = None if args.no_spawn else spawn(args, data_dir)
+    if proc:
+        print(f"[soak] bot pid {proc.pid}, data + log in {data_dir}")
+
+    try:
+        await asyncio.wait_for(emu.synced.wait(), args.startup_timeout)
+    except asyncio.TimeoutError:
+        print(f"[soak] Commands not synced for every guild after {args.startup_timeout:.0f}s, driving anyway")
+    print(f"[soak] Driving {args.rate:g}/s for {args.duration:g}s across {args.guilds} guilds")
+
+    points: List[Tuple[float, int]] = []
+    sampler = None
+    if proc:
+        sampler = asyncio.get_running_loop().create_task(
+            sample_rss(proc.pid, time.monotonic(), points, max(1.0, args.duration / 600)))
+    try:
+        await emu.drive(args.rate, args.duration, leave_every=args.leave_every)
+        await asyncio.sleep(3.5)   # let in-flight interactions ack or time out
+        emu.expire_pending()
+        gauges = scrape(args.metrics_port)
+    finally:
+        if sampler:
+            sampler.cancel()
+        if proc:
+            proc.terminate()
+            try:
+                proc.wait(10)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+        await runner.cleanup()
+
+    report = emu.report()
+    print(f"\n{'interaction':<20}{'n':>8}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for kind, s in report["latency"].items():
+        print(f"{kind:<20}{s['n']:>8}{s['p50_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+    counters = report["counters"]
+    print("\n" + "  ".join(f"{k}={v}" for k, v in sorted(counters.items())))
+
+    growth = None
+    if points:
+        # Ignore the first 10% while caches, tables and pools fill up
+        warm = [p for p in points if p[0] >= points[-1][0] * 0.1]
+        growth = slope(warm) / MiB
+        print(f"RSS {points[0][1] / MiB:.1f} → {points[-1][1] / MiB:.1f} MiB "
+              f"(peak {max(v for _, v in points) / MiB:.1f}), trend after warm-up {growth:+.1f} MiB/h")
+    if gauges:
+        print("bot gauges: " + "  ".join(f"{k[6:]}={v:g}" for k, v in sorted(gauges.items())))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"latency": report["latency"], "counters": counters, "rss": points,
+                       "growth_mib_per_h": growth, "gauges": gauges}, f, indent=2)
+
+    failed = False
+    if counters.get("unacked") or counters.get("ack_too_late"):
+        print(f"[soak] {counters.get('unacked', 0)} interactions never acknowledged in time")
+        failed = args.strict
+    if args.max_growth is not None and growth is not None and growth > args.max_growth:
+        print(f"[soak] RSS grows {growth:.1f} MiB/h, over the {args.max_growth:g} MiB/h limit")
+        failed = True
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="End-to-end soak test against the local Discord emulator")
+    parser.add_argument("--guilds", type=int, default=100)
+    parser.add_argument("--members", type=int, default=25)
+    parser.add_argument("--rate", type=float, default=20.0, help="interactions per second")
+    parser.add_argument("--duration", type=float, default=120.0, help="seconds of load")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--metrics-port", type=int, default=9465)
+    parser.add_argument("--profile", default="default", choices=["default", "lean"])
+    parser.add_argument("--spurious-429", type=float, default=0.01, help="share of REST calls to 429 at random")
+    parser.add_argument("--leave-every", type=float, default=0, help="kick the bot from a guild every N seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--max-growth", type=float, help="fail above this RSS trend (MiB/h)")
+    parser.add_argument("--strict", action="store_true", help="fail if any interaction went unacknowledged")
+    parser.add_argument("--json", help="also write the full report here")
+    parser.add_argument("--no-spawn", action="store_true", help="don't start bot.py; connect one yourself")
+    return asyncio.run(run(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
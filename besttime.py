@@ -0,0 +1,136 @@
+# besttime.py
+
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+SLOT   = 1800            # 30-minute slots
+DAY    = 86400
+SAMPLE = 6 * 3600        # probe spacing when building a transition table
+MAX_DAYS = 14
+
+GOOD = 0.5               # weight at or above which a slot counts as "free"
+
+
+def _preference(ranges: Iterable[Tuple[float, float, float]]) -> np.ndarray:
+    w = np.zeros(DAY // SLOT)
+    for start, end, value in ranges:
+        w[int(start * 2):int(end * 2)] = value
+    return w
+
+
+# How good a local half hour is for a session (index 0 = 00:00–00:30)
+WEEKDAY = _preference([(0, 1, 0.3), (8, 17, 0.2), (17, 19, 0.6), (19, 23, 1.0), (23, 24, 0.5)])
+WEEKEND = _preference([(0, 2, 0.4), (9, 12, 0.5), (12, 19, 0.8), (19, 23, 1.0), (23, 24, 0.8)])
+PREFERENCE = np.stack([WEEKDAY, WEEKEND])
+
+
+class TransitionTable:
+    """UTC-offset transitions of one zone over [start, end).
+
+    Built by probing every `SAMPLE` seconds and bisecting to the exact second
+    wherever the offset changed, so looking up thousands of instants is a
+    single searchsorted instead of one zoneinfo call each.
+    """
+
+    def __init__(self, zone: str, start: int, end: int):
+        tz = ZoneInfo(zone)
+
+        def offset(t: int) -> int:
+            return int(datetime.fromtimestamp(t, tz).utcoffset().total_seconds())  # type: ignore[union-attr]
+
+        at, offsets = [start], [offset(start)]
+        t = start
+        while t < end:
+            nxt = min(t + SAMPLE, end)
+            o = offset(nxt)
+            if o != offsets[-1]:
+                lo, hi = t, nxt
+                while hi - lo > 1:
+                    mid = (lo + hi) // 2
+                    if offset(mid) == offsets[-1]:
+                        lo = mid
+                    else:
+                        hi = mid
+                at.append(hi)
+                offsets.append(o)
+            t = nxt
+        self.start, self.end = start, end
+        self.at      = np.array(at, dtype=np.int64)
+        self.offsets = np.array(offsets, dtype=np.int64)
+
+    def covers(self, start: int, end: int) -> bool:
+        return self.start <= start and end <= self.end
+
+    def offsets_at(self, ts: np.ndarray) -> np.ndarray:
+        return self.offsets[np.searchsorted(self.at, ts, side="right") - 1]
+
+
+class Slot(NamedTuple):
+    ts: int           # UTC start
+    score: float      # summed preference over everyone
+    free: int         # people for whom it's a decent time
+
+
+class BestTimeFinder:
+    """Scores every 30-minute slot of the next days against each person's
+    local evening/weekend preference.
+
+    The score is a users×slots matrix summed over users. Users sharing a
+    zone have identical rows, so it's computed as
+    (people per zone) · (zones×slots preference), which is the same sum at
+    a fraction of the size.
+    """
+
+    def __init__(self):
+        self._tables: Dict[str, TransitionTable] = {}
+
+    def table(self, zone: str, start: int, end: int) -> TransitionTable:
+        table = self._tables.get(zone)
+        if table is None or not table.covers(start, end):
+            table = self._tables[zone] = TransitionTable(zone, start - DAY, start + (MAX_DAYS + 1) * DAY)
+        return table
+
+    def score(self, zones: Iterable[str], days: int, now: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (slot starts, score, free count) for the next `days` days."""
+        now = time.time() if now is None else now
+        first = (int(now) // SLOT + 1) * SLOT
+        slots = first + SLOT * np.arange(days * DAY // SLOT, dtype=np.int64)
+        counts = Counter(zones)
+        names = list(counts)
+        if not names:
+            zeros = np.zeros(len(slots))
+            return slots, zeros, zeros.astype(np.int64)
+
+        local = np.empty((len(names), len(slots)), dtype=np.int64)
+        for i, zone in enumerate(names):
+            local[i] = slots + self.table(zone, first, int(slots[-1]) + SLOT).offsets_at(slots)
+        half_hour = (local % DAY) // SLOT
+        weekend = ((local // DAY + 3) % 7) >= 5   # 1970-01-01 was a Thursday
+        weights = PREFERENCE[weekend.astype(np.intp), half_hour]
+
+        people = np.array([counts[z] for z in names], dtype=np.float64)
+        return slots, people @ weights, (people @ (weights >= GOOD)).astype(np.int64)
+
+    def best(
+        self,
+        zones: Iterable[str],
+        days: int = 3,
+        top: int = 5,
+        spacing: int = 2 * 3600,
+        now: Optional[float] = None,
+    ) -> List[Slot]:
+        """Highest-scoring slots, earliest first on ties, at least `spacing` apart."""
+        slots, score, free = self.score(zones, days, now)
+        picked: List[Slot] = []
+        for i in np.lexsort((slots, -score)):
+            if score[i] <= 0 or len(picked) == top:
+                break
+            ts = int(slots[i])
+            if all(abs(ts - p.ts) >= spacing for p in picked):
+                picked.append(Slot(ts, float(score[i]), int(free[i])))
+        return picked
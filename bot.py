@@ -1,63 +1,146 @@
 # bot.py
 
+import asyncio
 import os
-import json
+import re
+import signal
+import time
+import aiohttp
+from functools import lru_cache
 import discord
-from zoneinfo import ZoneInfo, available_timezones
+from zoneinfo import ZoneInfo
 from discord import app_commands
 from discord.ext import commands
 from discord.ui import View, Select, Button
+import yarl
 from dotenv import load_dotenv
-from datetime import datetime, timedelta, timezone
-from typing import Optional
+from datetime import datetime, timedelta
+from typing import Iterable, Literal, Optional, Set
+from besttime import BestTimeFinder
+from cmdsync import CommandSyncer
+from coalescer import EditCoalescer
+from compaction import CompactionReport, Compactor, rsvp_expired
+from events import Event, EventIndex
+from dispatch import ANNOUNCE, EDIT, INTERACTION, REMINDER, Dispatcher
+import metrics
+from metrics import instrumented
+from procstats import format_bytes, release_memory, rss_bytes, rss_per_guild
+from rsvp import FIELD_LIMIT, JOIN, CANT, MAYBE, STATUSES, RSVPRecord, RSVPStore, encode_record, mention_chunks
+from rsvplog import ShardedRSVPLog, Tally
+from scheduler import ReminderScheduler
+from sharding import ShardConfig, identify_gate
+from storage import open_store
+from timeparse import parse_when
+from tzbulk import ImportReport, add_imported, apply_zones, export_zones, imported_users, read_zones, stream_url
+from tzcatalog import TimezoneCatalog
 
 # ─── Setup ─────────────────────────────────────────────────────────────────────
 
+PROCESS_START = time.perf_counter()   # for the time-to-ready log line
+
 load_dotenv()
 TOKEN = os.getenv("DISCORD_BOT_TOKEN")
 if TOKEN is None:
     print("Error: DISCORD_BOT_TOKEN is not set!")
     exit(1)
 
+# Point REST and the gateway somewhere else, e.g. the local emulator in
+# benchmarks/emulator.py for load/soak tests. Unset: real Discord.
+API_BASE = os.getenv("GAMER_API_BASE")
+if API_BASE:
+    discord.http.Route.BASE = API_BASE
+GATEWAY = os.getenv("GAMER_GATEWAY")
+if GATEWAY:
+    discord.gateway.DiscordWebSocket.DEFAULT_GATEWAY = yarl.URL(GATEWAY)
+
 # Optional guild‐ID for dev (instant sync); unset in production
 
-# Persist user → IANA timezone
-TZ_FILE = "timezones.json"
-try:
-    with open(TZ_FILE, "r") as f:
-        timezone_map = json.load(f)
-        if not isinstance(timezone_map, dict):
-            raise ValueError
-except (FileNotFoundError, json.JSONDecodeError, ValueError):
-    timezone_map = {}
-
-# ─── Persist guild → ping-role ID ─────────────────────────────────────────────
-PING_FILE = "ping_roles.json"
-try:
-    with open(PING_FILE, "r") as f:
-        ping_role_map = json.load(f)
-        if not isinstance(ping_role_map, dict):
-            raise ValueError
-except (FileNotFoundError, json.JSONDecodeError, ValueError):
-    ping_role_map = {}
-
-def save_ping_roles() -> None:
-    with open(PING_FILE, "w") as f:
-        json.dump(ping_role_map, f, indent=2)
-
-intents = discord.Intents.default()
-bot = commands.Bot(command_prefix="!", intents=intents)
+# ─── Persistent state ────────────────────────────────────────────────────────
+# user → IANA timezone, guild → ping-role ID. Both live in memory and are
+# written behind by `store` (SQLite/WAL by default, see storage.py); the
+# legacy JSON files are imported once on first start.
+DATA_DIR  = os.getenv("GAMER_DATA_DIR", ".")
+TZ_FILE   = os.path.join(DATA_DIR, "timezones.json")
+PING_FILE = os.path.join(DATA_DIR, "ping_roles.json")
+
+store = open_store(DATA_DIR, files={"timezones": TZ_FILE, "ping_roles": PING_FILE})
+store.migrate_json("timezones", TZ_FILE)
+store.migrate_json("ping_roles", PING_FILE)
+timezone_map  = store.map("timezones")
+ping_role_map = store.map("ping_roles")
+# guild ID → users whose zones its imports set (packed, tzbulk.add_imported),
+# so exportzones returns everything importzones took in
+zone_imports  = store.map("zone_imports")
+
+# Built once: tzdata scan, alias + trigram index (see tzcatalog.py)
+tz_catalog = TimezoneCatalog()
+# Per-zone UTC-offset tables for /besttime, built on first use (besttime.py)
+best_times = BestTimeFinder()
+
+# ─── Sharding ─────────────────────────────────────────────────────────────────
+# launcher.py runs N copies of this file, each owning a shard range; state is
+# shared through the SQLite store. Run directly, one process owns everything.
+shards = ShardConfig()
+
+class GamerBot(commands.AutoShardedBot):
+    async def before_identify_hook(self, shard_id: Optional[int], *, initial: bool = False) -> None:
+        # Other worker processes identify too: space IDENTIFYs across all of them
+        if not (shards.multiprocess and await identify_gate(shards, shard_id or 0, DATA_DIR)):
+            await super().before_identify_hook(shard_id, initial=initial)
+
+    async def setup_hook(self) -> None:
+        store.start()
+        # One persistent view per RSVP kind serves every message (even after a restart)
+        self.add_view(TonightRSVPView())
+        self.add_view(RSVPView())
+        reminders.start()
+        compactor.start()
+        # Loop-lag sampler + optional local Prometheus endpoint (metrics.py)
+        self.loop.create_task(metrics.watch_loop_lag())
+        if METRICS_PORT:
+            self.metrics_runner = await metrics.serve(METRICS_PORT)
+
+    async def close(self) -> None:
+        await reminders.stop()
+        await compactor.stop()
+        await super().close()
+        await store.close()   # final flush of anything still dirty
+        rsvp_log.close()
+
+# ─── Gateway/cache profile ───────────────────────────────────────────────────
+# "lean" (GAMER_PROFILE=lean): everything here runs off interactions and raw
+# IDs, so only the guilds intent is kept (guild list, joins/leaves) and the
+# message cache, member cache and guild chunking are switched off.
+PROFILE = os.getenv("GAMER_PROFILE", "default").lower()
+if PROFILE == "lean":
+    intents = discord.Intents.none()
+    intents.guilds = True
+    cache_options = dict(
+        max_messages=None,
+        member_cache_flags=discord.MemberCacheFlags.none(),
+        chunk_guilds_at_startup=False,
+    )
+else:
+    intents = discord.Intents.default()
+    cache_options = {}
+
+bot = GamerBot(
+    command_prefix="!", intents=intents,
+    shard_count=shards.shard_count, shard_ids=shards.shard_ids,
+    http_trace=metrics.http_trace(),   # per-handler HTTP calls, ack latency, 429s
+    **cache_options,
+)
+# Under launcher.py each worker serves on its own port: the base + its index
+METRICS_PORT = int(os.getenv("GAMER_METRICS_PORT") or 0)
+if METRICS_PORT:
+    METRICS_PORT += int(os.getenv("GAMER_WORKER", "0"))
 
 # ─── Autocomplete helper for /mytimezone ──────────────────────────────────────
 
 async def tz_autocomplete(interaction: discord.Interaction, current: str):
-    matches = [
-        tz for tz in sorted(available_timezones())
-        if current.lower() in tz.lower()
-    ]
     return [
         app_commands.Choice(name=tz, value=tz)
-        for tz in matches[:25]
+        for tz in tz_catalog.search(current, limit=25)
     ]
 
 # ─── Group‐level check: require ping-role before ANY subcommand ──────────────
@@ -78,80 +161,249 @@ def ping_role_required():
         return True
     return app_commands.check(predicate)
 
-# ─── “Tonight” RSVP ──────────────────────────────────────────────────────────
+# ─── RSVP state + shared button logic ────────────────────────────────────────
+# message ID → compact RSVPRecord (rsvp.py), persisted and loaded lazily on the
+# first click after a restart. Each view class below has ONE persistent
+# instance (registered in setup_hook) that serves every message.
+
+rsvp_store = RSVPStore(store.map("rsvp", lazy=True, encode=encode_record))
+# Click bursts → at most one message edit per window per RSVP (coalescer.py)
+rsvp_edits = EditCoalescer(window=float(os.getenv("GAMER_EDIT_WINDOW", "1.0")))
+# Every RSVP change is appended to a JSONL log that also keeps per-user and
+# per-guild attendance counters up to date (rsvplog.py); one log per shard, so
+# tallies stay put when the number of worker processes changes.
+rsvp_log = ShardedRSVPLog(
+    DATA_DIR,
+    shard_ids=shards.shard_ids or [0],
+    shard_count=shards.shard_count if shards.multiprocess else 1,
+    shard_for=shards.shard_for,
+)
+# Every outbound send/edit below goes through one prioritised, per-route
+# rate-limited queue (dispatch.py)
+outbound = Dispatcher(
+    concurrency=int(os.getenv("GAMER_DISPATCH_CONCURRENCY", "8")),
+    rate=float(os.getenv("GAMER_DISPATCH_RATE", "45")),
+)
 
-class TonightRSVPView(View):
-    def __init__(self, author: discord.abc.User):
+class RSVPBaseView(View):
+    def __init__(self):
         super().__init__(timeout=None)
-        self.author  = author
-        self.joining = set()
-        self.cant    = set()
-        self.maybe   = set()
 
-    def make_embed(self) -> discord.Embed:
+    @classmethod
+    def for_message(cls) -> "RSVPBaseView":
+        # Only carries the buttons: a stopped view isn't stored per message by
+        # send(), clicks are routed to the persistent instance by custom_id.
+        view = cls()
+        view.stop()
+        return view
+
+    @classmethod
+    def describe(cls, record: RSVPRecord) -> str:
+        raise NotImplementedError
+
+    @classmethod
+    def make_embed(cls, record: RSVPRecord) -> discord.Embed:
         embed = discord.Embed(
             title="🎮 Gamer-Mimimi",
-            description=f"Mimimimimi!! {self.author.mention} wants to ~~mimi~~ game **tonight!**",
+            description=cls.describe(record),
             color=discord.Color.blurple()
         )
-        embed.add_field(
-            name="🚀 Ready for warp",
-            value=", ".join(u.mention for u in self.joining) or "Nobody",
-            inline=False
+        # Cached, incrementally updated field text; long lists end in "+N more"
+        embed.add_field(name="🚀 Ready for warp", value=record.field_value(JOIN), inline=False)
+        embed.add_field(name="❌ Can’t make it", value=record.field_value(CANT), inline=False)
+        embed.add_field(name="🤡 Maybe, maybe not", value=record.field_value(MAYBE), inline=False)
+        return embed
+
+    async def record_for(self, interaction: discord.Interaction) -> RSVPRecord:
+        msg = interaction.message
+        assert msg is not None
+        record = await rsvp_store.get(msg.id)
+        if record is None:
+            # No stored state (older message): rebuild it from the embed
+            embed = msg.embeds[0] if msg.embeds else None
+            record = rsvp_store.rehydrate(
+                msg.id, interaction.guild_id or 0, interaction.channel_id or 0,
+                (embed.description or "") if embed else "",
+                [f.value or "" for f in embed.fields] if embed else [],
+            )
+        return record
+
+    async def set_status(self, interaction: discord.Interaction, status: int):
+        # Ack first (deferred update), then change state and let the
+        # coalescer push one edit per window with whatever the roster is then.
+        await interaction.response.defer()
+        record = await self.record_for(interaction)
+        previous = record.set_status(interaction.user.id, status)
+        if previous == status:
+            return
+        rsvp_store.save(record)
+        rsvp_log.record(record.guild_id, record.message_id, interaction.user.id, status, previous, record.created_ts)
+        rsvp_edits.request(
+            record.message_id,
+            lambda embed: outbound.submit(
+                ("message", record.message_id), EDIT,
+                lambda: interaction.edit_original_response(embed=embed),
+            ),
+            lambda: self.make_embed(record),
         )
-        embed.add_field(
-            name="❌ Can’t make it",
-            value=", ".join(u.mention for u in self.cant) or "Nobody",
-            inline=False
+
+    async def show_roster(self, interaction: discord.Interaction):
+        record = await self.record_for(interaction)
+        view = RosterPagesView(record)
+        await interaction.response.send_message(embed=view.make_embed(), view=view, ephemeral=True)
+
+# ─── Full roster, paginated (ephemeral) ──────────────────────────────────────
+
+class RosterPagesView(View):
+    PAGE_SIZE = 40
+    LABELS = {JOIN: "🚀", CANT: "❌", MAYBE: "🤡"}
+
+    def __init__(self, record: RSVPRecord):
+        super().__init__(timeout=120)
+        # Snapshot of (status, user ID), grouped by status
+        self.rows = [(st, uid) for st in STATUSES for uid in record.members(st)]
+        self.page = 0
+        self.pages = max(1, -(-len(self.rows) // self.PAGE_SIZE))
+        self.sync_buttons()
+
+    def make_embed(self) -> discord.Embed:
+        chunk = self.rows[self.page * self.PAGE_SIZE:(self.page + 1) * self.PAGE_SIZE]
+        embed = discord.Embed(
+            title="📋 Full roster",
+            description="\n".join(f"{self.LABELS[st]} <@{uid}>" for st, uid in chunk) or "Nobody yet",
+            color=discord.Color.blurple()
         )
-        embed.add_field(
-            name="🤡 Maybe, maybe not",
-            value=", ".join(u.mention for u in self.maybe) or "Nobody",
-            inline=False
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages} · {len(self.rows)} responses")
+        return embed
+
+    def sync_buttons(self):
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.pages - 1
+
+    async def turn(self, interaction: discord.Interaction, delta: int):
+        self.page = min(max(self.page + delta, 0), self.pages - 1)
+        self.sync_buttons()
+        await interaction.response.edit_message(embed=self.make_embed(), view=self)
+
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    @instrumented("ui:roster_prev")
+    async def prev_button(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, -1)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    @instrumented("ui:roster_next")
+    async def next_button(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, 1)
+
+class UpcomingView(View):
+    """Pages through a guild's scheduled sessions; each page is a fresh
+    index query, so sessions that ended meanwhile drop out."""
+
+    PAGE_SIZE = 10
+
+    def __init__(self, guild_id: int):
+        super().__init__(timeout=120)
+        self.guild_id = guild_id
+        self.page = 0
+        self.load()
+
+    def load(self):
+        self.events, self.total = event_index.upcoming(self.guild_id, self.page * self.PAGE_SIZE, self.PAGE_SIZE)
+        self.pages = max(1, -(-self.total // self.PAGE_SIZE))
+        if self.page >= self.pages:
+            self.page = self.pages - 1
+            self.events, self.total = event_index.upcoming(self.guild_id, self.page * self.PAGE_SIZE, self.PAGE_SIZE)
+        self.prev_button.disabled = self.page == 0
+        self.next_button.disabled = self.page >= self.pages - 1
+
+    def make_embed(self) -> discord.Embed:
+        embed = discord.Embed(
+            title="🗓️ Upcoming sessions",
+            description="\n".join(
+                f"<t:{ev.event_ts}:F> (<t:{ev.event_ts}:R>) · [RSVP]({ev.url}) by <@{ev.author_id}>"
+                for ev in self.events
+            ) or "Nothing scheduled – try `/gamer-mimimi specific`.",
+            color=discord.Color.blurple()
         )
+        embed.set_footer(text=f"Page {self.page + 1}/{self.pages} · {self.total} sessions")
         return embed
 
-    async def update_message(self, interaction: discord.Interaction):
+    async def turn(self, interaction: discord.Interaction, delta: int):
+        self.page = max(self.page + delta, 0)
+        self.load()
         await interaction.response.edit_message(embed=self.make_embed(), view=self)
 
+    @discord.ui.button(label="◀", style=discord.ButtonStyle.secondary)
+    @instrumented("ui:upcoming_prev")
+    async def prev_button(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, -1)
+
+    @discord.ui.button(label="▶", style=discord.ButtonStyle.secondary)
+    @instrumented("ui:upcoming_next")
+    async def next_button(self, interaction: discord.Interaction, button: Button):
+        await self.turn(interaction, 1)
+
+# ─── “Tonight” RSVP ──────────────────────────────────────────────────────────
+
+class TonightRSVPView(RSVPBaseView):
+    @classmethod
+    def describe(cls, record: RSVPRecord) -> str:
+        return f"Mimimimimi!! <@{record.author_id}> wants to ~~mimi~~ game **tonight!**"
+
     @discord.ui.button(label="🚀 Ready for warp!", style=discord.ButtonStyle.success, custom_id="tonight_join")
+    @instrumented("ui:tonight_join")
     async def join_button(self, interaction: discord.Interaction, button: Button):
-        self.joining.add(interaction.user)
-        self.cant.discard(interaction.user)
-        self.maybe.discard(interaction.user)
-        await self.update_message(interaction)
+        await self.set_status(interaction, JOIN)
 
     @discord.ui.button(label="❌ Can’t make it", style=discord.ButtonStyle.danger, custom_id="tonight_cant")
+    @instrumented("ui:tonight_cant")
     async def cant_button(self, interaction: discord.Interaction, button: Button):
-        self.cant.add(interaction.user)
-        self.joining.discard(interaction.user)
-        self.maybe.discard(interaction.user)
-        await self.update_message(interaction)
+        await self.set_status(interaction, CANT)
 
     @discord.ui.button(label="🤡 Maybe, maybe not", style=discord.ButtonStyle.secondary, custom_id="tonight_maybe")
+    @instrumented("ui:tonight_maybe")
     async def maybe_button(self, interaction: discord.Interaction, button: Button):
-        self.maybe.add(interaction.user)
-        self.joining.discard(interaction.user)
-        self.cant.discard(interaction.user)
-        await self.update_message(interaction)
+        await self.set_status(interaction, MAYBE)
+
+    @discord.ui.button(label="📋 Full roster", style=discord.ButtonStyle.secondary, custom_id="tonight_roster")
+    @instrumented("ui:tonight_roster")
+    async def roster_button(self, interaction: discord.Interaction, button: Button):
+        await self.show_roster(interaction)
 
 # ─── Date → Hour → Minute Picker ─────────────────────────────────────────────
+# For users who prefer dropdowns over `/gamer-mimimi specific when:`. Options
+# are built once (per local day for the dates) and reused.
+
+@lru_cache(maxsize=8)   # only a couple of local days are "today" at once
+def day_options(today: str) -> tuple:
+    start = datetime.fromisoformat(today).date()
+    return tuple(
+        discord.SelectOption(label=f"{d:%a %b} {d.day}", value=d.isoformat())
+        for d in (start + timedelta(days=i) for i in range(5))
+    )
+
+# instead of range(24), start at 5 PM then wrap
+HOUR_OPTIONS = tuple(
+    discord.SelectOption(label=f"{(h % 12) or 12} {'AM' if h < 12 else 'PM'}", value=f"{h:02d}")
+    for h in [*range(16, 24), *range(0, 16)]
+)
+MINUTE_OPTIONS = (
+    discord.SelectOption(label="00", value="00"),
+    discord.SelectOption(label="30", value="30"),
+)
 
 class DaySelect(Select):
-    def __init__(self):
-        opts = []
-        today = datetime.now(timezone.utc).date()
-        for i in range(5):
-            d = today + timedelta(days=i)
-            label = f"{d:%a %b} {d.day}"
-            opts.append(discord.SelectOption(label=label, value=d.isoformat()))
+    def __init__(self, zone: str):
+        # The user's local today, not UTC's
+        today = datetime.now(ZoneInfo(zone)).date().isoformat()
         super().__init__(
             placeholder="Select a date…",
             min_values=1, max_values=1,
-            options=opts,
+            options=list(day_options(today)),
             custom_id="day_select"
         )
 
+    @instrumented("ui:DaySelect")
     async def callback(self, interaction: discord.Interaction):
         view: PickerView = self.view  # type: ignore
         view.chosen_date = self.values[0]
@@ -164,23 +416,14 @@ class DaySelect(Select):
 
 class HourSelect(Select):
     def __init__(self):
-        options = []
-        # instead of range(24), start at 5 PM then wrap
-        hours = list(range(16, 24)) + list(range(0, 16))
-        for h in hours:
-            hour_12 = (h % 12) or 12
-            suffix  = "AM" if h < 12 else "PM"
-            label   = f"{hour_12} {suffix}"
-            value   = f"{h:02d}"
-            options.append(discord.SelectOption(label=label, value=value))
-
         super().__init__(
             placeholder="Select hour…",
             min_values=1, max_values=1,
-            options=options,
+            options=list(HOUR_OPTIONS),
             custom_id="hour_select"
         )
 
+    @instrumented("ui:HourSelect")
     async def callback(self, interaction: discord.Interaction):
         view: PickerView = self.view  # type: ignore
         view.chosen_hour = self.values[0]
@@ -201,94 +444,242 @@ class MinuteSelect(Select):
         super().__init__(
             placeholder="Select minutes…",
             min_values=1, max_values=1,
-            options=[
-                discord.SelectOption(label="00", value="00"),
-                discord.SelectOption(label="30", value="30")
-            ],
+            options=list(MINUTE_OPTIONS),
             custom_id="minute_select"
         )
 
+    @instrumented("ui:MinuteSelect")
     async def callback(self, interaction: discord.Interaction):
         view: PickerView = self.view  # type: ignore
-        # 1) Build naive datetime
-        dt_str = f"{view.chosen_date} {view.chosen_hour}:{self.values[0]}"
-        naive = datetime.fromisoformat(dt_str)
-        # 2) Lookup user's tz
-        uid = str(interaction.user.id)
-        tz_name = timezone_map.get(uid)
-        if not tz_name:
-            return await interaction.response.send_message(
-                "🚧 Please run `/gamer-mimimi settimezone` first to configure your timezone.",
-                ephemeral=True
-            )
-        user_tz = ZoneInfo(tz_name)
-        # 3) Convert to UTC ts
-        ts = int(naive.replace(tzinfo=user_tz).astimezone(timezone.utc).timestamp())
-        # 4) Ack & remove ephemeral picker
-        await interaction.response.defer(ephemeral=True)
-        await interaction.edit_original_response(content="✅ Suit up! Session is live. 🛰️", view=None)
-        # 5) Send public RSVP
-        gid  = str(interaction.guild_id)
-        ping = f"<@&{ping_role_map[gid]}>"
-        rsvp_view  = RSVPView(interaction.user, ts)
-        rsvp_embed = rsvp_view.make_embed()
-        chan = interaction.channel
-        if isinstance(chan, (discord.TextChannel, discord.Thread, discord.DMChannel)):
-            await chan.send(content=ping, embed=rsvp_embed, view=rsvp_view)
+        # 1) Local date/time in the zone the picker was opened for → UTC ts
+        naive = datetime.fromisoformat(f"{view.chosen_date} {view.chosen_hour}:{self.values[0]}")
+        ts = int(naive.replace(tzinfo=ZoneInfo(view.zone)).timestamp())
+        # 2) Ack by replacing the ephemeral picker (one call), then publish
+        await interaction.response.edit_message(content="✅ Suit up! Session is live. 🛰️", view=None)
+        await post_rsvp(interaction, RSVPView, ts)
 
 class PickerView(View):
-    def __init__(self):
+    def __init__(self, zone: str):
         super().__init__(timeout=60)
+        self.zone              = zone
         self.chosen_date       = ""
         self.chosen_hour       = ""
         self.chosen_hour_label = ""
-        self.add_item(DaySelect())
+        self.add_item(DaySelect(zone))
 
 # ─── RSVP Buttons for timestamped event ───────────────────────────────────────
 
-class RSVPView(View):
-    def __init__(self, author: discord.abc.User, event_ts: int):
-        super().__init__(timeout=None)
-        self.author   = author
-        self.event_ts = event_ts
-        self.joining  = set()
-        self.cant     = set()
-        self.maybe    = set()
-
-    def make_embed(self) -> discord.Embed:
-        embed = discord.Embed(
-            title="🎮 Gamer-Mimimi",
-            description=f"{self.author.mention}'s mimimi-ing nonstop about gaming at <t:{self.event_ts}:F>",
-            color=discord.Color.blurple()
-        )
-        embed.add_field(name="🚀 Ready for warp", value=", ".join(u.mention for u in self.joining) or "Nobody", inline=False)
-        embed.add_field(name="❌ Can’t make it", value=", ".join(u.mention for u in self.cant) or "Nobody", inline=False)
-        embed.add_field(name="🤡 Maybe, maybe not", value=", ".join(u.mention for u in self.maybe) or "Nobody", inline=False)
-        return embed
-
-    async def update_message(self, interaction: discord.Interaction):
-        await interaction.response.edit_message(embed=self.make_embed(), view=self)
+class RSVPView(RSVPBaseView):
+    @classmethod
+    def describe(cls, record: RSVPRecord) -> str:
+        return f"<@{record.author_id}>'s mimimi-ing nonstop about gaming at <t:{record.event_ts}:F>"
 
     @discord.ui.button(label="🚀 Ready for warp!", style=discord.ButtonStyle.success, custom_id="rsvp_join")
+    @instrumented("ui:rsvp_join")
     async def join_button(self, interaction: discord.Interaction, button: Button):
-        self.joining.add(interaction.user)
-        self.cant.discard(interaction.user)
-        self.maybe.discard(interaction.user)
-        await self.update_message(interaction)
+        await self.set_status(interaction, JOIN)
 
     @discord.ui.button(label="❌ Can’t make it", style=discord.ButtonStyle.danger, custom_id="rsvp_cant")
+    @instrumented("ui:rsvp_cant")
     async def cant_button(self, interaction: discord.Interaction, button: Button):
-        self.cant.add(interaction.user)
-        self.joining.discard(interaction.user)
-        self.maybe.discard(interaction.user)
-        await self.update_message(interaction)
+        await self.set_status(interaction, CANT)
 
     @discord.ui.button(label="🤡 Maybe, maybe not", style=discord.ButtonStyle.secondary, custom_id="rsvp_maybe")
+    @instrumented("ui:rsvp_maybe")
     async def maybe_button(self, interaction: discord.Interaction, button: Button):
-        self.maybe.add(interaction.user)
-        self.joining.discard(interaction.user)
-        self.cant.discard(interaction.user)
-        await self.update_message(interaction)
+        await self.set_status(interaction, MAYBE)
+
+    @discord.ui.button(label="📋 Full roster", style=discord.ButtonStyle.secondary, custom_id="rsvp_roster")
+    @instrumented("ui:rsvp_roster")
+    async def roster_button(self, interaction: discord.Interaction, button: Button):
+        await self.show_roster(interaction)
+
+# ─── Reminders for scheduled sessions ────────────────────────────────────────
+# One ReminderScheduler (scheduler.py) for all events: a persisted min-heap and
+# a single sleeping task. Offsets are minutes before start, e.g. "30,0".
+
+REMINDER_OFFSETS = [int(m) for m in os.getenv("GAMER_REMINDERS", "30,0").split(",") if m.strip()]
+
+async def send_reminder(key: str, entry: dict):
+    record = await rsvp_store.get(entry["m"])
+    if record is None:
+        return
+    people = [*record.members(JOIN), *record.members(MAYBE)]
+    if not people:
+        return
+    if entry["before"]:
+        lead = f"⏰ Gaming starts <t:{record.event_ts}:R>! Warm up those thumbs:"
+    else:
+        lead = "🚀 It’s go time! Warp in:"
+    chan = bot.get_partial_messageable(record.channel_id)
+    # fail_if_not_exists: without message intents (lean profile) we never see
+    # the RSVP being deleted, so a failed reply is how we find out.
+    ref  = discord.MessageReference(message_id=record.message_id, channel_id=record.channel_id)
+    for i, chunk in enumerate(mention_chunks(people)):
+        try:
+            await outbound.send(chan, REMINDER, content=f"{lead} {chunk}" if i == 0 else chunk, reference=ref)
+        except discord.HTTPException as e:
+            if i == 0 and e.status == 400:
+                drop_rsvp(record.message_id)
+                return
+            raise
+
+reminders = ReminderScheduler(
+    store.map("reminders"), send_reminder,
+    owns=lambda entry: shards.owns_guild(entry.get("g", 0)),
+)
+
+def schedule_reminders(record: RSVPRecord):
+    now = time.time()
+    for minutes in REMINDER_OFFSETS:
+        at = record.event_ts - minutes * 60
+        if at > now:
+            reminders.add(
+                f"{record.message_id}:{minutes}", at,
+                m=record.message_id, g=record.guild_id, before=minutes,
+            )
+
+def cancel_reminders(message_id: int):
+    reminders.cancel(f"{message_id}:{minutes}" for minutes in REMINDER_OFFSETS)
+
+# ─── Upcoming sessions ───────────────────────────────────────────────────────
+# Scheduled (timestamped) RSVPs per guild, sorted by start (events.py).
+# Sessions drop out 3 h after they started.
+
+event_index = EventIndex(store.map("events"), owns=shards.owns_guild)
+if not event_index.backing:
+    # Nothing indexed: first start with the index, or simply no session
+    # pending. Seed from stored RSVPs that haven't ended yet; the scan reads
+    # only their start, so just those few records are decoded.
+    cutoff   = time.time() - event_index.grace
+    upcoming = store.backend.select("rsvp", ("t",), lambda t: bool(t) and t > cutoff)
+    event_index.seed(
+        Event(int(mid), d["g"], d["c"], d["t"], d["a"])
+        for mid, d in ((mid, store.backend.load_one("rsvp", mid)) for mid in upcoming) if d
+    )
+
+# ─── Publishing an RSVP ──────────────────────────────────────────────────────
+
+async def post_rsvp(interaction: discord.Interaction, view_cls, event_ts: int = 0) -> RSVPRecord:
+    """Post the public RSVP for an already-acked interaction (event_ts 0 = tonight)."""
+    ping   = f"<@&{ping_role_map[str(interaction.guild_id)]}>"
+    record = RSVPRecord(0, interaction.guild_id or 0, interaction.channel_id or 0, interaction.user.id, event_ts)
+    # Partial channel: works without a channel cache (lean profile)
+    chan   = bot.get_partial_messageable(record.channel_id)
+    msg    = await outbound.send(chan, ANNOUNCE, content=ping, embed=view_cls.make_embed(record), view=view_cls.for_message())
+    rsvp_store.put(msg.id, record)
+    if event_ts:
+        schedule_reminders(record)
+        event_index.add(Event(msg.id, record.guild_id, record.channel_id, event_ts, record.author_id))
+    return record
+
+def drop_rsvp(message_id: int):
+    """The RSVP message is gone: forget its state, reminders and index entry."""
+    event_index.remove(message_id)
+    if rsvp_store.delete(message_id):
+        cancel_reminders(message_id)
+
+# ─── Garbage collection ──────────────────────────────────────────────────────
+# Nothing else ever deletes state, so every GAMER_GC_INTERVAL hours (and a
+# minute after leaving a guild) this drops config, RSVPs, reminders, events
+# and tallies of guilds we're no longer in, and RSVPs past their grace
+# period. Then it compacts the store and hands freed memory back to the OS
+# (compaction.py). Only guilds this process owns are considered, and only
+# once every shard is ready, so `bot.guilds` is complete.
+RSVP_GRACE = float(os.getenv("GAMER_RSVP_GRACE_DAYS", "7")) * 86400
+# Also drop zones of users seen only in guilds we left (opt-in; needs one
+# process to see every guild)
+GC_ORPHAN_ZONES = os.getenv("GAMER_GC_ORPHAN_ZONES") == "1" and not shards.multiprocess
+
+def _disk_bytes() -> int:
+    return store.backend.disk_bytes(store.maps) + rsvp_log.disk_bytes()
+
+async def compact_state() -> CompactionReport:
+    report = CompactionReport(rss_bytes(), _disk_bytes())
+    current = {g.id for g in bot.guilds}
+
+    def gone(guild_id: int) -> bool:
+        return guild_id not in current and shards.owns_guild(guild_id)
+
+    for key in [k for k in ping_role_map if gone(int(k))]:
+        del ping_role_map[key]
+        report.count("ping roles", 1)
+    for key in [k for k in syncer.state if k.isdigit() and gone(int(k))]:
+        syncer.forget(int(key))
+        report.count("command syncs", 1)
+    for guild_id in [g for g in event_index.guilds() if gone(g)]:
+        report.count("events", event_index.drop_guild(guild_id))
+    report.count("events", event_index.expire())
+
+    # RSVPs live in a lazy map: pick the dead ones by guild and timestamps in
+    # one scan off the loop, without decoding any record, then delete blind
+    now = time.time()
+
+    def dead_rsvp(guild_id: int, event_ts: Optional[int], created_ts: Optional[int]) -> bool:
+        return shards.owns_guild(guild_id) and (
+            gone(guild_id) or rsvp_expired(event_ts, created_ts, now, RSVP_GRACE)
+        )
+
+    dead = await store.select("rsvp", ("g", "t", "ct"), dead_rsvp)
+    for i, message_id in enumerate(dead, 1):
+        drop_rsvp(int(message_id))
+        if i % 1000 == 0:
+            await asyncio.sleep(0)
+    report.count("RSVPs", len(dead))
+    report.count("reminders", reminders.cancel(
+        [k for k, entry in reminders.backing.items() if gone(entry.get("g", 0))]
+    ))
+
+    left = {g for g in rsvp_log.guilds if gone(g)}
+    imports_left = [k for k in zone_imports if gone(int(k))]
+    if GC_ORPHAN_ZONES and (left or imports_left):
+        seen_in: dict = {}
+        for g, u in rsvp_log.users:
+            seen_in.setdefault(u, set()).add(g)
+        for key, packed in zone_imports.items():
+            for u in imported_users(packed):
+                seen_in.setdefault(u, set()).add(int(key))
+        left_all = left | {int(k) for k in imports_left}
+        for user_id, guilds in seen_in.items():
+            if guilds <= left_all and timezone_map.pop(str(user_id), None) is not None:
+                report.count("orphaned zones", 1)
+    report.count("RSVP tallies", rsvp_log.forget_guilds(left))
+    for key in imports_left:
+        del zone_imports[key]
+        report.count("zone imports", 1)
+
+    await store.compact()
+    release_memory()
+    return report.finish(rss_bytes(), _disk_bytes())
+
+compactor = Compactor(
+    compact_state,
+    interval=float(os.getenv("GAMER_GC_INTERVAL", "6")) * 3600,
+    ready=lambda: bot.wait_until_ready(),
+)
+
+# ─── Metrics ──────────────────────────────────────────────────────────────────
+# Handlers are wrapped with @instrumented; these gauges are read on scrape.
+# GAMER_METRICS_PORT=9108 serves them at http://127.0.0.1:9108/metrics
+# (9109, 9110, … for the further workers of launcher.py).
+
+metrics.registry.gauge("rsvp_records_live", "RSVP records held in memory", lambda: len(rsvp_store))
+metrics.registry.gauge("reminders_pending", "Scheduled reminders", lambda: len(reminders))
+metrics.registry.gauge("events_indexed", "Upcoming sessions in the index", lambda: len(event_index))
+metrics.registry.gauge("persistent_views", "Registered persistent views", lambda: len(bot.persistent_views))
+metrics.registry.gauge("guilds", "Guilds this process serves", lambda: len(bot.guilds))
+metrics.registry.gauge("rss_bytes", "Resident set size", rss_bytes)
+metrics.registry.gauge("rsvp_edits", "RSVP message edits sent", lambda: rsvp_edits.edits)
+metrics.registry.gauge("rsvp_edits_saved", "RSVP edits coalesced away", lambda: rsvp_edits.edits_saved)
+metrics.registry.gauge("store_flushes", "Write-behind flushes", lambda: store.flushes)
+metrics.registry.gauge("outbound_queued", "Outbound calls waiting in the dispatcher", outbound.depth)
+metrics.registry.gauge("outbound_retried", "Outbound calls retried after 429/5xx", lambda: outbound.retried)
+metrics.registry.gauge("store_last_flush_ms", "Duration of the last flush", lambda: store.last_flush_ms)
+metrics.registry.gauge("gc_runs", "State compaction runs", lambda: compactor.runs)
+metrics.registry.gauge("gc_last_rss_freed_bytes", "RSS given back by the last compaction",
+                       lambda: compactor.last.rss_freed if compactor.last else 0)
+metrics.registry.gauge("gc_last_disk_freed_bytes", "Disk space given back by the last compaction",
+                       lambda: compactor.last.disk_freed if compactor.last else 0)
 
 # ─── The `/gamer-mimimi` command group ─────────────────────────────────────────
 
@@ -303,28 +694,40 @@ gamer_group = app_commands.Group(
 # 1) `/gamer-mimimi tonight`
 @gamer_group.command(name="tonight", description="Announce a session happening tonight")
 @ping_role_required()
+@instrumented("cmd:tonight")
 async def gamer_tonight(interaction: discord.Interaction):
     # ephemeral acknowledgement
     await interaction.response.send_message("✅ Mimimi sent for **tonight!**", ephemeral=True)
     # now publish the real RSVP
-    gid  = str(interaction.guild_id)
-    ping = f"<@&{ping_role_map[gid]}>"
-    view  = TonightRSVPView(interaction.user)
-    embed = view.make_embed()
-    chan  = interaction.channel
-    if isinstance(chan, (discord.TextChannel, discord.Thread, discord.DMChannel)):
-        await chan.send(content=ping, embed=embed, view=view)
+    await post_rsvp(interaction, TonightRSVPView)
 
 # 2) `/gamer-mimimi specific`
-@gamer_group.command(name="specific", description="Pick a specific date/time")
+@gamer_group.command(name="specific", description="Schedule a session at a specific date/time")
 @ping_role_required()
-async def gamer_specific(interaction: discord.Interaction):
-    view = PickerView()
-    await interaction.response.send_message("📅 **First pick a date:**", view=view, ephemeral=True)
+@app_commands.describe(when="In your timezone, e.g. “fri 21:30”, “tomorrow 8pm”, “in 2h”. Leave empty for dropdowns.")
+@instrumented("cmd:specific")
+async def gamer_specific(interaction: discord.Interaction, when: Optional[str] = None):
+    tz_name = timezone_map.get(str(interaction.user.id))
+    if not tz_name:
+        return await interaction.response.send_message(
+            "🚧 Please run `/gamer-mimimi settimezone` first to configure your timezone.",
+            ephemeral=True
+        )
+    if when is None:
+        view = PickerView(tz_name)
+        return await interaction.response.send_message("📅 **First pick a date:**", view=view, ephemeral=True)
+    # One shot: parse, ack, publish
+    try:
+        ts = int(parse_when(when, ZoneInfo(tz_name)).timestamp())
+    except ValueError as e:
+        return await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+    await interaction.response.send_message(f"✅ Suit up! Session on <t:{ts}:F> is live. 🛰️", ephemeral=True)
+    await post_rsvp(interaction, RSVPView, ts)
 
 # 3) `/gamer-mimimi mytimezone`
 @gamer_group.command(name="mytimezone", description="Show your currently-saved IANA timezone")
 @ping_role_required()
+@instrumented("cmd:mytimezone")
 async def gamer_showtimezone(interaction: discord.Interaction):
     uid = str(interaction.user.id)
     cur = timezone_map.get(uid)
@@ -342,24 +745,23 @@ async def gamer_showtimezone(interaction: discord.Interaction):
 @ping_role_required()
 @app_commands.describe(tz="Your IANA timezone (autocomplete)")
 @app_commands.autocomplete(tz=tz_autocomplete)
+@instrumented("cmd:settimezone")
 async def gamer_settimezone(interaction: discord.Interaction, tz: str):
-    if tz not in available_timezones():
+    tz = tz_catalog.resolve(tz) or tz
+    if tz not in tz_catalog:
         return await interaction.response.send_message("❌ Invalid timezone.", ephemeral=True)
     uid = str(interaction.user.id)
     timezone_map[uid] = tz
-    with open(TZ_FILE, "w") as f:
-        json.dump(timezone_map, f)
     await interaction.response.send_message(f"✅ Timezone set to **{tz}**.", ephemeral=True)
 
 # 5) `/gamer-mimimi cleartimezone`
 @gamer_group.command(name="cleartimezone", description="Delete your saved IANA timezone")
 @ping_role_required()
+@instrumented("cmd:cleartimezone")
 async def gamer_cleartimezone(interaction: discord.Interaction):
     uid = str(interaction.user.id)
     if uid in timezone_map:
         del timezone_map[uid]
-        with open(TZ_FILE, "w") as f:
-            json.dump(timezone_map, f)
         await interaction.response.send_message("🗑️ Timezone cleared.", ephemeral=True)
     else:
         await interaction.response.send_message("ℹ️ You had no timezone set.", ephemeral=True)
@@ -371,10 +773,10 @@ async def gamer_cleartimezone(interaction: discord.Interaction):
 )
 @app_commands.describe(role="Role to ping")
 @commands.has_guild_permissions(manage_guild=True)
+@instrumented("cmd:setpingrole")
 async def gamer_setpingrole(interaction: discord.Interaction, role: discord.Role):
     gid = str(interaction.guild_id)
     ping_role_map[gid] = role.id
-    save_ping_roles()
     await interaction.response.send_message(f"✅ I will now ping {role.mention}.", ephemeral=True)
 
 # 7) `/gamer-mimimi clearpingrole` (admin only)
@@ -383,19 +785,303 @@ async def gamer_setpingrole(interaction: discord.Interaction, role: discord.Role
     description="(Admin) Remove the ping-role"
 )
 @commands.has_guild_permissions(manage_guild=True)
+@instrumented("cmd:clearpingrole")
 async def gamer_clearpingrole(interaction: discord.Interaction):
     gid = str(interaction.guild_id)
     if ping_role_map.pop(gid, None) is not None:
-        save_ping_roles()
         await interaction.response.send_message("✅ Ping-role cleared.", ephemeral=True)
     else:
         await interaction.response.send_message("ℹ️ No ping-role was set.", ephemeral=True)
 
+# 8) `/gamer-mimimi stats [@user]` (bot stats: admin only)
+def _ms(seconds: Optional[float]) -> str:
+    return "n/a" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+def _pct(rate: Optional[float]) -> str:
+    return "n/a" if rate is None else f"{rate:.0%}"
+
+def _duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "n/a"
+    if seconds == float("inf"):
+        return "over a day"
+    for unit, size in (("d", 86400), ("h", 3600), ("min", 60)):
+        if seconds >= size:
+            return f"≤ {seconds / size:g} {unit}"
+    return f"≤ {seconds:g} s"
+
+def _tally_text(tally: Optional[Tally]) -> str:
+    if tally is None or not tally.responses:
+        return "No RSVPs yet."
+    return (
+        f"Answered **{tally.responses}** sessions, Ready for **{tally.ready}** "
+        f"(attendance {_pct(tally.attendance_rate)})\n"
+        f"Backed out of {tally.flakes} of {tally.commits} Readys (flake rate {_pct(tally.flake_rate)})\n"
+        f"Typical response time {_duration(tally.typical_response())}"
+    )
+
+@gamer_group.command(name="stats", description="RSVP stats for a member, or (admin) the bot’s own stats")
+@app_commands.describe(user="Whose attendance to show; leave empty for bot stats (admin only)")
+@instrumented("cmd:stats")
+async def gamer_stats(interaction: discord.Interaction, user: Optional[discord.User] = None):
+    if user is not None:
+        # Straight from the pre-aggregated counters in rsvp_log
+        gid = interaction.guild_id or 0
+        embed = discord.Embed(title=f"📈 RSVP stats for {user.display_name}", color=discord.Color.blurple())
+        embed.add_field(name="In this server", value=_tally_text(rsvp_log.user(gid, user.id)), inline=False)
+        embed.add_field(name="Server average", value=_tally_text(rsvp_log.guild(gid)), inline=False)
+        return await interaction.response.send_message(embed=embed, ephemeral=True)
+    if not interaction.permissions.manage_guild:
+        raise app_commands.MissingPermissions(["manage_guild"])
+    embed = discord.Embed(title="📊 Gamer-Mimimi stats", color=discord.Color.blurple())
+    # Busiest handlers first; every handler's series exists from import, so
+    # skip the ones never called, and stop before the field overflows
+    calls = sorted(
+        ((int(s[-1]), dict(key)["handler"]) for key, s in metrics.handler_seconds.series.items() if s[-1]),
+        reverse=True,
+    )
+    rows, size = [], 0
+    for count, handler in calls:
+        row = (
+            f"`{handler}` ×{count}: "
+            f"ack p50 {_ms(metrics.ack_seconds.quantile(0.5, handler=handler))} / "
+            f"p99 {_ms(metrics.ack_seconds.quantile(0.99, handler=handler))}, "
+            f"total p99 {_ms(metrics.handler_seconds.quantile(0.99, handler=handler))}"
+        )
+        size += len(row) + 1   # + the newline joining it
+        if size - 1 > FIELD_LIMIT:
+            break
+        rows.append(row)
+    embed.add_field(name="Handlers", value="\n".join(rows) or "No interactions yet.", inline=False)
+    embed.add_field(
+        name="Discord HTTP",
+        value=(
+            f"{int(metrics.http_requests.total())} requests, "
+            f"{int(metrics.ratelimit_hits.total())} × 429 "
+            f"(p99 wait {_ms(metrics.ratelimit_wait.quantile(0.99))})\n"
+            f"Outbound queue {outbound.depth()}, {outbound.retried} retried, {outbound.failed} failed"
+        ),
+        inline=False,
+    )
+    embed.add_field(
+        name="Runtime",
+        value=(
+            f"Loop lag p99 {_ms(metrics.loop_lag.quantile(0.99))} · "
+            f"{rss_per_guild(len(bot.guilds))}\n"
+            f"{len(rsvp_store)} RSVPs in memory · {len(reminders)} reminders · "
+            f"{rsvp_edits.edits} edits ({rsvp_edits.edits_saved} coalesced) · "
+            f"{rsvp_log.appended} RSVP changes logged\n"
+            f"Last GC: {compactor.last.summary() if compactor.last else 'not run yet'}"
+        ),
+        inline=False,
+    )
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+# 9) `/gamer-mimimi profile` (admin only)
+@gamer_group.command(name="profile", description="(Admin) Toggle the sampling profiler / tracemalloc")
+@app_commands.describe(action="start, stop or report", kind="sampling (CPU) or tracemalloc (allocations)")
+@app_commands.checks.has_permissions(manage_guild=True)
+@instrumented("cmd:profile")
+async def gamer_profile(
+    interaction: discord.Interaction,
+    action: Literal["start", "stop", "report"],
+    kind: Literal["sampling", "tracemalloc"] = "sampling",
+):
+    prof = metrics.profiler
+    if action == "start":
+        prof.start_sampling() if kind == "sampling" else prof.start_tracing()
+        return await interaction.response.send_message(f"🔬 {kind} started.", ephemeral=True)
+    if kind == "sampling":
+        top = [f"{n:>5} {where}" for where, n in prof.top_samples(15)]
+    else:
+        top = [f"{format_bytes(size):>10} {where}" for where, size in prof.top_allocations(15)]
+    if action == "stop":
+        prof.stop_sampling() if kind == "sampling" else prof.stop_tracing()
+    body = "\n".join(top) or "(no data – start it first)"
+    await interaction.response.send_message(f"🔬 **{kind}** ({action})\n```\n{body[:1900]}\n```", ephemeral=True)
+
+# 10) `/gamer-mimimi besttime`
+MESSAGE_ID = re.compile(r"(\d{15,21})\s*$")
+
+@gamer_group.command(name="besttime", description="Find session times that suit everyone's timezone")
+@ping_role_required()
+@app_commands.describe(
+    days="How many days ahead to look",
+    rsvp="Link or ID of an RSVP message in this server: use its Ready/Maybe list",
+)
+@instrumented("cmd:besttime")
+async def gamer_besttime(
+    interaction: discord.Interaction,
+    days: app_commands.Range[int, 1, 14] = 3,
+    rsvp: Optional[str] = None,
+):
+    if rsvp:
+        match  = MESSAGE_ID.search(rsvp)
+        record = await rsvp_store.get(int(match.group(1))) if match else None
+        if record is None or record.guild_id != interaction.guild_id:
+            return await interaction.response.send_message("❌ I don’t know that RSVP message.", ephemeral=True)
+        people = [*record.members(JOIN), *record.members(MAYBE)]
+        source = "this RSVP’s Ready/Maybe list"
+    elif bot.intents.members:
+        guild = interaction.guild
+        role  = guild.get_role(ping_role_map[str(interaction.guild_id)]) if guild else None
+        people = [m.id for m in role.members] if role else []
+        source = role.mention if role else "the ping-role"
+    else:
+        # Without the privileged members intent a role's member list only
+        # holds whoever happened to be cached: use everyone who has answered
+        # an RSVP here instead.
+        people = sorted(rsvp_log.guild_users(interaction.guild_id or 0))
+        source = "people who answered RSVPs here"
+    if not people:
+        return await interaction.response.send_message(
+            f"🤷 Nobody to schedule for in {source}. Pass an RSVP message instead.",
+            ephemeral=True,
+        )
+    zones = [z for z in (timezone_map.get(str(uid)) for uid in people) if z in tz_catalog]
+    slots = best_times.best(zones, days=days)
+    if not slots:
+        return await interaction.response.send_message(
+            f"🚨 None of the {len(people)} people in {source} has set a timezone yet.", ephemeral=True
+        )
+    embed = discord.Embed(
+        title=f"🕹️ Best times in the next {days} day{'s' if days > 1 else ''}",
+        description="\n".join(
+            f"**{i}.** <t:{s.ts}:F> (<t:{s.ts}:R>) – good for {s.free}/{len(zones)}"
+            for i, s in enumerate(slots, 1)
+        ),
+        color=discord.Color.blurple(),
+    )
+    embed.set_footer(text=f"{len(zones)} of {len(people)} people have a saved timezone")
+    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+# 11) `/gamer-mimimi upcoming`
+@gamer_group.command(name="upcoming", description="List the scheduled sessions in this server")
+@ping_role_required()
+@instrumented("cmd:upcoming")
+async def gamer_upcoming(interaction: discord.Interaction):
+    view = UpcomingView(interaction.guild_id or 0)
+    if view.pages == 1:
+        return await interaction.response.send_message(embed=view.make_embed(), ephemeral=True)
+    await interaction.response.send_message(embed=view.make_embed(), view=view, ephemeral=True)
+
+# 12) `/gamer-mimimi importzones` / `exportzones` (admin only)
+# Bulk migration of user → zone (tzbulk.py). The upload is streamed and
+# validated row by row, narrowed to this server's members, then merged into
+# timezone_map in one go, so the store writes it as a single transaction. Exports cover members seen in this
+# server and are written to a temp file rather than built in memory.
+IMPORT_MAX_BYTES = int(os.getenv("GAMER_IMPORT_MAX_BYTES", str(25 * 1024 * 1024)))
+
+async def _members_of(guild: discord.Guild, users: Iterable[str]) -> Set[str]:
+    """Which of `users` are members of `guild`: the member cache first, then
+    gateway member lookups by ID (100 a request; no privileged intent needed)."""
+    members, unknown = set(), []
+    for user in users:
+        if guild.get_member(int(user)) is not None:
+            members.add(user)
+        else:
+            unknown.append(int(user))
+    for i in range(0, len(unknown), 100):
+        found = await guild.query_members(user_ids=unknown[i:i + 100], limit=100, cache=False)
+        members.update(str(m.id) for m in found)
+    return members
+
+def _known_users(guild: Optional[discord.Guild], guild_id: int) -> Set[str]:
+    """Users seen in this server: RSVP history, imported zones and any cached members."""
+    users = {str(u) for u in rsvp_log.guild_users(guild_id)}
+    users.update(map(str, imported_users(zone_imports.get(str(guild_id)))))
+    if guild is not None:
+        users.update(str(m.id) for m in guild.members if not m.bot)
+    return users
+
+@gamer_group.command(name="importzones", description="(Admin) Set many members’ timezones from a CSV/JSONL file")
+@app_commands.describe(
+    file="CSV with user_id,timezone columns, or JSONL lines like {\"user_id\": …, \"timezone\": …}",
+    overwrite="Also replace zones this server imported before",
+    dry_run="Only validate and report, change nothing",
+)
+@app_commands.checks.has_permissions(manage_guild=True)
+@instrumented("cmd:importzones")
+async def gamer_importzones(
+    interaction: discord.Interaction,
+    file: discord.Attachment,
+    overwrite: bool = False,
+    dry_run: bool = False,
+):
+    guild = interaction.guild
+    if guild is None:
+        return await interaction.response.send_message("❌ Imports only work in a server.", ephemeral=True)
+    if file.size > IMPORT_MAX_BYTES:
+        return await interaction.response.send_message(
+            f"❌ That file is {format_bytes(file.size)}; the limit is {format_bytes(IMPORT_MAX_BYTES)}.", ephemeral=True
+        )
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    report = ImportReport(file.size)
+
+    async def progress(report: ImportReport):
+        await outbound.submit(
+            ("interaction", interaction.id), EDIT,
+            lambda: interaction.edit_original_response(content=report.progress()),
+        )
+
+    try:
+        updates = await read_zones(stream_url(file.url), tz_catalog, report, file.filename, progress)
+    except aiohttp.ClientError as e:
+        return await interaction.edit_original_response(content=f"❌ Couldn’t download the file: {e}")
+    # Zones are global: a server may only set its own members' zones, and
+    # only replace the ones it imported itself
+    try:
+        members = await _members_of(guild, updates)
+    except asyncio.TimeoutError:
+        return await interaction.edit_original_response(content="❌ Discord didn’t answer a member lookup; try again.")
+    report.outsiders = len(updates) - len(members)
+    updates = {user: zone for user, zone in updates.items() if user in members}
+    key = str(guild.id)
+    replaceable = {str(u) for u in imported_users(zone_imports.get(key))} if overwrite else ()
+    applied = apply_zones(timezone_map, updates, report, overwrite=overwrite, dry_run=dry_run, replaceable=replaceable)
+    if applied and not dry_run:
+        zone_imports[key] = add_imported(zone_imports.get(key), applied)
+        await store.flush()   # on disk before we say so
+    errors = report.write_errors()
+    try:
+        # Not through `outbound`: a retried upload would re-send an already-read file
+        await interaction.edit_original_response(
+            content=report.summary(dry_run),
+            attachments=[discord.File(errors, filename="import-errors.csv")] if errors else [],
+        )
+    finally:
+        if errors:
+            os.unlink(errors)
+
+@gamer_group.command(name="exportzones", description="(Admin) Download the timezones of members seen in this server")
+@app_commands.rename(fmt="format")
+@app_commands.describe(fmt="File format")
+@app_commands.checks.has_permissions(manage_guild=True)
+@instrumented("cmd:exportzones")
+async def gamer_exportzones(interaction: discord.Interaction, fmt: Literal["csv", "jsonl"] = "csv"):
+    await interaction.response.defer(ephemeral=True, thinking=True)
+    gid = interaction.guild_id or 0
+    path, rows = await export_zones(_known_users(interaction.guild, gid), timezone_map, fmt)
+    try:
+        size  = os.path.getsize(path)
+        limit = interaction.guild.filesize_limit if interaction.guild else discord.utils.DEFAULT_FILE_SIZE_LIMIT_BYTES
+        if size > limit:
+            return await interaction.edit_original_response(
+                content=f"❌ {rows:,} zones make a {format_bytes(size)} file, over this server’s {format_bytes(limit)} upload limit."
+            )
+        await interaction.edit_original_response(
+            content=f"📤 {rows:,} timezones ({format_bytes(size)}).",
+            attachments=[discord.File(path, filename=f"timezones-{gid}.{fmt}")],
+        )
+    finally:
+        os.unlink(path)
+
 # ─── 6) HELP ───────────────────────────────────────────────────────────────────
 @gamer_group.command(
     name="help",
     description="Show a quick overview of all gamer-mimimi commands 📝"
 )
+@instrumented("cmd:help")
 async def gamer_help(interaction: discord.Interaction):
     embed = discord.Embed(
         title="🎮 Gamer-Mimimi Help",
@@ -419,7 +1105,12 @@ async def gamer_help(interaction: discord.Interaction):
     )
     embed.add_field(
         name="⏱️ /gamer-mimimi specific",
-        value="Pick a specific date & time via dropdowns.",
+        value="Schedule a session: type a time (`when: fri 21:30`) or pick one via dropdowns.",
+        inline=False
+    )
+    embed.add_field(
+        name="🗓️ /gamer-mimimi upcoming",
+        value="List this server’s scheduled sessions.",
         inline=False
     )
     embed.add_field(
@@ -437,36 +1128,83 @@ async def gamer_help(interaction: discord.Interaction):
         value="Delete your saved timezone.",
         inline=False
     )
+    embed.add_field(
+        name="🕹️ /gamer-mimimi besttime",
+        value="Suggest times that suit everyone’s timezone (ping-role or an RSVP’s Ready/Maybe).",
+        inline=False
+    )
+    embed.add_field(
+        name="📈 /gamer-mimimi stats @user",
+        value="Someone’s attendance, flake rate and response time in this server.",
+        inline=False
+    )
+    embed.add_field(
+        name="📥 /gamer-mimimi importzones · exportzones",
+        value="*(Admin only)* Bulk-set members’ timezones from a CSV/JSONL file, or download them.",
+        inline=False
+    )
+    embed.add_field(
+        name="📊 /gamer-mimimi stats · profile",
+        value="*(Admin only)* Latency/HTTP/memory stats; toggle the profiler.",
+        inline=False
+    )
     embed.set_footer(text="May your games be lag-free! 🕹️")
 
     await interaction.response.send_message(embed=embed, ephemeral=True)
 # ─── Register & Sync ───────────────────────────────────────────────────────────
 
 
+# Last-synced payload hash per guild, so reconnects/restarts skip unchanged guilds
+syncer = CommandSyncer(
+    bot.tree, gamer_group, store.map("command_sync"),
+    concurrency=int(os.getenv("GAMER_SYNC_CONCURRENCY", "4")),
+)
+_first_ready = True
+
 @bot.event
 async def on_ready():
+    global _first_ready
     user = bot.user
     if user is None:
         print("Logged in, but bot.user is None")
         return
     assert isinstance(user, (discord.User, discord.ClientUser))
     print(f"Logged in as {user} (ID: {user.id})")
-    # ── WIPE OUT ANY LEFTOVER GLOBAL COMMANDS ─────────────────────────
-    bot.tree.clear_commands(guild=None)   # clear the global list
-    await bot.tree.sync()                 # push “empty” list to Discord
-    # Instant‐inject into every existing guild on startup
-    for g in bot.guilds:
-        bot.tree.add_command(gamer_group, guild=discord.Object(id=g.id))
-        synced = await bot.tree.sync(guild=g)
-        print(f"[startup] Synced {len(synced)} commands in {g.name} ({g.id})")
+    # ── WIPE OUT ANY LEFTOVER GLOBAL COMMANDS (once, remembered) ──────
+    await syncer.clear_global()
+    # Re-sync only guilds whose command payload changed since last time
+    stats = await syncer.sync_all(g.id for g in bot.guilds)
+    print(
+        f"[startup] {stats['guilds']} guilds: {stats['synced']} synced, "
+        f"{stats['skipped']} unchanged, {stats['failed']} failed in {stats['seconds']:.2f}s"
+    )
+    if _first_ready:
+        _first_ready = False
+        print(f"[startup] Time to ready: {time.perf_counter() - PROCESS_START:.2f}s")
+    print(f"[startup] Profile {PROFILE}: {rss_per_guild(len(bot.guilds))}")
 
 @bot.event
 async def on_guild_join(guild: discord.Guild):
-    # 1) Add our /gamer-mimimi group into the tree for this new guild…
-    bot.tree.add_command(gamer_group, guild=discord.Object(id=guild.id))
-    # 2) …then sync so it shows up instantly (no 1 h wait)
-    synced = await bot.tree.sync(guild=guild)
-    print(f"✅ Registered {len(synced)} slash-commands in guild {guild.name} ({guild.id})")
+    # New guild: register + sync so the commands show up instantly (no 1 h wait)
+    await syncer.sync_guild(guild.id, force=True)
+    print(f"✅ Registered slash-commands in guild {guild.name} ({guild.id})")
+
+
+@bot.event
+async def on_guild_remove(guild: discord.Guild):
+    # Kicked or guild deleted: its config and RSVPs go with the next compaction
+    compactor.request()
+    print(f"👋 Removed from guild {guild.name} ({guild.id})")
+
+@bot.event
+async def on_raw_message_delete(payload: discord.RawMessageDeleteEvent):
+    # An RSVP message was deleted → the event is off
+    drop_rsvp(payload.message_id)
+
+@bot.event
+async def on_raw_bulk_message_delete(payload: discord.RawBulkMessageDeleteEvent):
+    for message_id in payload.message_ids:
+        drop_rsvp(message_id)
 
 
 # ─── Global error handler for app_commands ───────────────────────────────────
@@ -478,7 +1216,14 @@ async def on_app_command_error(interaction: discord.Interaction, error: app_comm
     if interaction.response.is_done():
         return
     # Send the error message back to the user, ephemerally
-    await interaction.response.send_message(str(error), ephemeral=True)
+    await outbound.submit(
+        ("interaction", interaction.id), INTERACTION,
+        lambda: interaction.response.send_message(str(error), ephemeral=True),
+    )
 
 if __name__ == "__main__":
+    if hasattr(signal, "SIGBREAK"):
+        # Windows: launcher.py stops workers with CTRL_BREAK_EVENT; shut down
+        # the same clean way as on Ctrl+C instead of being killed outright.
+        signal.signal(signal.SIGBREAK, signal.default_int_handler)
     bot.run(TOKEN)
@@ -0,0 +1,106 @@
+# cmdsync.py
+
+import asyncio
+import hashlib
+import json
+import random
+import time
+from typing import Iterable, MutableMapping, Optional
+
+import discord
+from discord import app_commands
+
+GLOBAL_KEY = "global"
+
+
+class CommandSyncer:
+    """Pushes a command group to guilds only when its payload changed.
+
+    `state` remembers the hash last synced per guild (plus the cleared global
+    list), so a reconnect or restart with an unchanged tree costs no HTTP at
+    all. Needed syncs run through a small worker pool that backs off on 429s.
+    """
+
+    def __init__(
+        self,
+        tree: app_commands.CommandTree,
+        group: app_commands.Group,
+        state: MutableMapping,
+        concurrency: int = 4,
+        retries: int = 4,
+    ):
+        self.tree    = tree
+        self.group   = group
+        self.state   = state
+        self.retries = retries
+        self._sem    = asyncio.Semaphore(concurrency)
+        self._hash: Optional[str] = None
+
+    def tree_hash(self) -> str:
+        if self._hash is None:
+            payload = json.dumps(self.group.to_dict(self.tree), sort_keys=True, separators=(",", ":"))
+            self._hash = hashlib.sha256(payload.encode()).hexdigest()
+        return self._hash
+
+    def register(self, guild_id: int) -> None:
+        # The local tree must know the guild every run, synced or not.
+        self.tree.add_command(self.group, guild=discord.Object(id=guild_id), override=True)
+
+    async def clear_global(self) -> bool:
+        if self.state.get(GLOBAL_KEY) == "cleared":
+            return False
+        self.tree.clear_commands(guild=None)
+        await self._with_retry(lambda: self.tree.sync(), "global")
+        self.state[GLOBAL_KEY] = "cleared"
+        return True
+
+    async def sync_guild(self, guild_id: int, force: bool = False) -> bool:
+        self.register(guild_id)
+        key = str(guild_id)
+        digest = self.tree_hash()
+        if not force and self.state.get(key) == digest:
+            return False
+        async with self._sem:
+            synced = await self._with_retry(lambda: self.tree.sync(guild=discord.Object(id=guild_id)), key)
+        self.state[key] = digest
+        print(f"[sync] Synced {len(synced)} commands in guild {guild_id}")
+        return True
+
+    async def sync_all(self, guild_ids: Iterable[int]) -> dict:
+        ids = list(guild_ids)
+        t0 = time.perf_counter()
+        results = await asyncio.gather(*(self.sync_guild(g) for g in ids), return_exceptions=True)
+        failed = 0
+        for g, r in zip(ids, results):
+            if isinstance(r, BaseException):
+                failed += 1
+                print(f"[sync] Giving up on guild {g}: {r!r}")
+        return {
+            "guilds":  len(ids),
+            "synced":  sum(r is True for r in results),
+            "skipped": sum(r is False for r in results),
+            "failed":  failed,
+            "seconds": time.perf_counter() - t0,
+        }
+
+    def forget(self, guild_id: int) -> None:
+        # Left the guild: drop its sync hash and the tree's per-guild copy
+        self.state.pop(str(guild_id), None)
+        self.tree.remove_command(self.group.name, guild=discord.Object(id=guild_id))
+
+    async def _with_retry(self, call, label: str):
+        for attempt in range(self.retries + 1):
+            try:
+                return await call()
+            except discord.RateLimited as e:
+                delay = e.retry_after
+            except discord.HTTPException as e:
+                if (e.status != 429 and e.status < 500) or attempt == self.retries:
+                    raise
+                retry_after = e.response.headers.get("Retry-After") if e.response is not None else None
+                delay = float(retry_after) if retry_after else 2 ** attempt
+            if attempt == self.retries:
+                raise RuntimeError(f"still rate limited after {self.retries} retries")
+            delay += random.uniform(0, 0.5)
+            print(f"[sync] {label}: rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
@@ -0,0 +1,62 @@
+# coalescer.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+Render = Callable[[], Any]
+Edit = Callable[[Any], Awaitable[Any]]
+
+
+class _Slot:
+    __slots__ = ("render", "edit", "dirty", "task")
+
+    def __init__(self):
+        self.render: Optional[Render] = None
+        self.edit:   Optional[Edit] = None
+        self.dirty = False
+        self.task:   Optional[asyncio.Task] = None
+
+
+class EditCoalescer:
+    """At most one message edit per `window` seconds per key.
+
+    Callers mutate their state synchronously and then `request()` an edit;
+    a single runner task per key renders the *latest* state when it is its
+    turn, so a burst of clicks collapses into one edit and none can be lost:
+    a click landing while an edit is in flight just marks the key dirty again.
+    The first edit after a quiet period goes out immediately.
+    """
+
+    def __init__(self, window: float = 1.0):
+        self.window   = window
+        self.requests = 0
+        self.edits    = 0
+        self.failures = 0
+        self.edits_saved = 0   # requests superseded before they were rendered
+        self._slots: Dict[Any, _Slot] = {}
+
+    def request(self, key: Any, edit: Edit, render: Render) -> None:
+        self.requests += 1
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot()
+        elif slot.dirty:
+            self.edits_saved += 1
+        slot.render, slot.edit, slot.dirty = render, edit, True
+        if slot.task is None:
+            slot.task = asyncio.get_running_loop().create_task(self._run(key, slot))
+
+    async def _run(self, key: Any, slot: _Slot) -> None:
+        try:
+            while slot.dirty:
+                slot.dirty = False
+                edit, payload = slot.edit, slot.render()  # type: ignore[misc]
+                try:
+                    await edit(payload)  # type: ignore[misc]
+                    self.edits += 1
+                except Exception as e:
+                    self.failures += 1
+                    print(f"[rsvp] Edit for {key} failed: {e!r}")
+                await asyncio.sleep(self.window)
+        finally:
+            del self._slots[key]
@@ -0,0 +1,131 @@
+# compaction.py
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Optional
+
+from procstats import format_bytes
+
+DAY = 86400
+
+
+def rsvp_expired(event_ts: Optional[int], created_ts: Optional[int], now: float, grace: float) -> bool:
+    """Whether a stored RSVP (its "t" and "ct" fields) is past its grace period.
+
+    Scheduled sessions count from their start, "tonight" ones from a day
+    after they were posted. Clicks on an expired RSVP still work: the record
+    is rebuilt from the message's embed.
+    """
+    start = event_ts or (now if created_ts is None else created_ts) + DAY
+    return start + grace < now
+
+
+class CompactionReport:
+    """What one compaction run removed and how much memory/disk it gave back."""
+
+    def __init__(self, rss: Optional[int], disk: int):
+        self.removed: Dict[str, int] = {}
+        self.rss_before  = rss
+        self.rss_after   = rss
+        self.disk_before = disk
+        self.disk_after  = disk
+        self.started = time.perf_counter()
+        self.seconds = 0.0
+
+    def count(self, what: str, n: int) -> None:
+        if n:
+            self.removed[what] = self.removed.get(what, 0) + n
+
+    def finish(self, rss: Optional[int], disk: int) -> "CompactionReport":
+        self.rss_after, self.disk_after = rss, disk
+        self.seconds = time.perf_counter() - self.started
+        return self
+
+    @property
+    def rss_freed(self) -> int:
+        if self.rss_before is None or self.rss_after is None:
+            return 0
+        return self.rss_before - self.rss_after
+
+    @property
+    def disk_freed(self) -> int:
+        return self.disk_before - self.disk_after
+
+    def summary(self) -> str:
+        removed = ", ".join(f"{n} {what}" for what, n in self.removed.items()) or "nothing to remove"
+        return (
+            f"{removed}; RSS {format_bytes(self.rss_before)} → {format_bytes(self.rss_after)}, "
+            f"disk {format_bytes(self.disk_before)} → {format_bytes(self.disk_after)} "
+            f"in {self.seconds:.2f}s"
+        )
+
+
+class Compactor:
+    """Runs `compact()` every `interval` seconds, and `delay` seconds after
+    `request()` (e.g. on guild leave, debounced so a burst of removals is
+    one run). Runs never overlap.
+    """
+
+    def __init__(
+        self,
+        compact: Callable[[], Awaitable[CompactionReport]],
+        interval: float = 6 * 3600,
+        delay: float = 60.0,
+        ready: Optional[Callable[[], Awaitable[None]]] = None,
+    ):
+        self.compact  = compact
+        self.interval = interval
+        self.delay    = delay
+        self.ready    = ready   # awaited before the first run
+        self.runs     = 0
+        self.last: Optional[CompactionReport] = None
+        self._due     = 0.0
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lock    = asyncio.Lock()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._due  = time.monotonic() + self.interval
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def request(self) -> None:
+        """Compact soon (within `delay`), without waiting for the schedule."""
+        due = time.monotonic() + self.delay
+        if due < self._due:
+            self._due = due
+            if self._wake is not None:
+                self._wake.set()
+
+    async def run_now(self) -> CompactionReport:
+        async with self._lock:
+            report = await self.compact()
+            self.runs += 1
+            self.last = report
+            print(f"[gc] {report.summary()}")
+            return report
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        if self.ready is not None:
+            await self.ready()
+        while True:
+            self._wake.clear()
+            delay = self._due - time.monotonic()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._due = time.monotonic() + self.interval
+            try:
+                await self.run_now()
+            except Exception as e:
+                print(f"[gc] Compaction failed: {e!r}")
@@ -0,0 +1,218 @@
+# dispatch.py
+
+import asyncio
+import heapq
+import itertools
+import random
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+import discord
+
+# Priority classes, most urgent first
+INTERACTION, ANNOUNCE, EDIT, REMINDER = range(4)
+PRIORITY_NAMES = ("interaction", "announce", "edit", "reminder")
+
+Call = Callable[[], Awaitable[Any]]
+
+
+class _Job:
+    __slots__ = ("priority", "seq", "route", "call", "future", "attempt", "idempotent")
+
+    def __init__(self, priority: int, seq: int, route: Hashable, call: Call, future: asyncio.Future, idempotent: bool):
+        self.priority = priority
+        self.seq      = seq
+        self.route    = route
+        self.call     = call
+        self.future   = future
+        self.attempt  = 0
+        self.idempotent = idempotent
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+class _Route:
+    __slots__ = ("jobs", "busy", "paused", "queued")
+
+    def __init__(self):
+        self.jobs: List[_Job] = []   # heap
+        self.busy   = False          # a request for this route is in flight
+        self.paused = False          # rate limited / backing off
+        self.queued: Optional[int] = None   # priority of its entry in the ready heap
+
+
+class Dispatcher:
+    """Central queue for outbound Discord calls.
+
+    Each call names a `route` – the rate-limit bucket it hits, e.g. the
+    channel a message goes to – and a priority class. A route runs one call
+    at a time, so a burst into one channel queues up behind itself instead of
+    tripping its bucket while other channels keep going. Across routes the
+    most urgent waiting call goes first, within `concurrency` calls in flight
+    and `rate` requests per second overall (0 = unpaced).
+
+    429s pause just that route and requeue the call (up to `retries` times),
+    and so do 5xx for idempotent calls. A 5xx doesn't say whether the
+    request took effect, so retrying a message create on one can post it
+    twice; `send` only retries rate limits. Every class except INTERACTION has a queue of `queue_size`;
+    when it's full, `submit` waits for room rather than dropping the call.
+    Interaction responses are due within 3 s and aren't subject to the
+    global limit, so they skip the queue. An interaction can be answered
+    only once, so they too are retried on 429 only.
+    """
+
+    def __init__(self, concurrency: int = 8, rate: float = 45.0, queue_size: int = 1000, retries: int = 4):
+        self.concurrency = concurrency
+        self.rate        = rate
+        self.retries     = retries
+        self.sent     = 0
+        self.retried  = 0
+        self.failed   = 0
+        self.rate_limited = 0
+        self._seq     = itertools.count()
+        self._routes: Dict[Hashable, _Route] = {}
+        self._ready:  List[Tuple[int, int, Hashable]] = []
+        self._active  = 0
+        self._space   = {p: asyncio.Semaphore(queue_size) for p in range(ANNOUNCE, len(PRIORITY_NAMES))}
+        self._tokens  = rate
+        self._stamp:  Optional[float] = None
+
+    # ── public API ──────────────────────────────────────────────────────────
+
+    async def submit(self, route: Hashable, priority: int, call: Call, idempotent: bool = True) -> Any:
+        """Run `call()` through the queue and return (or raise) its result.
+
+        Pass ``idempotent=False`` for calls that must not be repeated after
+        an ambiguous 5xx (creating a message); they are retried on 429 only.
+        INTERACTION calls are always treated that way.
+        """
+        if priority == INTERACTION:
+            return await self._direct(call)
+        space = self._space[priority]
+        await space.acquire()   # backpressure
+        loop = asyncio.get_running_loop()
+        job = _Job(priority, next(self._seq), route, call, loop.create_future(), idempotent)
+        job.future.add_done_callback(lambda _: space.release())
+        self._enqueue(job)
+        return await job.future
+
+    def send(self, channel: discord.abc.Messageable, priority: int = ANNOUNCE, **kwargs) -> Awaitable[discord.Message]:
+        return self.submit(("channel", getattr(channel, "id", None)), priority, lambda: channel.send(**kwargs),
+                           idempotent=False)
+
+    def depth(self) -> int:
+        return sum(len(r.jobs) for r in self._routes.values())
+
+    # ── scheduling ──────────────────────────────────────────────────────────
+
+    def _enqueue(self, job: _Job) -> None:
+        route = self._routes.get(job.route)
+        if route is None:
+            route = self._routes[job.route] = _Route()
+        heapq.heappush(route.jobs, job)
+        self._mark_ready(job.route, route)
+        self._pump()
+
+    def _mark_ready(self, key: Hashable, route: _Route) -> None:
+        if route.busy or route.paused or not route.jobs:
+            return
+        head = route.jobs[0].priority
+        if route.queued is None or head < route.queued:
+            # An older, less urgent entry may remain; it's skipped in _pump.
+            route.queued = head
+            heapq.heappush(self._ready, (head, route.jobs[0].seq, key))
+
+    def _pump(self) -> None:
+        while self._active < self.concurrency and self._ready:
+            priority, _, key = heapq.heappop(self._ready)
+            route = self._routes.get(key)
+            if route is None or route.queued != priority or route.busy or route.paused or not route.jobs:
+                continue   # stale entry
+            route.queued = None
+            job = heapq.heappop(route.jobs)
+            if job.future.done():   # caller went away
+                self._mark_ready(key, route)
+                continue
+            route.busy = True
+            self._active += 1
+            asyncio.get_running_loop().create_task(self._execute(key, route, job))
+
+    def _release(self, key: Hashable, route: _Route) -> None:
+        if not route.jobs and not route.busy and not route.paused:
+            del self._routes[key]
+        else:
+            self._mark_ready(key, route)
+        self._pump()
+
+    def _pace(self) -> float:
+        """Take a global token; returns how long to wait for it."""
+        if not self.rate:
+            return 0.0   # unpaced
+        now = asyncio.get_running_loop().time()
+        if self._stamp is not None:
+            self._tokens = min(self.rate, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    # ── execution ───────────────────────────────────────────────────────────
+
+    async def _execute(self, key: Hashable, route: _Route, job: _Job) -> None:
+        delay: Optional[float] = None
+        try:
+            wait = self._pace()
+            if wait:
+                await asyncio.sleep(wait)
+            result = await job.call()
+        except Exception as e:
+            delay = self._retry_delay(e, job.attempt, job.idempotent)
+            if delay is None or job.attempt >= self.retries:
+                self.failed += 1
+                if not job.future.done():
+                    job.future.set_exception(e)
+                delay = None
+        else:
+            self.sent += 1
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            self._active -= 1
+            route.busy = False
+
+        if delay is not None:
+            self.retried += 1
+            job.attempt += 1
+            route.paused = True
+            heapq.heappush(route.jobs, job)
+            print(f"[dispatch] {PRIORITY_NAMES[job.priority]} on {key}: retrying in {delay:.1f}s")
+            asyncio.get_running_loop().call_later(delay, self._resume, key, route)
+        self._release(key, route)
+
+    def _resume(self, key: Hashable, route: _Route) -> None:
+        route.paused = False
+        self._release(key, route)
+
+    def _retry_delay(self, error: Exception, attempt: int, idempotent: bool) -> Optional[float]:
+        if isinstance(error, discord.RateLimited):
+            self.rate_limited += 1
+            return error.retry_after + random.uniform(0, 0.25)
+        if isinstance(error, discord.HTTPException) and (error.status == 429 or (idempotent and error.status >= 500)):
+            if error.status == 429:
+                self.rate_limited += 1
+            retry_after = error.response.headers.get("Retry-After") if error.response is not None else None
+            return (float(retry_after) if retry_after else 2 ** attempt) + random.uniform(0, 0.5)
+        return None
+
+    async def _direct(self, call: Call) -> Any:
+        for attempt in range(self.retries + 1):
+            try:
+                result = await call()
+                self.sent += 1
+                return result
+            except Exception as e:
+                delay = self._retry_delay(e, attempt, idempotent=False)
+                if delay is None or attempt == self.retries:
+                    self.failed += 1
+                    raise
+                self.retried += 1
+                await asyncio.sleep(min(delay, 1.0))   # the 3 s deadline won't wait longer
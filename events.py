@@ -0,0 +1,124 @@
+# events.py
+
+import time
+from bisect import bisect_left, insort
+from typing import Callable, Dict, Iterable, List, MutableMapping, NamedTuple, Optional, Tuple
+
+
+class Event(NamedTuple):
+    message_id: int
+    guild_id:   int
+    channel_id: int
+    event_ts:   int
+    author_id:  int
+
+    @property
+    def url(self) -> str:
+        return f"https://discord.com/channels/{self.guild_id}/{self.channel_id}/{self.message_id}"
+
+
+class EventIndex:
+    """Scheduled sessions per guild, sorted by start time.
+
+    Each guild holds a sorted list of (event_ts, message_id), so a page of
+    upcoming events is one bisect plus a slice: O(log n + k) however many
+    events other guilds have. `backing` (message ID → [g, c, ts, author])
+    persists the index; events that started more than `grace` seconds ago
+    are evicted from both whenever their guild is touched, or by `expire()`.
+    """
+
+    def __init__(
+        self,
+        backing: MutableMapping,
+        grace: float = 3 * 3600,
+        owns: Callable[[int], bool] = lambda guild_id: True,
+    ):
+        self.backing = backing
+        self.grace   = grace
+        self.owns    = owns   # sharded: only index this process's guilds
+        self._by_guild: Dict[int, List[Tuple[int, int]]] = {}
+        self._events:   Dict[int, Event] = {}
+        for key, (g, c, ts, a) in list(backing.items()):
+            if owns(g):
+                self._insert(Event(int(key), g, c, ts, a))
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def __contains__(self, message_id: object) -> bool:
+        return message_id in self._events
+
+    def seed(self, events: Iterable[Event]) -> int:
+        """Index events known from elsewhere (e.g. stored RSVPs); returns how many were new."""
+        cutoff = time.time() - self.grace
+        n = 0
+        for ev in events:
+            if ev.event_ts > cutoff and ev.message_id not in self._events:
+                self.add(ev)
+                n += 1
+        return n
+
+    def add(self, event: Event) -> None:
+        self.remove(event.message_id)
+        self.backing[str(event.message_id)] = [event.guild_id, event.channel_id, event.event_ts, event.author_id]
+        if self.owns(event.guild_id):
+            self._insert(event)
+
+    def _insert(self, event: Event) -> None:
+        self._events[event.message_id] = event
+        insort(self._by_guild.setdefault(event.guild_id, []), (event.event_ts, event.message_id))
+
+    def remove(self, message_id: int) -> bool:
+        self.backing.pop(str(message_id), None)
+        event = self._events.pop(message_id, None)
+        if event is None:
+            return False
+        entries = self._by_guild[event.guild_id]
+        i = bisect_left(entries, (event.event_ts, message_id))
+        del entries[i]
+        if not entries:
+            del self._by_guild[event.guild_id]
+        return True
+
+    def guilds(self) -> List[int]:
+        return list(self._by_guild)
+
+    def drop_guild(self, guild_id: int) -> int:
+        """Forget every event of a guild (e.g. the bot was removed from it)."""
+        entries = self._by_guild.pop(guild_id, [])
+        for _, mid in entries:
+            self._events.pop(mid, None)
+            self.backing.pop(str(mid), None)
+        return len(entries)
+
+    def upcoming(
+        self,
+        guild_id: int,
+        offset: int = 0,
+        limit: int = 10,
+        now: Optional[float] = None,
+    ) -> Tuple[List[Event], int]:
+        """One page of a guild's events in start order, plus the total count."""
+        self._expire_guild(guild_id, time.time() if now is None else now)
+        entries = self._by_guild.get(guild_id, [])
+        page = [self._events[mid] for _, mid in entries[offset:offset + limit]]
+        return page, len(entries)
+
+    def expire(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return sum(self._expire_guild(g, now) for g in list(self._by_guild))
+
+    def _expire_guild(self, guild_id: int, now: float) -> int:
+        entries = self._by_guild.get(guild_id)
+        if not entries:
+            return 0
+        cut = bisect_left(entries, (int(now - self.grace) + 1, 0))
+        if not cut:
+            return 0
+        for _, mid in entries[:cut]:
+            self._events.pop(mid, None)
+            self.backing.pop(str(mid), None)
+        del entries[:cut]
+        if not entries:
+            del self._by_guild[guild_id]
+        return cut
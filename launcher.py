@@ -0,0 +1,138 @@
+# launcher.py
+#
+# Runs the bot as several worker processes, each owning a contiguous range of
+# shards and sharing state through one SQLite database:
+#
+#     python launcher.py --workers 4            # shard count from Discord
+#     python launcher.py --workers 2 --shards 8
+
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from sharding import assign_shards
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+WINDOWS = os.name == "nt"
+
+
+def recommended_shards(token: str) -> Tuple[int, int]:
+    """(shard count, identify max_concurrency) as recommended by Discord."""
+    base = os.getenv("GAMER_API_BASE", "https://discord.com/api/v10")
+    req = urllib.request.Request(
+        f"{base}/gateway/bot",
+        headers={"Authorization": f"Bot {token}", "User-Agent": "DiscordBot (gamermimimi launcher)"},
+    )
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        data = json.load(resp)
+    return data["shards"], data.get("session_start_limit", {}).get("max_concurrency", 1)
+
+
+class Worker:
+    def __init__(self, index: int, shard_ids: List[int], env: Dict[str, str]):
+        self.index     = index
+        self.shard_ids = shard_ids
+        self.env       = env
+        self.proc: Optional[subprocess.Popen] = None
+        self.restarts  = 0
+        self.next_start = 0.0
+        self.done      = False
+
+    def start(self) -> None:
+        # Windows can't deliver SIGINT to a child; its own process group lets
+        # `stop()` send CTRL_BREAK_EVENT to just this worker instead.
+        flags = subprocess.CREATE_NEW_PROCESS_GROUP if WINDOWS else 0
+        self.proc = subprocess.Popen([sys.executable, os.path.join(HERE, "bot.py")], env=self.env, creationflags=flags)
+        print(f"[launcher] worker {self.index} (pid {self.proc.pid}) → shards {self.shard_ids}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Run gamer-mimimi as sharded worker processes")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, default=0, help="total shard count (default: ask Discord)")
+    parser.add_argument("--max-concurrency", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    token = os.getenv("DISCORD_BOT_TOKEN")
+    if token is None:
+        print("Error: DISCORD_BOT_TOKEN is not set!")
+        return 1
+    shards, concurrency = args.shards, args.max_concurrency
+    if not shards:
+        shards, recommended_concurrency = recommended_shards(token)
+        concurrency = concurrency or recommended_concurrency
+    concurrency = concurrency or 1
+
+    workers = []
+    for i, shard_ids in enumerate(assign_shards(shards, args.workers)):
+        env = dict(
+            os.environ,
+            GAMER_SHARD_COUNT=str(shards),
+            GAMER_SHARD_IDS=",".join(map(str, shard_ids)),
+            GAMER_MAX_CONCURRENCY=str(concurrency),
+            GAMER_STORAGE="sqlite",
+            GAMER_SHARED_STATE="1",
+            GAMER_WORKER=str(i),
+        )
+        workers.append(Worker(i, shard_ids, env))
+    print(f"[launcher] {shards} shards across {len(workers)} workers (max_concurrency={concurrency})")
+
+    stopping = False
+
+    def stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for w in workers:
+            if w.proc and w.proc.poll() is None:
+                # bot.run() shuts down cleanly on SIGINT; bot.py maps SIGBREAK to the same
+                w.proc.send_signal(signal.CTRL_BREAK_EVENT if WINDOWS else signal.SIGINT)
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    if WINDOWS:
+        signal.signal(signal.SIGBREAK, stop)
+
+    for w in workers:
+        w.start()
+    # Supervise: restart crashed workers with exponential backoff
+    while not stopping:
+        time.sleep(1)
+        now = time.time()
+        for w in workers:
+            if w.done:
+                continue
+            if w.proc is None:
+                if now >= w.next_start:
+                    w.start()
+                continue
+            code = w.proc.poll()
+            if code is None:
+                continue
+            w.proc = None
+            if code == 0:
+                w.done = True
+                continue
+            w.restarts += 1
+            delay = min(60, 2 ** w.restarts)
+            w.next_start = now + delay
+            print(f"[launcher] worker {w.index} exited with {code}; restarting in {delay}s")
+        if all(w.done for w in workers):
+            break
+
+    for w in workers:
+        if w.proc is not None:
+            w.proc.wait()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+# metrics.py
+
+import asyncio
+import contextvars
+import functools
+import sys
+import threading
+import time
+import tracemalloc
+from bisect import bisect_left
+from collections import Counter as _Tally
+from typing import Callable, Dict, List, Optional, Tuple
+
+import aiohttp
+import discord
+from aiohttp import web
+
+Labels = Tuple[Tuple[str, str], ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0)
+COUNT_BUCKETS   = (0, 1, 2, 3, 4, 5, 8, 13, 21)
+
+
+def _labels(kw: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in kw.items()))
+
+
+def _fmt(name: str, labels: Labels, extra: Labels = ()) -> str:
+    pairs = labels + extra
+    if not pairs:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+# ─── Metric types ─────────────────────────────────────────────────────────────
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name: str, help: str):
+        self.name, self.help = name, help
+        self.values: Dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _labels(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def total(self) -> float:
+        return sum(self.values.values())
+
+    def render(self) -> List[str]:
+        return [f"{_fmt(self.name, k)} {v}" for k, v in self.values.items()]
+
+
+class Gauge:
+    """Read on scrape from a callback, so nothing has to keep it updated."""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], Optional[float]]):
+        self.name, self.help, self.read = name, help, read
+
+    def render(self) -> List[str]:
+        value = self.read()
+        return [] if value is None else [f"{self.name} {value}"]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS):
+        self.name, self.help = name, help
+        self.buckets = tuple(buckets)
+        self.series: Dict[Labels, List[float]] = {}   # bucket counts + [sum, count]
+
+    def labels(self, **labels) -> "_Series":
+        """Bind a label set once, for hot paths that observe it repeatedly."""
+        key = _labels(labels)
+        s = self.series.get(key)
+        if s is None:
+            s = self.series[key] = [0.0] * (len(self.buckets) + 3)
+        return _Series(self.buckets, s)
+
+    def observe(self, value: float, **labels) -> None:
+        self.labels(**labels).observe(value)
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Estimate from bucket counts (linear within a bucket), like PromQL."""
+        if labels:
+            rows = [self.series[_labels(labels)]] if _labels(labels) in self.series else []
+        else:
+            rows = list(self.series.values())
+        total = sum(r[-1] for r in rows)
+        if not total:
+            return None
+        rank, seen, lower = q * total, 0.0, 0.0
+        for i, upper in enumerate(self.buckets + (float("inf"),)):
+            n = sum(r[i] for r in rows)
+            if seen + n >= rank and n:
+                if upper == float("inf"):
+                    return lower
+                return lower + (upper - lower) * (rank - seen) / n
+            seen += n
+            lower = upper
+        return lower
+
+    def render(self) -> List[str]:
+        out = []
+        for key, s in self.series.items():
+            cumulative = 0.0
+            for upper, n in zip(self.buckets + (float("inf"),), s):
+                cumulative += n
+                le = "+Inf" if upper == float("inf") else repr(upper)
+                out.append(f"{_fmt(self.name + '_bucket', key, (('le', le),))} {cumulative}")
+            out.append(f"{_fmt(self.name + '_sum', key)} {s[-2]}")
+            out.append(f"{_fmt(self.name + '_count', key)} {s[-1]}")
+        return out
+
+
+class _Series:
+    __slots__ = ("buckets", "s")
+
+    def __init__(self, buckets: Tuple[float, ...], s: List[float]):
+        self.buckets, self.s = buckets, s
+
+    def observe(self, value: float) -> None:
+        s = self.s
+        s[bisect_left(self.buckets, value)] += 1   # last slot is +Inf
+        s[-2] += value
+        s[-1] += 1
+
+
+class Registry:
+    def __init__(self, prefix: str = "gamer_"):
+        self.prefix = prefix
+        self.metrics: List = []
+
+    def counter(self, name: str, help: str) -> Counter:
+        return self._add(Counter(self.prefix + name, help))
+
+    def gauge(self, name: str, help: str, read: Callable[[], Optional[float]]) -> Gauge:
+        return self._add(Gauge(self.prefix + name, help, read))
+
+    def histogram(self, name: str, help: str, buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(self.prefix + name, help, buckets))
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            lines.extend(m.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+handler_seconds  = registry.histogram("handler_seconds", "Total handler time")
+ack_seconds      = registry.histogram("ack_seconds", "Interaction created → first response sent")
+handler_http     = registry.histogram("handler_http_calls", "HTTP calls per handler run", COUNT_BUCKETS)
+handler_errors   = registry.counter("handler_errors_total", "Handlers that raised")
+http_requests    = registry.counter("http_requests_total", "Discord HTTP requests by status class")
+ratelimit_hits   = registry.counter("ratelimit_hits_total", "429 responses from Discord")
+ratelimit_wait   = registry.histogram("ratelimit_wait_seconds", "Retry-After of 429 responses")
+loop_lag         = registry.histogram("event_loop_lag_seconds", "Scheduling delay of a periodic loop tick",
+                                      (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+
+
+# ─── Per-handler context ──────────────────────────────────────────────────────
+# Set by `instrumented` for the duration of a handler; the aiohttp trace below
+# runs inside the same task, so it can attribute HTTP calls to the handler.
+
+class _Call:
+    __slots__ = ("name", "args", "started", "http_calls", "acked")
+
+    def __init__(self, name: str, args: tuple):
+        self.name       = name
+        self.args       = args   # the Interaction is looked up only on ack
+        self.started    = time.time()
+        self.http_calls = 0
+        self.acked      = False
+
+    def created(self) -> float:
+        inter = _find_interaction(self.args)
+        return inter.created_at.timestamp() if inter is not None else self.started
+
+
+_current: contextvars.ContextVar[Optional[_Call]] = contextvars.ContextVar("gamer_call", default=None)
+
+
+def _find_interaction(args) -> Optional[discord.Interaction]:
+    for a in args:
+        if isinstance(a, discord.Interaction):
+            return a
+    return None
+
+
+def instrumented(name: str):
+    """Record handler time, ack latency and HTTP calls for a command/UI callback."""
+    seconds = handler_seconds.labels(handler=name)
+    http    = handler_http.labels(handler=name)
+
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            call = _Call(name, args)
+            token = _current.set(call)
+            t0 = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            except Exception:
+                handler_errors.inc(handler=name)
+                raise
+            finally:
+                _current.reset(token)
+                seconds.observe(time.perf_counter() - t0)
+                http.observe(call.http_calls)
+        return wrapper
+    return decorator
+
+
+def http_trace() -> aiohttp.TraceConfig:
+    """Pass to the bot as ``http_trace=``: counts calls, acks and 429s."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_request_end(session, ctx, params: aiohttp.TraceRequestEndParams):
+        status = params.response.status
+        http_requests.inc(status=f"{status // 100}xx")
+        call = _current.get()
+        if call is not None:
+            call.http_calls += 1
+            if not call.acked and "/interactions/" in params.url.path and params.url.path.endswith("/callback"):
+                call.acked = True
+                ack_seconds.observe(time.time() - call.created(), handler=call.name)
+        if status == 429:
+            bucket = params.response.headers.get("X-RateLimit-Scope", "user")
+            ratelimit_hits.inc(scope=bucket)
+            try:
+                ratelimit_wait.observe(float(params.response.headers.get("Retry-After", 0)))
+            except ValueError:
+                pass
+
+    trace.on_request_end.append(on_request_end)
+    return trace
+
+
+async def watch_loop_lag(interval: float = 0.5) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        t0 = loop.time()
+        await asyncio.sleep(interval)
+        loop_lag.observe(max(0.0, loop.time() - t0 - interval))
+
+
+# ─── Local /metrics endpoint ──────────────────────────────────────────────────
+
+async def serve(port: int, host: str = "127.0.0.1") -> web.AppRunner:
+    async def handle(_request):
+        return web.Response(text=registry.render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"[metrics] Serving http://{host}:{port}/metrics")
+    return runner
+
+
+# ─── Runtime profiling (opt-in) ───────────────────────────────────────────────
+
+class Profiler:
+    """tracemalloc and a sampling profiler of the event-loop thread, both off
+    until switched on at runtime."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._samples: _Tally = _Tally()
+        self._target = threading.main_thread().ident
+
+    @property
+    def sampling(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start_sampling(self) -> None:
+        if self._thread is not None:
+            return
+        self._target = threading.get_ident()   # called from the loop thread
+        self._samples.clear()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample, name="sampler", daemon=True)
+        self._thread.start()
+
+    def stop_sampling(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            if frame is not None:
+                code = frame.f_code
+                self._samples[f"{code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno} {code.co_name}"] += 1
+
+    def top_samples(self, n: int = 10) -> List[Tuple[str, int]]:
+        return self._samples.most_common(n)
+
+    def start_tracing(self) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+
+    def stop_tracing(self) -> None:
+        tracemalloc.stop()
+
+    def top_allocations(self, n: int = 10) -> List[Tuple[str, int]]:
+        if not tracemalloc.is_tracing():
+            return []
+        stats = tracemalloc.take_snapshot().statistics("lineno")[:n]
+        return [(f"{s.traceback[0].filename.rsplit('/', 1)[-1]}:{s.traceback[0].lineno}", s.size) for s in stats]
+
+
+profiler = Profiler()
@@ -0,0 +1,96 @@
+# procstats.py
+
+import ctypes
+import ctypes.util
+import gc
+import os
+import sys
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None  # type: ignore[assignment]
+
+
+class _ProcessMemoryCounters(ctypes.Structure):
+    # PROCESS_MEMORY_COUNTERS from psapi.h
+    _fields_ = [
+        ("cb",                         ctypes.c_ulong),
+        ("PageFaultCount",             ctypes.c_ulong),
+        ("PeakWorkingSetSize",         ctypes.c_size_t),
+        ("WorkingSetSize",             ctypes.c_size_t),
+        ("QuotaPeakPagedPoolUsage",    ctypes.c_size_t),
+        ("QuotaPagedPoolUsage",        ctypes.c_size_t),
+        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+        ("QuotaNonPagedPoolUsage",     ctypes.c_size_t),
+        ("PagefileUsage",              ctypes.c_size_t),
+        ("PeakPagefileUsage",          ctypes.c_size_t),
+    ]
+
+
+def _windows_working_set() -> Optional[int]:
+    """The working set (Windows' RSS) via GetProcessMemoryInfo."""
+    try:
+        kernel32 = ctypes.WinDLL("kernel32")   # type: ignore[attr-defined]
+        psapi = ctypes.WinDLL("psapi")         # type: ignore[attr-defined]
+    except (AttributeError, OSError):
+        return None
+    kernel32.GetCurrentProcess.restype = ctypes.c_void_p
+    psapi.GetProcessMemoryInfo.argtypes = [
+        ctypes.c_void_p, ctypes.POINTER(_ProcessMemoryCounters), ctypes.c_ulong,
+    ]
+    counters = _ProcessMemoryCounters()
+    counters.cb = ctypes.sizeof(counters)
+    if not psapi.GetProcessMemoryInfo(kernel32.GetCurrentProcess(), ctypes.byref(counters), counters.cb):
+        return None
+    return counters.WorkingSetSize
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size of this process (peak RSS where the current
+    value isn't available), or None if the platform exposes neither."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if sys.platform == "win32":
+        return _windows_working_set()
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def release_memory() -> None:
+    """Collect garbage and hand free heap pages back to the OS.
+
+    CPython frees objects into glibc's arenas, which keep the pages; without
+    malloc_trim RSS never shrinks after a prune. No-op off glibc.
+    """
+    gc.collect()
+    libc = ctypes.util.find_library("c")
+    if libc and sys.platform.startswith("linux"):
+        try:
+            ctypes.CDLL(libc).malloc_trim(0)
+        except (OSError, AttributeError):
+            pass   # musl and others have no malloc_trim
+
+
+def format_bytes(n: Optional[float]) -> str:
+    if n is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(n) < 1024 or unit == "GiB":
+            return f"{n:.1f} {unit}" if unit != "B" else f"{int(n)} B"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def rss_per_guild(guilds: int) -> str:
+    rss = rss_bytes()
+    if rss is None:
+        return "RSS n/a"
+    per = format_bytes(rss / guilds) if guilds else "n/a"
+    return f"RSS {format_bytes(rss)} across {guilds} guilds ({per}/guild)"
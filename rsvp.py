@@ -0,0 +1,294 @@
+# rsvp.py
+
+import base64
+import re
+import sys
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Set
+
+from storage import PersistentMap, pack_ids, unpack_ids
+
+# ─── RSVP statuses (also the embed field order) ──────────────────────────────
+JOIN, CANT, MAYBE = 0, 1, 2
+STATUSES = (JOIN, CANT, MAYBE)
+
+# Discord caps a field value at 1024 chars (and an embed at 6000, which three
+# capped fields plus title/description stay under). Leave room for the suffix.
+FIELD_LIMIT  = 1024
+FIELD_BUDGET = FIELD_LIMIT - len(" … +000000 more")
+
+_MENTION = re.compile(r"<@!?(\d+)>")
+_TIMESTAMP = re.compile(r"<t:(\d+)")
+
+
+class _Field:
+    __slots__ = ("text", "shown", "total", "stale")
+
+    def __init__(self):
+        self.text  = ""
+        self.shown = 0      # mentions contained in `text`
+        self.total = 0      # everyone with this status
+        self.stale = False  # a visible mention was removed → rebuild on render
+
+
+class RosterCache:
+    """Rendered field values per status, kept up to date click by click.
+
+    Adding a user appends one mention (or just bumps the "+N more" count once
+    the field is full); removing a hidden user is a counter decrement. Only
+    removing a *visible* user marks that one field for a rebuild, which stops
+    at the size budget. Rendering is therefore independent of roster size.
+    """
+
+    __slots__ = ("fields",)
+
+    def __init__(self, record: "RSVPRecord"):
+        self.fields = tuple(_Field() for _ in STATUSES)
+        for status in STATUSES:
+            self.fields[status].total = record.count(status)
+            self.fields[status].stale = True
+
+    def added(self, status: int, user_id: int) -> None:
+        f = self.fields[status]
+        f.total += 1
+        if f.stale or f.shown < f.total - 1:
+            return  # already truncated (or about to be rebuilt)
+        mention = f"<@{user_id}>"
+        if len(f.text) + len(mention) + 2 <= FIELD_BUDGET:
+            f.text  = f"{f.text}, {mention}" if f.text else mention
+            f.shown += 1
+
+    def removed(self, status: int, user_id: int) -> None:
+        f = self.fields[status]
+        f.total -= 1
+        if not f.stale and f"<@{user_id}>" in f.text:
+            f.stale = True
+
+    def value(self, record: "RSVPRecord", status: int) -> str:
+        f = self.fields[status]
+        if f.stale:
+            parts, size = [], 0
+            for uid in record.members(status):
+                mention = f"<@{uid}>"
+                if size + len(mention) + 2 > FIELD_BUDGET:
+                    break
+                parts.append(mention)
+                size += len(mention) + 2
+            f.text, f.shown, f.stale = ", ".join(parts), len(parts), False
+        if not f.total:
+            return "Nobody"
+        if f.shown < f.total:
+            return f"{f.text} … +{f.total - f.shown} more"
+        return f.text
+
+
+class RSVPRecord:
+    """State of one RSVP message, kept as raw IDs.
+
+    Users live in one packed ``array('Q')`` with a parallel ``bytearray`` of
+    statuses (9 bytes per responder), in the order they picked their status.
+    """
+
+    __slots__ = (
+        "message_id", "guild_id", "channel_id", "author_id",
+        "event_ts", "created_ts", "user_ids", "statuses", "_roster",
+    )
+
+    def __init__(
+        self,
+        message_id: int,
+        guild_id: int,
+        channel_id: int,
+        author_id: int,
+        event_ts: int = 0,          # 0 → a "tonight" session
+        created_ts: Optional[int] = None,
+    ):
+        self.message_id = message_id
+        self.guild_id   = guild_id
+        self.channel_id = channel_id
+        self.author_id  = author_id
+        self.event_ts   = event_ts
+        self.created_ts = int(time.time()) if created_ts is None else created_ts
+        self.user_ids   = array("Q")
+        self.statuses   = bytearray()
+        self._roster: Optional[RosterCache] = None   # built on first render
+
+    def _find(self, user_id: int) -> int:
+        # array.index boxes every element into a Python int; a byte search
+        # over the packed buffer is ~50x faster on big rosters.
+        hay = self.user_ids.tobytes()
+        needle = user_id.to_bytes(8, sys.byteorder)
+        pos = hay.find(needle)
+        while pos != -1 and pos % 8:
+            pos = hay.find(needle, pos + 1)
+        return -1 if pos == -1 else pos // 8
+
+    def status_of(self, user_id: int) -> Optional[int]:
+        i = self._find(user_id)
+        return None if i < 0 else self.statuses[i]
+
+    def set_status(self, user_id: int, status: int) -> Optional[int]:
+        """Move `user_id` to `status`; returns the previous status (or None)."""
+        i = self._find(user_id)
+        if i < 0:
+            self.user_ids.append(user_id)
+            self.statuses.append(status)
+            if self._roster is not None:
+                self._roster.added(status, user_id)
+            return None
+        previous = self.statuses[i]
+        if previous != status:
+            # Move to the end so each status lists people in the order they
+            # picked it – the same order the roster cache appends in.
+            del self.user_ids[i]
+            del self.statuses[i]
+            self.user_ids.append(user_id)
+            self.statuses.append(status)
+            if self._roster is not None:
+                self._roster.removed(previous, user_id)
+                self._roster.added(status, user_id)
+        return previous
+
+    def field_value(self, status: int) -> str:
+        """Embed field text for `status`, truncated with "+N more"."""
+        if self._roster is None:
+            self._roster = RosterCache(self)
+        return self._roster.value(self, status)
+
+    def members(self, status: int) -> Iterator[int]:
+        return (uid for uid, s in zip(self.user_ids, self.statuses) if s == status)
+
+    def count(self, status: int) -> int:
+        return self.statuses.count(status)
+
+    def to_json(self) -> dict:
+        return {
+            "g": self.guild_id, "c": self.channel_id, "a": self.author_id,
+            "t": self.event_ts, "ct": self.created_ts,
+            "u": pack_ids(self.user_ids),
+            "s": base64.b64encode(self.statuses).decode(),
+        }
+
+    @classmethod
+    def from_json(cls, message_id: int, data: dict) -> "RSVPRecord":
+        rec = cls(message_id, data["g"], data["c"], data["a"], data["t"], data["ct"])
+        rec.user_ids = unpack_ids(data["u"])
+        rec.statuses = bytearray(base64.b64decode(data["s"]))
+        return rec
+
+
+class RSVPStore:
+    """Message ID → RSVPRecord, persisted through a (lazy) PersistentMap.
+
+    Only recently clicked events stay decoded in memory; anything else is
+    read back from the backend on its next click. The backing map holds the
+    record objects themselves and encodes them when it flushes (create it
+    with ``encode=encode_record``), so a click costs no JSON work. The IDs
+    of all stored records are kept as a set of ints, so the store can tell
+    an RSVP from any other message without touching the backend.
+    """
+
+    def __init__(self, backing: PersistentMap, cache_size: int = 1024):
+        self._backing = backing
+        self._live: "OrderedDict[int, RSVPRecord]" = OrderedDict()
+        self._cache_size = cache_size
+        self._ids: Set[int] = {int(k) for k in backing.stored_keys()}
+
+    def __contains__(self, message_id: int) -> bool:
+        return message_id in self._ids
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    async def get(self, message_id: int) -> Optional[RSVPRecord]:
+        rec = self._live.get(message_id)
+        if rec is not None:
+            self._live.move_to_end(message_id)
+            return rec
+        data = await self._backing.fetch(str(message_id))
+        if data is None:
+            return None
+        rec = self._live.get(message_id)  # put by someone else while we read
+        if rec is None:
+            if isinstance(data, RSVPRecord):
+                rec = data
+            else:
+                rec = RSVPRecord.from_json(message_id, data)
+                self._drop_encoded(message_id)
+            self._remember(rec)
+        return rec
+
+    def put(self, message_id: int, rec: RSVPRecord) -> RSVPRecord:
+        rec.message_id = message_id
+        self._ids.add(message_id)
+        self._remember(rec)
+        self.save(rec)
+        return rec
+
+    def save(self, rec: RSVPRecord) -> None:
+        self._backing[str(rec.message_id)] = rec
+
+    def delete(self, message_id: int) -> bool:
+        """Forget an RSVP; False if `message_id` isn't one."""
+        if message_id not in self._ids:
+            return False
+        self._ids.discard(message_id)
+        self._live.pop(message_id, None)
+        self._backing.discard(str(message_id))
+        return True
+
+    def rehydrate(
+        self,
+        message_id: int,
+        guild_id: int,
+        channel_id: int,
+        description: str,
+        field_values: Sequence[str],
+    ) -> RSVPRecord:
+        """Rebuild a record for a message we hold no state for (e.g. posted
+        before RSVP state was persisted) from the mentions in its embed."""
+        author = _MENTION.search(description or "")
+        ts = _TIMESTAMP.search(description or "")
+        rec = RSVPRecord(
+            message_id, guild_id, channel_id,
+            int(author.group(1)) if author else 0,
+            int(ts.group(1)) if ts else 0,
+        )
+        for status, value in zip(STATUSES, field_values):
+            for uid in _MENTION.findall(value or ""):
+                rec.set_status(int(uid), status)
+        return self.put(message_id, rec)
+
+    def _remember(self, rec: RSVPRecord) -> None:
+        self._live[rec.message_id] = rec
+        self._live.move_to_end(rec.message_id)
+        while len(self._live) > self._cache_size:
+            old, _ = self._live.popitem(last=False)
+            self._drop_encoded(old)
+
+    def _drop_encoded(self, message_id: int) -> None:
+        # Leaving the live cache, or decoded from JSON: the backing map need
+        # not hold either form once it is on disk.
+        self._backing.evict(str(message_id))
+
+
+def encode_record(value: Any) -> Any:
+    """`PersistentMap` encoder for the RSVP namespace."""
+    return value.to_json() if isinstance(value, RSVPRecord) else value
+
+
+def mention_chunks(user_ids: Iterable[int], limit: int = 1900) -> Iterator[str]:
+    """Space-separated mentions, split so each chunk fits one message."""
+    chunk: List[str] = []
+    size = 0
+    for uid in user_ids:
+        mention = f"<@{uid}>"
+        if chunk and size + len(mention) + 1 > limit:
+            yield " ".join(chunk)
+            chunk, size = [], 0
+        chunk.append(mention)
+        size += len(mention) + 1
+    if chunk:
+        yield " ".join(chunk)
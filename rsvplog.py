@@ -0,0 +1,394 @@
+# rsvplog.py
+
+import asyncio
+import glob
+import json
+import os
+import re
+import tempfile
+import time
+from bisect import bisect_left
+from collections import ChainMap
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from rsvp import JOIN
+
+# First-response delay buckets (seconds) for the "typical response time"
+RESPONSE_BUCKETS = (30, 60, 120, 300, 600, 1800, 3600, 7200, 21600, 86400)
+
+_encode = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class Tally:
+    """Incrementally maintained RSVP counters for one user or guild.
+
+    attendance = share of answered sessions they're currently Ready for;
+    flake rate = share of Ready commitments later switched away from.
+    """
+
+    __slots__ = ("responses", "ready", "commits", "flakes", "rt_sum", "rt_buckets")
+
+    def __init__(self, data: Optional[list] = None):
+        if data:
+            self.responses, self.ready, self.commits, self.flakes, self.rt_sum, buckets = data
+            self.rt_buckets: List[int] = list(buckets)
+        else:
+            self.responses = self.ready = self.commits = self.flakes = 0
+            self.rt_sum = 0.0
+            self.rt_buckets = [0] * (len(RESPONSE_BUCKETS) + 1)
+
+    def apply(self, status: int, previous: Optional[int], response_time: Optional[float]) -> None:
+        if previous is None:
+            self.responses += 1
+            if response_time is not None:
+                self.rt_sum += response_time
+                self.rt_buckets[bisect_left(RESPONSE_BUCKETS, response_time)] += 1
+        if status == JOIN and previous != JOIN:
+            self.ready += 1
+            self.commits += 1
+        elif previous == JOIN and status != JOIN:
+            self.ready -= 1
+            self.flakes += 1
+
+    @property
+    def attendance_rate(self) -> Optional[float]:
+        return self.ready / self.responses if self.responses else None
+
+    @property
+    def flake_rate(self) -> Optional[float]:
+        return self.flakes / self.commits if self.commits else None
+
+    def typical_response(self) -> Optional[float]:
+        """Median first-response delay, as the upper edge of its bucket."""
+        total = sum(self.rt_buckets)
+        if not total:
+            return None
+        seen = 0
+        for upper, n in zip(RESPONSE_BUCKETS + (float("inf"),), self.rt_buckets):
+            seen += n
+            if seen * 2 >= total:
+                return upper
+        return None
+
+    def merge(self, other: "Tally") -> None:
+        # Counters are sums over disjoint sets of log lines, so they add up
+        self.responses += other.responses
+        self.ready     += other.ready
+        self.commits   += other.commits
+        self.flakes    += other.flakes
+        self.rt_sum    += other.rt_sum
+        self.rt_buckets = [a + b for a, b in zip(self.rt_buckets, other.rt_buckets)]
+
+    def to_json(self) -> list:
+        return [self.responses, self.ready, self.commits, self.flakes, self.rt_sum, self.rt_buckets]
+
+
+class RSVPLog:
+    """Append-only JSONL log of RSVP state changes, plus aggregates kept up
+    to date as lines are appended.
+
+    Lines are ``[ts, guild, message, user, status, previous, response_s]``
+    (previous/response_s null when not applicable), buffered and appended at
+    most every `flush_interval` seconds. Once a generation file passes
+    `max_bytes` a new one is started and the aggregates are snapshotted –
+    that snapshot is the compaction: startup loads it and replays only the
+    generations after it. The newest `keep` old generations stay on disk.
+    With ``append=False`` the log is only read (to `absorb` it elsewhere).
+    """
+
+    def __init__(
+        self,
+        directory: str = ".",
+        name: str = "rsvp-log",
+        max_bytes: int = 8 * 1024 * 1024,
+        keep: int = 3,
+        flush_interval: float = 1.0,
+        append: bool = True,
+    ):
+        self.directory = directory
+        self.name      = name
+        self.max_bytes = max_bytes
+        self.keep      = keep
+        self.flush_interval = flush_interval
+        self.users:  Dict[Tuple[int, int], Tally] = {}   # (guild, user) → tally
+        self.guilds: Dict[int, Tally] = {}
+        self.members: Dict[int, Set[int]] = {}   # guild → users with a tally there
+        self.absorbed: Set[str] = set()   # other logs already folded into this one
+        self.appended = 0
+        self._pending: List[tuple] = []   # encoded at flush, off the click path
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.generation = self._load()
+        self._file = open(self._path(self.generation), "a", encoding="utf-8") if append else None
+
+    # ── files ───────────────────────────────────────────────────────────────
+
+    def _path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"{self.name}.{generation}.jsonl")
+
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, f"{self.name}.snapshot.json")
+
+    def _generations(self) -> List[int]:
+        pattern = re.compile(re.escape(self.name) + r"\.(\d+)\.jsonl$")
+        found = (pattern.search(p) for p in glob.glob(os.path.join(self.directory, f"{self.name}.*.jsonl")))
+        return sorted(int(m.group(1)) for m in found if m)
+
+    def _load(self) -> int:
+        generation = 0
+        try:
+            with open(self._snapshot_path(), encoding="utf-8") as f:
+                snap = json.load(f)
+            generation = snap["generation"]
+            self.users  = {(g, u): Tally(t) for g, u, t in snap["users"]}
+            self.guilds = {g: Tally(t) for g, t in snap["guilds"]}
+            for g, u in self.users:
+                self.members.setdefault(g, set()).add(u)
+            self.absorbed = set(snap.get("absorbed", ()))
+        except (FileNotFoundError, json.JSONDecodeError, KeyError, ValueError):
+            pass
+        for gen in self._generations():
+            if gen >= generation:
+                self._replay(self._path(gen))
+                generation = gen
+        return generation
+
+    def _replay(self, path: str) -> None:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    _ts, g, _m, u, status, previous, rt = json.loads(line)
+                except (json.JSONDecodeError, ValueError):
+                    continue   # torn last line after a crash
+                self._apply(g, u, status, previous, rt)
+
+    # ── appending ───────────────────────────────────────────────────────────
+
+    def record(self, guild_id: int, message_id: int, user_id: int, status: int,
+               previous: Optional[int], created_ts: int) -> None:
+        now = time.time()
+        rt = round(now - created_ts, 1) if previous is None else None
+        self._apply(guild_id, user_id, status, previous, rt)
+        self._pending.append((int(now), guild_id, message_id, user_id, status, previous, rt))
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.flush_interval, self.flush)
+
+    def _apply(self, guild_id: int, user_id: int, status: int, previous: Optional[int], rt: Optional[float]) -> None:
+        self._user_tally(guild_id, user_id).apply(status, previous, rt)
+        tally = self.guilds.get(guild_id)
+        if tally is None:
+            tally = self.guilds[guild_id] = Tally()
+        tally.apply(status, previous, rt)
+
+    def _user_tally(self, guild_id: int, user_id: int) -> Tally:
+        tally = self.users.get((guild_id, user_id))
+        if tally is None:
+            tally = self.users[(guild_id, user_id)] = Tally()
+            self.members.setdefault(guild_id, set()).add(user_id)
+        return tally
+
+    def flush(self) -> None:
+        # Small page-cache appends; no fsync – losing the last second of
+        # analytics in a crash is acceptable.
+        self._timer = None
+        if self._pending:
+            self._file.write("\n".join(map(_encode, self._pending)) + "\n")
+            self._file.flush()
+            self.appended += len(self._pending)
+            self._pending.clear()
+        if self._file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self) -> None:
+        self._file.close()
+        self.generation += 1
+        self._file = open(self._path(self.generation), "a", encoding="utf-8")
+        self.snapshot()
+        for gen in self._generations():
+            if gen < self.generation - self.keep:
+                os.unlink(self._path(gen))
+
+    def snapshot(self) -> None:
+        """Write the aggregates covering everything before the current generation."""
+        data = {
+            "generation": self.generation,
+            "users":  [[g, u, t.to_json()] for (g, u), t in self.users.items()],
+            "guilds": [[g, t.to_json()] for g, t in self.guilds.items()],
+            "absorbed": sorted(self.absorbed),
+        }
+        fd, tmp = tempfile.mkstemp(prefix=f".{self.name}.", dir=self.directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._snapshot_path())
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def forget_guilds(self, guild_ids: Set[int]) -> int:
+        """Drop the tallies of guilds we left; returns how many were dropped.
+
+        Rotates so the snapshot no longer has them and replay won't bring
+        them back; their lines only survive in the `keep` old generations.
+        """
+        users = [(g, u) for g in guild_ids for u in self.members.pop(g, ())]
+        for key in users:
+            del self.users[key]
+        n = sum(self.guilds.pop(g, None) is not None for g in guild_ids) + len(users)
+        if n:
+            self.flush()
+            self.rotate()
+        return n
+
+    def absorb(self, other: "RSVPLog", keep: Callable[[int], bool]) -> int:
+        """Add `other`'s tallies of the guilds `keep` accepts; returns how many.
+
+        `other` is recorded as absorbed in the next snapshot, so `rotate()`
+        commits the merge and a restart after it never adds `other` twice.
+        """
+        n = 0
+        for (g, u), tally in other.users.items():
+            if keep(g):
+                self._user_tally(g, u).merge(tally)
+                n += 1
+        for g, tally in other.guilds.items():
+            if keep(g):
+                self.guilds.setdefault(g, Tally()).merge(tally)
+        self.absorbed.add(other.name)
+        return n
+
+    def paths(self) -> List[str]:
+        paths = [self._path(g) for g in self._generations()] + [self._snapshot_path()]
+        return [p for p in paths if os.path.exists(p)]
+
+    def disk_bytes(self) -> int:
+        return sum(os.path.getsize(p) for p in self.paths())
+
+    def close(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self.flush()
+        self._file.close()
+
+    # ── queries ─────────────────────────────────────────────────────────────
+
+    def user(self, guild_id: int, user_id: int) -> Optional[Tally]:
+        return self.users.get((guild_id, user_id))
+
+    def guild(self, guild_id: int) -> Optional[Tally]:
+        return self.guilds.get(guild_id)
+
+    def guild_users(self, guild_id: int) -> Set[int]:
+        """Everyone who has answered an RSVP in this guild."""
+        return set(self.members.get(guild_id, ()))
+
+
+class ShardedRSVPLog:
+    """One RSVPLog per shard this process owns, named ``{name}-{shard}of{count}``
+    (just `name` when there is a single shard), so a guild's tallies stay in
+    the same files however the shards are spread over worker processes.
+
+    Logs found under any other layout – per-worker names from older
+    versions, or another shard count – are folded into the owning shards'
+    logs on startup, and deleted once every shard has taken its guilds.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        shard_ids: Iterable[int],
+        shard_count: int,
+        shard_for: Callable[[int], int],
+        name: str = "rsvp-log",
+        **options,
+    ):
+        self.directory = directory
+        self.name      = name
+        self.count     = shard_count
+        self.shard_for = shard_for
+        self.logs: Dict[int, RSVPLog] = {
+            sid: RSVPLog(directory, self._name(sid), **options) for sid in shard_ids
+        }
+        self._absorb_other_layouts()
+
+    def _name(self, shard_id: int) -> str:
+        return self.name if self.count == 1 else f"{self.name}-{shard_id}of{self.count}"
+
+    def _log(self, guild_id: int) -> RSVPLog:
+        # Guilds of other shards (or none, for DMs) only ever get empty answers
+        return self.logs.get(self.shard_for(guild_id)) or next(iter(self.logs.values()))
+
+    def _names_on_disk(self) -> Set[str]:
+        pattern = re.compile(re.escape(self.name) + r"(?:-\d+(?:of\d+)?)?(?=\.(?:\d+\.jsonl|snapshot\.json)$)")
+        found = (pattern.match(os.path.basename(p)) for p in glob.glob(os.path.join(self.directory, f"{self.name}*")))
+        return {m.group(0) for m in found if m}
+
+    def _absorbed_by(self, shard_id: int) -> Set[str]:
+        if shard_id in self.logs:
+            return self.logs[shard_id].absorbed
+        try:
+            with open(os.path.join(self.directory, f"{self._name(shard_id)}.snapshot.json"), encoding="utf-8") as f:
+                return set(json.load(f).get("absorbed", ()))
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError):
+            return set()
+
+    def _absorb_other_layouts(self) -> None:
+        on_disk = self._names_on_disk()
+        foreign = on_disk - {self._name(sid) for sid in range(self.count)}
+        for log in self.logs.values():
+            log.absorbed &= on_disk   # a name can come back after its files were removed
+        others = [RSVPLog(self.directory, other_name, append=False) for other_name in sorted(foreign)]
+        for sid, log in self.logs.items():
+            todo = [other for other in others if other.name not in log.absorbed]
+            for other in todo:
+                n = log.absorb(other, lambda g, sid=sid: self.shard_for(g) == sid)
+                if n:
+                    print(f"[rsvplog] Moved {n} tallies from {other.name} into {log.name}")
+            if todo:
+                log.flush()
+                log.rotate()   # commits the merge
+        for other in others:
+            if all(other.name in self._absorbed_by(sid) for sid in range(self.count)):
+                for path in other.paths():
+                    try:
+                        os.unlink(path)
+                    except FileNotFoundError:
+                        pass   # another worker got there first
+
+    # ── RSVPLog interface, routed by guild ──────────────────────────────────
+
+    @property
+    def users(self) -> ChainMap:
+        return ChainMap(*(log.users for log in self.logs.values()))
+
+    @property
+    def guilds(self) -> ChainMap:
+        return ChainMap(*(log.guilds for log in self.logs.values()))
+
+    @property
+    def appended(self) -> int:
+        return sum(log.appended for log in self.logs.values())
+
+    def record(self, guild_id: int, message_id: int, user_id: int, status: int,
+               previous: Optional[int], created_ts: int) -> None:
+        self._log(guild_id).record(guild_id, message_id, user_id, status, previous, created_ts)
+
+    def user(self, guild_id: int, user_id: int) -> Optional[Tally]:
+        return self._log(guild_id).user(guild_id, user_id)
+
+    def guild(self, guild_id: int) -> Optional[Tally]:
+        return self._log(guild_id).guild(guild_id)
+
+    def guild_users(self, guild_id: int) -> Set[int]:
+        return self._log(guild_id).guild_users(guild_id)
+
+    def forget_guilds(self, guild_ids: Set[int]) -> int:
+        return sum(log.forget_guilds(guild_ids) for log in self.logs.values())
+
+    def disk_bytes(self) -> int:
+        return sum(log.disk_bytes() for log in self.logs.values())
+
+    def close(self) -> None:
+        for log in self.logs.values():
+            log.close()
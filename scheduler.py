@@ -0,0 +1,114 @@
+# scheduler.py
+
+import asyncio
+import heapq
+import time
+from typing import Awaitable, Callable, Iterable, List, MutableMapping, Optional, Set, Tuple
+
+Fire = Callable[[str, dict], Awaitable[None]]
+
+
+class ReminderScheduler:
+    """Persisted min-heap of reminders driven by a single sleeping task.
+
+    `backing` (key → {"at": unix_ts, ...payload}) is the source of truth and
+    survives restarts; the heap only orders it. Cancelling drops the key from
+    `backing` and leaves a stale heap entry that is skipped when it surfaces
+    (the heap is rebuilt once stale entries outnumber live ones). Reminders
+    that are more than `max_late` seconds overdue – e.g. after downtime –
+    are dropped instead of fired.
+    """
+
+    def __init__(
+        self,
+        backing: MutableMapping,
+        fire: Fire,
+        max_late: float = 900,
+        owns: Callable[[dict], bool] = lambda entry: True,
+    ):
+        self.backing  = backing
+        self.fire     = fire
+        self.max_late = max_late
+        self.owns     = owns   # sharded: only schedule this process's entries
+        self.fired    = 0
+        self.dropped  = 0
+        self._heap: List[Tuple[float, str]] = []
+        self._stale = 0
+        self._rebuild()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def __len__(self) -> int:
+        return len(self.backing)
+
+    def add(self, key: str, at: float, **payload) -> None:
+        if key in self.backing:
+            self._stale += 1
+        self.backing[key] = {"at": at, **payload}
+        heapq.heappush(self._heap, (at, key))
+        if self._wake is not None and self._heap[0] == (at, key):
+            self._wake.set()  # new earliest deadline
+
+    def cancel(self, keys: Iterable[str]) -> int:
+        n = 0
+        for key in keys:
+            if self.backing.pop(key, None) is not None:
+                n += 1
+        self._stale += n
+        if self._stale > len(self._heap) // 2:
+            self._rebuild()
+        return n
+
+    def _rebuild(self) -> None:
+        self._heap = [(entry["at"], key) for key, entry in self.backing.items() if self.owns(entry)]
+        heapq.heapify(self._heap)
+        self._stale = 0
+
+    def _is_live(self, at: float, key: str) -> bool:
+        entry = self.backing.get(key)
+        return entry is not None and entry["at"] == at
+
+    def start(self) -> None:
+        if self._task is None:
+            self._wake = asyncio.Event()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        assert self._wake is not None
+        while True:
+            while self._heap and not self._is_live(*self._heap[0]):
+                heapq.heappop(self._heap)
+                self._stale = max(0, self._stale - 1)
+            self._wake.clear()
+            if not self._heap:
+                await self._wake.wait()
+                continue
+            at, key = self._heap[0]
+            delay = at - time.time()
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self._heap)
+            entry = self.backing.pop(key)
+            if -delay > self.max_late:
+                self.dropped += 1
+                continue
+            self.fired += 1
+            task = asyncio.get_running_loop().create_task(self._fire(key, entry))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _fire(self, key: str, entry: dict) -> None:
+        try:
+            await self.fire(key, entry)
+        except Exception as e:
+            print(f"[reminders] {key} failed: {e!r}")
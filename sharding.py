@@ -0,0 +1,81 @@
+# sharding.py
+
+import asyncio
+import os
+import time
+from typing import List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process identify gate
+    fcntl = None  # type: ignore[assignment]
+
+IDENTIFY_SPACING = 5.0   # Discord: one IDENTIFY per 5 s per concurrency bucket
+
+
+def assign_shards(shard_count: int, workers: int) -> List[List[int]]:
+    """Split 0..shard_count-1 into `workers` contiguous, near-equal ranges."""
+    workers = max(1, min(workers, shard_count))
+    base, extra = divmod(shard_count, workers)
+    ranges, start = [], 0
+    for w in range(workers):
+        size = base + (w < extra)
+        ranges.append(list(range(start, start + size)))
+        start += size
+    return ranges
+
+
+class ShardConfig:
+    """This process's slice of the bot, from the env set by launcher.py.
+
+    Without GAMER_SHARD_COUNT/GAMER_SHARD_IDS the process owns everything and
+    discord.py picks the shard count itself.
+    """
+
+    def __init__(self):
+        self.shard_count: Optional[int] = int(os.getenv("GAMER_SHARD_COUNT", "0")) or None
+        ids = [int(i) for i in os.getenv("GAMER_SHARD_IDS", "").split(",") if i.strip()]
+        self.shard_ids: Optional[List[int]] = ids or None
+        self.max_concurrency = int(os.getenv("GAMER_MAX_CONCURRENCY", "1"))
+        self._owned = frozenset(ids)
+
+    @property
+    def multiprocess(self) -> bool:
+        return self.shard_count is not None and self.shard_ids is not None
+
+    def shard_for(self, guild_id: int) -> int:
+        return (guild_id >> 22) % (self.shard_count or 1)
+
+    def owns_guild(self, guild_id: int) -> bool:
+        return not self.multiprocess or self.shard_for(guild_id) in self._owned
+
+
+def _take_identify_slot(path: str) -> None:
+    with open(path, "a+") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            f.seek(0)
+            last = float(f.read() or 0)
+            wait = last + IDENTIFY_SPACING - time.time()
+            if wait > 0:
+                time.sleep(wait)
+            f.seek(0)
+            f.truncate()
+            f.write(str(time.time()))
+            f.flush()
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+async def identify_gate(config: ShardConfig, shard_id: int, directory: str) -> bool:
+    """Space IDENTIFYs across *all* worker processes sharing `directory`.
+
+    Returns False when no gate is available (Windows), so the caller falls
+    back to discord.py's per-process spacing.
+    """
+    if fcntl is None:
+        return False
+    bucket = shard_id % max(1, config.max_concurrency)
+    path = os.path.join(directory, f".identify-{bucket}.lock")
+    await asyncio.to_thread(_take_identify_slot, path)
+    return True
@@ -0,0 +1,537 @@
+# storage.py
+
+import asyncio
+import base64
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from array import array
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+# A flush batch: namespace → (upserts, deletes, full snapshot or None)
+Batch = Dict[str, Tuple[Dict[str, Any], List[str], Optional[Dict[str, Any]]]]
+
+
+# Lists of Discord IDs are stored as little-endian uint64s, base64'd: 8 bytes
+# an ID instead of ~20 as JSON numbers, and decoded without a Python int each.
+
+def pack_ids(ids: array) -> str:
+    if sys.byteorder == "big":
+        ids = array("Q", ids)
+        ids.byteswap()
+    return base64.b64encode(ids.tobytes()).decode()
+
+
+def unpack_ids(blob: str) -> array:
+    ids = array("Q")
+    ids.frombytes(base64.b64decode(blob))
+    if sys.byteorder == "big":
+        ids.byteswap()
+    return ids
+
+
+# ─── Backends ─────────────────────────────────────────────────────────────────
+# Backends are plain blocking code. The Store calls `write`, `compact` and
+# full scans (`select`) on its writer thread and single-key `load_one` reads
+# on its reader thread, so after startup none of them run on the event loop.
+
+class JsonBackend:
+    """One JSON file per namespace, replaced atomically on every flush."""
+
+    needs_snapshot = True
+
+    def __init__(self, directory: str = ".", files: Optional[Dict[str, str]] = None):
+        self.directory = directory
+        self.files = files or {}
+
+    def path(self, ns: str) -> str:
+        return self.files.get(ns) or os.path.join(self.directory, f"{ns}.json")
+
+    def load(self, ns: str) -> Dict[str, Any]:
+        try:
+            with open(self.path(ns), "r") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError
+        except (FileNotFoundError, json.JSONDecodeError, ValueError):
+            data = {}
+        return data
+
+    def load_one(self, ns: str, key: str) -> Optional[Any]:
+        return self.load(ns).get(key)
+
+    def keys(self, ns: str) -> List[str]:
+        return list(self.load(ns))
+
+    def select(self, ns: str, fields: Sequence[str], predicate: Callable[..., bool]) -> List[str]:
+        return [k for k, v in self.load(ns).items() if predicate(*(v.get(f) for f in fields))]
+
+    def write(self, batch: Batch) -> None:
+        for ns, (_upserts, _deletes, snapshot) in batch.items():
+            path = self.path(ns)
+            fd, tmp = tempfile.mkstemp(prefix=f".{os.path.basename(path)}.", dir=os.path.dirname(path) or ".")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(snapshot, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def migrate_json(self, ns: str, path: str) -> int:
+        # The JSON files already *are* this backend's format.
+        self.files.setdefault(ns, path)
+        return 0
+
+    def disk_bytes(self, namespaces: Iterable[str]) -> int:
+        return sum(os.path.getsize(p) for p in map(self.path, namespaces) if os.path.exists(p))
+
+    def compact(self) -> None:
+        pass   # every flush already rewrites the whole file
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteBackend:
+    """Key/value rows in a single SQLite database in WAL mode.
+
+    With ``track_changes`` every write also appends (ns, key) to a `changes`
+    table tagged with the writer's PID, so several processes sharing the file
+    can pick up each other's writes via `changes_since`.
+    """
+
+    needs_snapshot = False
+    CHANGES_KEPT   = 100_000
+
+    def __init__(self, path: str, track_changes: bool = False):
+        self.path = path
+        self.track_changes = track_changes
+        self._origin = os.getpid()
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute("PRAGMA busy_timeout=5000")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS kv ("
+            " ns TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " PRIMARY KEY (ns, key)) WITHOUT ROWID"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if track_changes:
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS changes ("
+                " seq INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " ns TEXT NOT NULL, key TEXT NOT NULL, origin INTEGER NOT NULL)"
+            )
+        # Reads get their own connection: in WAL mode they see the last
+        # commit without waiting for a write or VACUUM holding `_lock`.
+        self._read_lock = threading.Lock()
+        self._reader = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._reader.execute("PRAGMA busy_timeout=5000")
+
+    def load(self, ns: str) -> Dict[str, Any]:
+        # Full scans use the writer connection, so they never hold up `load_one`
+        with self._lock:
+            rows = self._db.execute("SELECT key, value FROM kv WHERE ns = ?", (ns,)).fetchall()
+        return {k: json.loads(v) for k, v in rows}
+
+    def load_one(self, ns: str, key: str) -> Optional[Any]:
+        with self._read_lock:
+            row = self._reader.execute("SELECT value FROM kv WHERE ns = ? AND key = ?", (ns, key)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def keys(self, ns: str) -> List[str]:
+        with self._lock:
+            return [k for (k,) in self._db.execute("SELECT key FROM kv WHERE ns = ?", (ns,))]
+
+    def select(self, ns: str, fields: Sequence[str], predicate: Callable[..., bool]) -> List[str]:
+        """Keys whose top-level `fields` pass `predicate(*values)`. The fields
+        are pulled out in SQL and rows are filtered as they stream, so no
+        value is decoded and only matching keys are kept."""
+        columns = ", ".join("json_extract(value, ?)" for _ in fields)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT key, {columns} FROM kv WHERE ns = ?", (*(f"$.{f}" for f in fields), ns)
+            )
+            return [key for key, *values in rows if predicate(*values)]
+
+    def write(self, batch: Batch) -> None:
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                for ns, (upserts, deletes, _snapshot) in batch.items():
+                    self._db.executemany(
+                        "INSERT INTO kv (ns, key, value) VALUES (?, ?, ?)"
+                        " ON CONFLICT (ns, key) DO UPDATE SET value = excluded.value",
+                        [(ns, k, json.dumps(v)) for k, v in upserts.items()],
+                    )
+                    self._db.executemany("DELETE FROM kv WHERE ns = ? AND key = ?", [(ns, k) for k in deletes])
+                    if self.track_changes:
+                        self._db.executemany(
+                            "INSERT INTO changes (ns, key, origin) VALUES (?, ?, ?)",
+                            [(ns, k, self._origin) for k in (*upserts, *deletes)],
+                        )
+                if self.track_changes:
+                    self._writes += 1
+                    if self._writes % 1000 == 0:
+                        self._db.execute(
+                            "DELETE FROM changes WHERE seq < (SELECT MAX(seq) FROM changes) - ?",
+                            (self.CHANGES_KEPT,),
+                        )
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def head(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+
+    def changes_since(self, seq: int) -> Tuple[int, Dict[str, Dict[str, Any]]]:
+        """Other processes' writes after `seq`: ns → key → value (None = deleted)."""
+        with self._lock:
+            head = self._db.execute("SELECT COALESCE(MAX(seq), 0) FROM changes").fetchone()[0]
+            rows = self._db.execute(
+                "SELECT c.ns, c.key, kv.value FROM changes c"
+                " LEFT JOIN kv ON kv.ns = c.ns AND kv.key = c.key"
+                " WHERE c.seq > ? AND c.seq <= ? AND c.origin != ? ORDER BY c.seq",
+                (seq, head, self._origin),
+            ).fetchall()
+        out: Dict[str, Dict[str, Any]] = {}
+        for ns, key, value in rows:
+            out.setdefault(ns, {})[key] = None if value is None else json.loads(value)
+        return head, out
+
+    def migrate_json(self, ns: str, path: str) -> int:
+        """Import a legacy `<ns>.json` file once; returns the number of rows."""
+        marker = f"migrated:{ns}"
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM meta WHERE key = ?", (marker,)).fetchone():
+                return 0
+        data = JsonBackend(files={ns: path}).load(ns)
+        with self._lock:
+            # IMMEDIATE: several processes may race to migrate the same file
+            self._db.execute("BEGIN IMMEDIATE")
+            if self._db.execute("SELECT 1 FROM meta WHERE key = ?", (marker,)).fetchone():
+                self._db.execute("ROLLBACK")
+                return 0
+            self._db.executemany(
+                "INSERT OR IGNORE INTO kv (ns, key, value) VALUES (?, ?, ?)",
+                [(ns, k, json.dumps(v)) for k, v in data.items()],
+            )
+            self._db.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (marker, path))
+            self._db.execute("COMMIT")
+        return len(data)
+
+    def disk_bytes(self, namespaces: Iterable[str] = ()) -> int:
+        return sum(os.path.getsize(p) for p in (self.path, f"{self.path}-wal") if os.path.exists(p))
+
+    def compact(self, min_free: float = 0.2) -> None:
+        """Truncate the WAL, and VACUUM once `min_free` of the pages are free.
+
+        VACUUM needs the database to itself; if another process holds it the
+        vacuum is skipped until the next run.
+        """
+        with self._lock:
+            pages = self._db.execute("PRAGMA page_count").fetchone()[0]
+            free  = self._db.execute("PRAGMA freelist_count").fetchone()[0]
+            try:
+                if pages and free / pages >= min_free:
+                    self._db.execute("VACUUM")
+                self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except sqlite3.OperationalError as e:
+                print(f"[storage] Compaction skipped: {e}")
+
+    def close(self) -> None:
+        with self._read_lock:
+            self._reader.close()
+        with self._lock:
+            self._db.close()
+
+
+# ─── Write-behind map ─────────────────────────────────────────────────────────
+
+class PersistentMap(MutableMapping):
+    """In-memory dict whose changes are flushed by the owning Store.
+
+    Values must be JSON-able and are treated as immutable: replace a value
+    (``m[k] = new``) instead of mutating it in place, or call ``touch(k)``.
+    With ``encode``, values are stored as-is and encoded only when flushed,
+    so a value that changes many times between flushes is encoded once.
+    Lazy maps start empty and pull single keys from the backend on demand;
+    use `fetch` to do that off the event loop.
+    """
+
+    def __init__(
+        self,
+        store: "Store",
+        ns: str,
+        lazy: bool = False,
+        encode: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.store  = store
+        self.ns     = ns
+        self.encode = encode
+        # A JSON namespace is rewritten whole, so it has to be fully resident.
+        self.lazy   = lazy and not store.backend.needs_snapshot
+        self._data: Dict[str, Any] = {} if self.lazy else store.backend.load(ns)
+        self._dirty: Set[str] = set()
+        self._evict_flushed: Set[str] = set()
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._data[key]
+        except KeyError:
+            if not self.lazy or key in self._dirty:
+                raise
+        value = self.store.backend.load_one(self.ns, key)
+        if value is None:
+            raise KeyError(key)
+        self._data[key] = value
+        return value
+
+    async def fetch(self, key: str) -> Optional[Any]:
+        """The value for `key` or None; a lazy miss is read on the store's
+        reader thread instead of blocking the event loop."""
+        if key in self._data:
+            return self._data[key]
+        if not self.lazy or key in self._dirty:
+            return None
+        value = await self.store.read(self.ns, key)
+        if key in self._data or key in self._dirty:
+            return self._data.get(key)  # changed locally while we were reading
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore[index]
+        except KeyError:
+            return False
+        return True
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._data[key] = value
+        self.touch(key)
+
+    def __delitem__(self, key: str) -> None:
+        if self.lazy and key not in self._data:
+            self[key]  # raises KeyError if it is not stored either
+        del self._data[key]
+        self.touch(key)
+
+    def discard(self, key: str) -> None:
+        """Delete `key` without checking that it exists; a lazy map would
+        otherwise have to read it from the backend first."""
+        self._data.pop(key, None)
+        self.touch(key)
+
+    def stored_keys(self) -> Set[str]:
+        """Every key, including those a lazy map has not loaded (reads all
+        keys from the backend – meant for startup)."""
+        keys = set(self.store.backend.keys(self.ns)) if self.lazy else set()
+        keys.update(self._data)
+        return keys - {k for k in self._dirty if k not in self._data}
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def touch(self, key: str) -> None:
+        self._dirty.add(key)
+        self.store.schedule()
+
+    def evict(self, key: str) -> None:
+        """Drop a key from memory only; lazy maps reload it on demand. A dirty
+        key is dropped once the flush that writes it has taken it."""
+        if not self.lazy:
+            return  # the resident copy is the only one a snapshot is built from
+        if key in self._dirty:
+            self._evict_flushed.add(key)
+        else:
+            self._data.pop(key, None)
+
+    def _apply_external(self, changes: Dict[str, Any]) -> None:
+        for key, value in changes.items():
+            if key in self._dirty:
+                continue  # our newer local value wins; it is about to be flushed
+            if value is None:
+                self._data.pop(key, None)
+            elif not self.lazy or key in self._data:
+                self._data[key] = value
+
+    def _take_dirty(self) -> Tuple[Dict[str, Any], List[str], Optional[Dict[str, Any]]]:
+        dirty, self._dirty = self._dirty, set()
+        encode = self.encode or (lambda v: v)
+        upserts = {k: encode(self._data[k]) for k in dirty if k in self._data}
+        deletes = [k for k in dirty if k not in self._data]
+        snapshot = None
+        if self.store.backend.needs_snapshot:
+            snapshot = {k: encode(v) for k, v in self._data.items()} if self.encode else dict(self._data)
+        for key in self._evict_flushed:
+            self._data.pop(key, None)
+        self._evict_flushed.clear()
+        return upserts, deletes, snapshot
+
+    def _requeue(self, upserts: Dict[str, Any], deletes: List[str]) -> None:
+        # A failed flush: mark its keys dirty again, restoring evicted values
+        # unless the key has been changed since.
+        for key, value in upserts.items():
+            if key not in self._dirty:
+                self._data.setdefault(key, value)
+        self._dirty.update(upserts, deletes)
+
+
+class Store:
+    """Batches dirty keys of all its maps and writes them off the event loop.
+
+    The first change after a flush arms a timer; everything that changes
+    before it fires is coalesced into one backend write, so a change reaches
+    disk at most ``flush_interval`` seconds (plus the write itself) later.
+    """
+
+    def __init__(self, backend, flush_interval: float = 1.0, poll_interval: float = 0.5):
+        self.backend        = backend
+        self.flush_interval = flush_interval
+        self.poll_interval  = poll_interval
+        self.maps: Dict[str, PersistentMap] = {}
+        self.flushes        = 0
+        self.last_flush_ms  = 0.0
+        self._executor      = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store")
+        self._reader        = ThreadPoolExecutor(max_workers=1, thread_name_prefix="store-read")
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._task:  Optional[asyncio.Task] = None
+        self._lock  = asyncio.Lock()
+        self._poller: Optional[asyncio.Task] = None
+        self._seq   = backend.head() if getattr(backend, "track_changes", False) else 0
+
+    def map(self, ns: str, lazy: bool = False, encode: Optional[Callable[[Any], Any]] = None) -> PersistentMap:
+        if ns not in self.maps:
+            self.maps[ns] = PersistentMap(self, ns, lazy=lazy, encode=encode)
+        return self.maps[ns]
+
+    def migrate_json(self, ns: str, path: str) -> None:
+        n = self.backend.migrate_json(ns, path)
+        if n:
+            print(f"[storage] Migrated {n} entries from {path} into '{ns}'")
+
+    def start(self) -> None:
+        """Call once the event loop runs; flushes anything changed before."""
+        if any(m._dirty for m in self.maps.values()):
+            self.schedule()
+        if getattr(self.backend, "track_changes", False) and self._poller is None:
+            self._poller = asyncio.get_running_loop().create_task(self._poll())
+
+    async def _poll(self) -> None:
+        # Shared database: fold other processes' writes into our maps.
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                self._seq, changes = await loop.run_in_executor(
+                    self._executor, self.backend.changes_since, self._seq
+                )
+            except Exception as e:
+                print(f"[storage] Polling for changes failed: {e!r}")
+                continue
+            for ns, entries in changes.items():
+                if ns in self.maps:
+                    self.maps[ns]._apply_external(entries)
+
+    async def read(self, ns: str, key: str) -> Optional[Any]:
+        """One stored value, read on the reader thread so it never queues
+        behind a flush or compaction on the writer thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._reader, self.backend.load_one, ns, key)
+
+    async def select(self, ns: str, fields: Sequence[str], predicate: Callable[..., bool]) -> List[str]:
+        """Keys stored under `ns` (flushed first) whose `fields` pass
+        `predicate`, scanned on the writer thread – for full scans of lazy
+        maps. `predicate` runs on that thread too."""
+        await self.flush()
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.backend.select, ns, fields, predicate
+        )
+
+    async def compact(self) -> Tuple[int, int]:
+        """Flush, then let the backend reclaim space; returns (bytes before, after)."""
+        await self.flush()
+        loop = asyncio.get_running_loop()
+        async with self._lock:
+            before = self.backend.disk_bytes(self.maps)
+            await loop.run_in_executor(self._executor, self.backend.compact)
+            return before, self.backend.disk_bytes(self.maps)
+
+    def schedule(self) -> None:
+        if self._timer is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # no loop yet – `start()` picks it up
+        self._timer = loop.call_later(self.flush_interval, self._fire)
+
+    def _fire(self) -> None:
+        self._timer = None
+        self._task = asyncio.get_running_loop().create_task(self.flush())
+
+    def _collect(self) -> Batch:
+        return {ns: m._take_dirty() for ns, m in self.maps.items() if m._dirty}
+
+    async def flush(self) -> None:
+        async with self._lock:
+            batch = self._collect()
+            if not batch:
+                return
+            t0 = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(self._executor, self.backend.write, batch)
+            except Exception as e:
+                print(f"[storage] Flush failed, will retry: {e!r}")
+                for ns, (upserts, deletes, _snapshot) in batch.items():
+                    self.maps[ns]._requeue(upserts, deletes)
+                self.schedule()
+                return
+            self.flushes += 1
+            self.last_flush_ms = (time.perf_counter() - t0) * 1000
+
+    async def close(self) -> None:
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        self._executor.shutdown(wait=True)
+        self._reader.shutdown(wait=True)
+        self.backend.close()
+
+
+def open_store(directory: str = ".", files: Optional[Dict[str, str]] = None) -> Store:
+    """Backend from $GAMER_STORAGE: "sqlite" (default) or "json".
+
+    $GAMER_SHARED_STATE=1 (set by launcher.py) makes the SQLite file safe to
+    share between worker processes; the JSON backend cannot be shared.
+    """
+    kind = os.getenv("GAMER_STORAGE", "sqlite").lower()
+    interval = float(os.getenv("GAMER_FLUSH_INTERVAL", "1.0"))
+    shared = os.getenv("GAMER_SHARED_STATE") == "1"
+    if kind == "json":
+        if shared:
+            raise RuntimeError("GAMER_SHARED_STATE requires GAMER_STORAGE=sqlite")
+        return Store(JsonBackend(directory, dict(files or {})), flush_interval=interval)
+    path = os.getenv("GAMER_DB") or os.path.join(directory, "gamermimimi.db")
+    return Store(SQLiteBackend(path, track_changes=shared), flush_interval=interval)
@@ -0,0 +1,138 @@
+# tests/test_shards.py
+#
+# Runs launcher.py with several worker processes and shards against the local
+# Discord stand-in (benchmarks/emulator.py) and checks that every shard comes
+# up, every guild is served by its owner, and the workers stop cleanly.
+#
+#     python -m pytest tests/test_shards.py
+#     python tests/test_shards.py
+
+import asyncio
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, os.path.join(ROOT, "benchmarks"))
+
+from emulator import FakeDiscord  # noqa: E402
+
+SHARDS  = 4
+WORKERS = 2
+GUILDS  = 12
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def free_ports(n: int) -> int:
+    """First of `n` consecutive free ports."""
+    while True:
+        base = free_port()
+        try:
+            for p in range(base, base + n):
+                with socket.socket() as s:
+                    s.bind(("127.0.0.1", p))
+            return base
+        except OSError:
+            continue
+
+
+def spawn_launcher(port: int, metrics_port: int, data_dir: str, log) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DISCORD_BOT_TOKEN="shard-test",
+        GAMER_API_BASE=f"http://127.0.0.1:{port}/api/v10",
+        GAMER_GATEWAY=f"ws://127.0.0.1:{port}/gateway",
+        GAMER_DATA_DIR=data_dir,
+        GAMER_DB=os.path.join(data_dir, "gamermimimi.db"),
+        GAMER_METRICS_PORT=str(metrics_port),   # worker i serves on metrics_port + i
+        PYTHONUNBUFFERED="1",
+    )
+    flags = subprocess.CREATE_NEW_PROCESS_GROUP if os.name == "nt" else 0
+    return subprocess.Popen(
+        [sys.executable, os.path.join(ROOT, "launcher.py"),
+         "--workers", str(WORKERS), "--shards", str(SHARDS), "--max-concurrency", str(SHARDS)],
+        env=env, stdout=log, stderr=subprocess.STDOUT, creationflags=flags,
+    )
+
+
+def stop(proc: subprocess.Popen, timeout: float = 30) -> int:
+    proc.send_signal(signal.CTRL_BREAK_EVENT if os.name == "nt" else signal.SIGINT)
+    try:
+        return proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        raise
+
+
+async def settle(emu: FakeDiscord, seconds: float) -> None:
+    await asyncio.sleep(seconds)
+    emu.expire_pending()
+
+
+async def scenario(data_dir: str, log) -> None:
+    emu = FakeDiscord(guilds=GUILDS, members=5, shards=SHARDS, seed=8)
+    port = free_port()
+    metrics_port = free_ports(WORKERS)
+    runner = await emu.start(port=port)
+    proc = spawn_launcher(port, metrics_port, data_dir, log)
+    try:
+        await asyncio.wait_for(emu.synced.wait(), 120)
+        assert sorted(emu.sockets) == list(range(SHARDS)), f"connected shards: {sorted(emu.sockets)}"
+        owners = {gid: emu.shard_of(gid, SHARDS) for gid in emu.guilds}
+        assert set(owners.values()) == set(range(SHARDS)), "seed should spread guilds over every shard"
+
+        # The emulator answers the first interaction in a guild that has no
+        # ping-role yet with `setpingrole` by itself, so it takes two rounds
+        # of `tonight`: one sets the role, the next posts the RSVP
+        for _ in range(2):
+            await asyncio.gather(*(emu.fire("tonight", gid) for gid in emu.guilds))
+            await settle(emu, 3.5)
+        posted = [gid for gid, g in emu.guilds.items() if g["rsvps"]]
+        assert sorted(posted) == sorted(emu.guilds), f"{len(posted)}/{GUILDS} guilds got an RSVP"
+
+        # Clicks on those RSVPs are answered by whichever worker owns the guild
+        await asyncio.gather(*(emu.fire("click", gid) for gid in emu.guilds for _ in range(5)))
+        await settle(emu, 3.5)
+        counters = emu.report()["counters"]
+        assert counters["interactions"] == GUILDS * 7
+        assert not counters.get("unacked") and not counters.get("ack_too_late"), counters
+        assert counters.get("edits", 0) >= GUILDS, counters
+
+        # Every worker serves /metrics on its own port, none died over a clash
+        for i in range(WORKERS):
+            with urllib.request.urlopen(f"http://127.0.0.1:{metrics_port + i}/metrics", timeout=5) as resp:
+                assert b"gamer_" in resp.read(), f"worker {i} metrics"
+        assert proc.poll() is None, "launcher exited early"
+    finally:
+        code = stop(proc) if proc.poll() is None else proc.returncode
+        await runner.cleanup()
+    assert code == 0, f"launcher exited with {code}"
+
+
+def test_shards_against_emulator():
+    data_dir = tempfile.mkdtemp(prefix="gamer-shards-")
+    with open(os.path.join(data_dir, "launcher.log"), "w") as log:
+        started = time.monotonic()
+        try:
+            asyncio.run(scenario(data_dir, log))
+        except BaseException:
+            log.flush()
+            with open(log.name) as f:
+                sys.stderr.write(f.read()[-4000:])
+            raise
+    print(f"{SHARDS} shards / {WORKERS} workers OK in {time.monotonic() - started:.1f}s ({data_dir})")
+
+
+if __name__ == "__main__":
+    test_shards_against_emulator()
@@ -0,0 +1,107 @@
+# timeparse.py
+
+import re
+from datetime import date, datetime, time, timedelta, timezone, tzinfo
+from typing import Optional, Tuple
+
+WEEKDAYS = {
+    "mon": 0, "monday": 0, "tue": 1, "tues": 1, "tuesday": 1,
+    "wed": 2, "wednesday": 2, "thu": 3, "thur": 3, "thurs": 3, "thursday": 3,
+    "fri": 4, "friday": 4, "sat": 5, "saturday": 5, "sun": 6, "sunday": 6,
+}
+RELATIVE_DAYS = {"today": 0, "tonight": 0, "tomorrow": 1, "tmrw": 1, "tmr": 1}
+NAMED_TIMES = {"noon": time(12, 0), "midnight": time(0, 0)}
+
+_ISO      = re.compile(r"(\d{4})-(\d{1,2})-(\d{1,2})(?:[ t]+|$)")
+_CLOCK    = re.compile(r"^(\d{1,2})(?:[:.h](\d{2}))?\s*(am|pm)?$")
+_DURATION = re.compile(r"^in\s+(?:(\d+)\s*h(?:ours?|rs?)?)?\s*(?:(\d+)\s*m(?:in(?:utes?|s)?)?)?$")
+
+MAX_DURATION = timedelta(days=366)   # "in …" further out than this is a typo
+
+EXAMPLES = "`fri 21:30`, `tomorrow 8pm`, `tonight 9:15`, `in 2h`, `YYYY-MM-DD 20:00`"
+
+
+def _clock(text: str, evening: bool = False) -> time:
+    if text in NAMED_TIMES:
+        return NAMED_TIMES[text]
+    m = _CLOCK.match(text)
+    if m is None:
+        raise ValueError(f"I can’t read “{text}” as a time.")
+    hour, minute, half = int(m.group(1)), int(m.group(2) or 0), m.group(3)
+    if half:
+        if not 1 <= hour <= 12:
+            raise ValueError(f"“{text}”: 12-hour times go from 1 to 12.")
+        hour = hour % 12 + (12 if half == "pm" else 0)
+    elif 1 <= hour <= 11 and (evening or m.group(2) is None):
+        # "tonight 9:15" and a bare "fri 9" mean the evening; "fri 9:30"
+        # stays 24-hour.
+        hour += 12
+    if hour > 23 or minute > 59:
+        raise ValueError(f"“{text}” isn’t a valid time.")
+    return time(hour, minute)
+
+
+def _split(text: str) -> Tuple[Optional[date], Optional[int], Optional[int], str]:
+    """Peel the day part off the front: (iso date, days ahead, weekday, rest)."""
+    m = _ISO.match(text)
+    if m:
+        try:
+            return date(int(m.group(1)), int(m.group(2)), int(m.group(3))), None, None, text[m.end():]
+        except ValueError:
+            raise ValueError(f"“{m.group(0).strip()}” isn’t a real date.") from None
+    word, _, rest = text.partition(" ")
+    if word == "next":
+        word, _, rest = rest.partition(" ")
+    if word in RELATIVE_DAYS:
+        return None, RELATIVE_DAYS[word], None, rest
+    if word in WEEKDAYS:
+        return None, None, WEEKDAYS[word], rest
+    return None, None, None, text
+
+
+def parse_when(text: str, tz: tzinfo, now: Optional[datetime] = None) -> datetime:
+    """Parse a session time typed by a user, in their zone `tz`.
+
+    Accepts a day part (ISO date, today/tonight/tomorrow, a weekday) followed
+    by a time (21:30, 9pm, 9.30pm, noon), a time alone (the next time it
+    comes round), or a relative "in 2h 30m". Returns an aware datetime in
+    `tz`; raises ValueError with a message fit to show the user.
+    """
+    now = (now or datetime.now(tz)).astimezone(tz)
+    text = " ".join(text.lower().replace(",", " ").split())
+    if not text:
+        raise ValueError(f"Tell me when, e.g. {EXAMPLES}.")
+
+    m = _DURATION.match(text)
+    if m and (m.group(1) or m.group(2)):
+        hours, minutes = int(m.group(1) or 0), int(m.group(2) or 0)
+        if hours * 60 + minutes > MAX_DURATION.total_seconds() // 60:
+            raise ValueError(f"“{text}” is more than a year ahead.")
+        delta = timedelta(hours=hours, minutes=minutes)
+        # Elapsed time, so add in UTC: aware + timedelta is wall-clock
+        # arithmetic and is off by the offset change across a DST switch.
+        return (now.astimezone(timezone.utc) + delta).astimezone(tz).replace(second=0, microsecond=0)
+
+    on, ahead, weekday, rest = _split(text)
+    rest = rest.strip()
+    if rest.startswith("at "):
+        rest = rest[3:]
+    if not rest:
+        raise ValueError(f"What time? e.g. {EXAMPLES}.")
+    at = _clock(rest, evening=text.startswith("tonight"))
+
+    if on is None:
+        on = now.date()
+        if ahead is not None:
+            on += timedelta(days=ahead)
+        elif weekday is not None:
+            on += timedelta(days=(weekday - on.weekday()) % 7)
+    when = datetime.combine(on, at, tzinfo=tz)
+    if when <= now:
+        if ahead is None and weekday is None and not _ISO.match(text):
+            when = datetime.combine(on + timedelta(days=1), at, tzinfo=tz)   # "21:30" already passed → tomorrow
+        elif weekday is not None:
+            when = datetime.combine(on + timedelta(days=7), at, tzinfo=tz)   # "fri 21:30" on Friday night → next week
+        else:
+            raise ValueError(f"<t:{int(when.timestamp())}:F> is in the past.")
+    return when
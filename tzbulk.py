@@ -0,0 +1,307 @@
+# tzbulk.py
+
+import asyncio
+import codecs
+import csv
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+from array import array
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Container, Dict, Iterable, List, MutableMapping, NamedTuple, Optional, Tuple
+
+import aiohttp
+
+from storage import pack_ids, unpack_ids
+from tzcatalog import TimezoneCatalog
+
+MAX_ERRORS = 1000            # per-row errors kept for the report; the rest are only counted
+YIELD_EVERY = 5000           # rows between event-loop yields while exporting
+
+_SNOWFLAKE = re.compile(r"(?:<@!?)?(\d{15,21})>?$")
+USER_COLUMNS = ("user_id", "user", "id", "discord_id", "member")
+ZONE_COLUMNS = ("timezone", "tz", "zone", "time_zone")
+
+
+class RowError(NamedTuple):
+    line: int
+    row:  str
+    reason: str
+
+
+class ImportReport:
+    """Running totals of one import, shown to the admin as it progresses."""
+
+    def __init__(self, size: int = 0):
+        self.size       = size    # bytes expected (0 = unknown)
+        self.bytes_read = 0
+        self.rows       = 0
+        self.duplicates = 0
+        self.applied    = 0       # changed zones
+        self.unchanged  = 0       # already set to the same zone
+        self.kept       = 0       # already set to another zone that may not be replaced
+        self.outsiders  = 0       # users who aren't members of the importing server
+        self.error_count = 0
+        self.errors: List[RowError] = []
+        self.started    = time.perf_counter()
+        self.seconds    = 0.0
+
+    def error(self, line: int, row: str, reason: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_ERRORS:
+            self.errors.append(RowError(line, row[:200], reason))
+
+    def progress(self) -> str:
+        pct = f" ({self.bytes_read / self.size:.0%})" if self.size else ""
+        return f"⏳ Read {self.rows:,} rows{pct}, {self.error_count:,} with errors…"
+
+    def summary(self, dry_run: bool = False) -> str:
+        lines = [
+            f"{'🧪 Dry run: nothing saved.' if dry_run else '✅ Import finished.'} "
+            f"{self.rows:,} rows in {self.seconds:.1f}s",
+            f"• {self.applied:,} {'would change' if dry_run else 'set'}, {self.unchanged:,} already up to date",
+        ]
+        if self.kept:
+            lines.append(f"• {self.kept:,} kept their own zone (`overwrite: True` replaces only zones this server imported)")
+        if self.outsiders:
+            lines.append(f"• {self.outsiders:,} skipped: not members of this server")
+        if self.duplicates:
+            lines.append(f"• {self.duplicates:,} users listed more than once (last row wins)")
+        if self.error_count:
+            lines.append(f"• ❌ {self.error_count:,} rows skipped:")
+            lines += [f"  line {e.line}: {e.reason}" for e in self.errors[:10]]
+            if self.error_count > 10:
+                lines.append("  … full list in the attached report")
+        return "\n".join(lines)
+
+    def write_errors(self, directory: Optional[str] = None) -> Optional[str]:
+        """The per-row errors as a CSV file (first MAX_ERRORS), or None."""
+        if not self.errors:
+            return None
+        fd, path = tempfile.mkstemp(prefix="tz-import-errors-", suffix=".csv", dir=directory)
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            out = csv.writer(f)
+            out.writerow(("line", "row", "reason"))
+            out.writerows(self.errors)
+            if self.error_count > len(self.errors):
+                out.writerow(("", "", f"{self.error_count - len(self.errors)} more not listed"))
+        return path
+
+
+# ─── Import ───────────────────────────────────────────────────────────────────
+
+async def stream_url(url: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Download in chunks (e.g. a Discord attachment) without buffering it all."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url, raise_for_status=True) as resp:
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                yield chunk
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], report: ImportReport) -> AsyncIterator[List[str]]:
+    """Decode a byte stream (UTF-8, optional BOM) into batches of whole lines."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    tail = ""
+    async for chunk in chunks:
+        report.bytes_read += len(chunk)
+        text = tail + decoder.decode(chunk)
+        end = text.rfind("\n")
+        if end < 0:
+            tail = text
+            continue
+        tail = text[end + 1:]
+        yield [line.rstrip("\r") for line in text[:end].split("\n")]
+    tail += decoder.decode(b"", final=True)
+    if tail.strip():
+        yield [tail.rstrip("\r")]
+
+
+def sniff_format(filename: str, first_line: str) -> str:
+    ext = os.path.splitext(filename.lower())[1]
+    if ext in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if ext in (".csv", ".tsv", ".txt"):
+        return "csv"
+    return "jsonl" if first_line.lstrip().startswith(("{", "[")) else "csv"
+
+
+class ZoneParser:
+    """Turns rows into (user ID, canonical zone), validating each one.
+
+    CSV may have a header naming the columns (user_id/user/id and
+    timezone/tz/zone, any order); without one the first two columns are used.
+    JSONL lines are ``{"user_id": …, "timezone": …}`` or ``[user, zone]``.
+    """
+
+    def __init__(self, catalog: TimezoneCatalog, fmt: str):
+        self.catalog = catalog
+        self.fmt     = fmt
+        self.delimiter = ","
+        self.columns: Optional[Tuple[int, int]] = None   # (user, zone) indices
+        self.line    = 0
+
+    def _header(self, first: str) -> bool:
+        self.delimiter = max(",;\t", key=first.count)
+        cells = [c.strip().lower() for c in next(csv.reader([first], delimiter=self.delimiter), [])]
+        user = next((cells.index(c) for c in USER_COLUMNS if c in cells), None)
+        zone = next((cells.index(c) for c in ZONE_COLUMNS if c in cells), None)
+        if user is not None and zone is not None:
+            self.columns = (user, zone)
+            return True
+        self.columns = (0, 1)
+        return False
+
+    def validate(self, user: object, zone: object) -> Tuple[str, str]:
+        m = _SNOWFLAKE.match(str(user).strip())
+        if m is None:
+            raise ValueError(f"“{user}” isn’t a user ID or mention")
+        canonical = self.catalog.resolve(str(zone).strip()) if zone else None
+        if canonical is None:
+            raise ValueError(f"unknown timezone “{zone}”")
+        return m.group(1), sys.intern(canonical)
+
+    def parse(self, lines: List[str], report: ImportReport) -> Iterable[Tuple[str, str]]:
+        if self.fmt == "csv":
+            if self.columns is None and lines:
+                self.line += 1
+                if self._header(lines[0]):
+                    lines = lines[1:]
+                else:
+                    self.line -= 1
+            rows: Iterable = csv.reader(lines, delimiter=self.delimiter)
+        else:
+            rows = lines
+        user_col, zone_col = self.columns or (0, 1)
+        for raw, row in zip(lines, rows):
+            self.line += 1
+            if not raw.strip():
+                continue
+            report.rows += 1
+            try:
+                if self.fmt == "csv":
+                    if len(row) <= max(user_col, zone_col):
+                        raise ValueError("expected a user ID and a timezone")
+                    user, zone = row[user_col], row[zone_col]
+                else:
+                    try:
+                        obj = json.loads(raw)
+                    except json.JSONDecodeError:
+                        raise ValueError("not valid JSON") from None
+                    if isinstance(obj, list) and len(obj) >= 2:
+                        user, zone = obj[0], obj[1]
+                    elif isinstance(obj, dict):
+                        user = next((obj[k] for k in USER_COLUMNS if k in obj), None)
+                        zone = next((obj[k] for k in ZONE_COLUMNS if k in obj), None)
+                        if user is None or zone is None:
+                            raise ValueError("expected user_id and timezone keys")
+                    else:
+                        raise ValueError("expected an object or [user, zone]")
+                yield self.validate(user, zone)
+            except ValueError as e:
+                report.error(self.line, raw, str(e))
+
+
+async def read_zones(
+    chunks: AsyncIterable[bytes],
+    catalog: TimezoneCatalog,
+    report: ImportReport,
+    filename: str = "",
+    progress: Optional[Callable[[ImportReport], Awaitable[None]]] = None,
+    progress_every: float = 2.0,
+) -> Dict[str, str]:
+    """Stream-parse and validate an upload; returns user ID → zone for the
+    valid rows (later rows win). Only this result is held, never the file."""
+    updates: Dict[str, str] = {}
+    parser: Optional[ZoneParser] = None
+    next_progress = time.perf_counter() + progress_every
+    async for lines in iter_lines(chunks, report):
+        if parser is None:
+            parser = ZoneParser(catalog, sniff_format(filename, lines[0]))
+        for user, zone in parser.parse(lines, report):
+            if user in updates:
+                report.duplicates += 1
+            updates[user] = zone
+        if progress is not None and time.perf_counter() >= next_progress:
+            await progress(report)
+            next_progress = time.perf_counter() + progress_every
+    return updates
+
+
+def apply_zones(
+    target: MutableMapping,
+    updates: Dict[str, str],
+    report: ImportReport,
+    overwrite: bool = False,
+    dry_run: bool = False,
+    replaceable: Container[str] = (),
+) -> List[str]:
+    """Merge validated rows into `target` in one go (no awaits in between, so
+    a write-behind store picks them all up in a single flush); returns the
+    users whose zone was (or would be) set.
+
+    Existing zones are kept, except with `overwrite` for users in
+    `replaceable` (those the importing server imported itself)."""
+    applied: List[str] = []
+    for user, zone in updates.items():
+        current = target.get(user)
+        if current == zone:
+            report.unchanged += 1
+        elif current is not None and not (overwrite and user in replaceable):
+            report.kept += 1
+        else:
+            applied.append(user)
+            if not dry_run:
+                target[user] = zone
+    report.applied += len(applied)
+    report.seconds = time.perf_counter() - report.started
+    return applied
+
+
+def imported_users(packed: Optional[str]) -> array:
+    """User IDs a guild has imported zones for, as stored by `add_imported`."""
+    return unpack_ids(packed) if packed else array("Q")
+
+
+def add_imported(packed: Optional[str], users: Iterable[str]) -> str:
+    """Add `users` to a guild's imported set: sorted unique uint64s, packed
+    with `storage.pack_ids` (100k imported members are under 1.1 MB stored)."""
+    return pack_ids(array("Q", sorted(set(imported_users(packed)).union(map(int, users)))))
+
+
+# ─── Export ───────────────────────────────────────────────────────────────────
+
+async def export_zones(
+    users: Iterable[str],
+    zones: MutableMapping,
+    fmt: str = "csv",
+    directory: Optional[str] = None,
+) -> Tuple[str, int]:
+    """Write `users`' zones to a temp file row by row; returns (path, rows).
+
+    `users` should be a private collection (not a live view of `zones`): the
+    loop is yielded to every YIELD_EVERY rows.
+    """
+    fd, path = tempfile.mkstemp(prefix="tz-export-", suffix=f".{fmt}", dir=directory)
+    n = 0
+    try:
+        with os.fdopen(fd, "w", newline="", encoding="utf-8") as f:
+            out = csv.writer(f) if fmt == "csv" else None
+            if out is not None:
+                out.writerow(("user_id", "timezone"))
+            for user in users:
+                zone = zones.get(user)
+                if zone is None:
+                    continue
+                if out is not None:
+                    out.writerow((user, zone))
+                else:
+                    f.write(f'{{"user_id":"{user}","timezone":"{zone}"}}\n')
+                n += 1
+                if n % YIELD_EVERY == 0:
+                    await asyncio.sleep(0)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, n
@@ -0,0 +1,135 @@
+# tzcatalog.py
+
+from bisect import bisect_left
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo, available_timezones
+
+# Ranking tiers: lower wins, ties are broken alphabetically.
+RANK_EXACT     = 0   # "Europe/Berlin"
+RANK_ALIAS     = 1   # "berlin", "cet", "new york"
+RANK_PREFIX    = 2   # "europe/be"
+RANK_WORD      = 3   # "ber" → Europe/Berlin, Atlantic/Bermuda
+RANK_SUBSTRING = 4   # "erli"
+
+
+def _norm(text: str) -> str:
+    return text.strip().lower().replace("_", " ")
+
+
+def _trigrams(text: str) -> Iterable[str]:
+    return (text[i:i + 3] for i in range(len(text) - 2))
+
+
+def _abbreviations(name: str) -> Iterable[str]:
+    # Winter + summer abbreviation (CET/CEST, EST/EDT, …); numeric ones like
+    # "+03" carry no information users would type, so they are skipped.
+    zone = ZoneInfo(name)
+    year = datetime.now(timezone.utc).year
+    for month in (1, 7):
+        abbr = datetime(year, month, 15, tzinfo=timezone.utc).astimezone(zone).tzname()
+        if abbr and abbr.isalpha():
+            yield abbr.lower()
+
+
+class TimezoneCatalog:
+    """Build-once search index over the IANA zones shipped with tzdata.
+
+    Validation is a frozenset lookup; `search` ranks exact names, city /
+    abbreviation aliases, prefixes, word prefixes and substrings, and keeps
+    the most recent queries in an LRU so repeated keystrokes are free.
+    """
+
+    def __init__(self, names: Optional[Iterable[str]] = None, cache_size: int = 2048):
+        self.names: Tuple[str, ...] = tuple(sorted(available_timezones() if names is None else names))
+        self._valid: FrozenSet[str] = frozenset(self.names)
+        self._folded: Dict[str, str] = {n.lower(): n for n in self.names}
+        self._keys: List[str] = [_norm(n) for n in self.names]
+
+        # Sorted (key, idx) lists → prefix lookups are one bisect + a slice.
+        self._by_key: List[Tuple[str, int]] = sorted((k, i) for i, k in enumerate(self._keys))
+        words = set()
+        for i, key in enumerate(self._keys):
+            for segment in key.split("/"):
+                words.add((segment, i))
+                for word in segment.split(" ")[1:]:
+                    words.add((word, i))
+        self._by_word: List[Tuple[str, int]] = sorted(words)
+
+        aliases: Dict[str, set] = {}
+        for i, name in enumerate(self.names):
+            aliases.setdefault(self._keys[i].rsplit("/", 1)[-1], set()).add(i)
+            for abbr in _abbreviations(name):
+                aliases.setdefault(abbr, set()).add(i)
+        self._aliases: Dict[str, Tuple[int, ...]] = {a: tuple(sorted(ix)) for a, ix in aliases.items()}
+
+        trigrams: Dict[str, set] = {}
+        for i, key in enumerate(self._keys):
+            for tri in _trigrams(key):
+                trigrams.setdefault(tri, set()).add(i)
+        self._trigrams: Dict[str, FrozenSet[int]] = {t: frozenset(ix) for t, ix in trigrams.items()}
+
+        self._cache: "OrderedDict[Tuple[str, int], List[str]]" = OrderedDict()
+        self._cache_size = cache_size
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._valid
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def resolve(self, text: str) -> Optional[str]:
+        """Canonical spelling of `text` if it names a zone (case-insensitive)."""
+        if text in self._valid:
+            return text
+        return self._folded.get(text.strip().lower())
+
+    # ─── Search ────────────────────────────────────────────────────────────────
+
+    def search(self, query: str, limit: int = 25) -> List[str]:
+        key = (_norm(query), limit)
+        hit = self._cache.get(key)
+        if hit is not None:
+            self._cache.move_to_end(key)
+            return hit
+        result = self._search(key[0], limit)
+        self._cache[key] = result
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return result
+
+    def _prefix_range(self, index: List[Tuple[str, int]], q: str) -> Iterable[int]:
+        pos = bisect_left(index, (q, -1))
+        while pos < len(index) and index[pos][0].startswith(q):
+            yield index[pos][1]
+            pos += 1
+
+    def _search(self, q: str, limit: int) -> List[str]:
+        if not q:
+            return list(self.names[:limit])
+
+        ranks: Dict[int, int] = {}
+
+        def rank(idx: int, tier: int) -> None:
+            if tier < ranks.get(idx, RANK_SUBSTRING + 1):
+                ranks[idx] = tier
+
+        for i in self._aliases.get(q, ()):
+            rank(i, RANK_ALIAS)
+        for i in self._prefix_range(self._by_key, q):
+            rank(i, RANK_EXACT if self._keys[i] == q else RANK_PREFIX)
+        for i in self._prefix_range(self._by_word, q):
+            rank(i, RANK_WORD)
+
+        if len(q) >= 3:
+            postings = sorted((self._trigrams.get(t, frozenset()) for t in set(_trigrams(q))), key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        else:
+            candidates = range(len(self._keys))
+        for i in candidates:
+            if q in self._keys[i]:
+                rank(i, RANK_SUBSTRING)
+
+        ordered = sorted(ranks, key=lambda i: (ranks[i], self._keys[i]))
+        return [self.names[i] for i in ordered[:limit]]